@@ -0,0 +1,180 @@
+"""
+Benchmarks de los caminos calientes de la API (ver run_benchmarks)
+
+Cada benchmark ejecuta una request (o el comando send_due_alerts) contra los
+datos que haya en la BD, normalmente generados con seed_synthetic, y mide:
+
+- latencia p50 / p95 por iteración
+- consultas SQL por iteración (con el RequestProfile de profiling.py, así
+  cuenta también las de gather_queries en otros hilos)
+
+max_queries es el presupuesto de consultas: no depende del volumen de datos,
+por lo que un N+1 nuevo lo supera aunque la BD de prueba sea chica.
+"""
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.db.models import Count
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from . import profiling
+
+# Nombre → presupuesto de consultas por iteración
+BENCHMARKS = {
+    'dashboard': 12,
+    'property_list': 8,
+    'property_detail': 12,
+    'property_financials': 16,
+    'obligations_list': 8,
+    'rental_payments': 6,
+    'send_due_alerts': 60,
+    'media_serving': 0,
+}
+
+MEDIA_FILE_SIZE = 1024 * 1024
+
+
+class BenchmarkContext:
+    """Objetos de la BD y cliente autenticado que usan los benchmarks"""
+
+    def __init__(self, admin, media_root):
+        from apps.properties.models import Property
+        from apps.rentals.models import Rental
+
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        # La propiedad y el rental con más historia (el peor caso realista)
+        self.property = (
+            Property.objects.annotate(rentals_count=Count('rentals'))
+            .order_by('-rentals_count', 'pk').first()
+        )
+        self.rental = (
+            Rental.objects.filter(property=self.property)
+            .annotate(payments_count=Count('payments'))
+            .order_by('-payments_count', 'pk').first()
+        )
+        self.media_path = f'property_{self.property.pk}/images/benchmark.jpg'
+        os.makedirs(os.path.join(media_root, os.path.dirname(self.media_path)), exist_ok=True)
+        with open(os.path.join(media_root, self.media_path), 'wb') as file:
+            file.write(os.urandom(MEDIA_FILE_SIZE))
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_HOST='localhost')
+        if response.status_code != 200:
+            raise AssertionError(f'GET {url} respondió {response.status_code}')
+        # Consumir el cuerpo (respuestas en streaming incluidas)
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+
+    def dashboard(self):
+        return self.get('/api/dashboard/')
+
+    def property_list(self):
+        return self.get('/api/properties/')
+
+    def property_detail(self):
+        return self.get(f'/api/properties/{self.property.pk}/')
+
+    def property_financials(self):
+        return self.get(f'/api/properties/{self.property.pk}/financials/')
+
+    def obligations_list(self):
+        return self.get('/api/obligations/')
+
+    def rental_payments(self):
+        if self.rental is None:
+            raise AssertionError('No hay rentals: ejecutar seed_synthetic')
+        return self.get(f'/api/properties/{self.property.pk}/rentals/{self.rental.pk}/payments/')
+
+    def send_due_alerts(self):
+        # Cada iteración se revierte: las alertas (AlertSent) no quedan registradas
+        with transaction.atomic():
+            call_command('send_due_alerts', stdout=io.StringIO())
+            transaction.set_rollback(True)
+
+    def media_serving(self):
+        return self.get(f'/media/{self.media_path}')
+
+
+def _percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+def measure(func, iterations, warmup):
+    """{p50_ms, p95_ms, queries} de `iterations` llamadas, tras `warmup` sin medir"""
+    for _ in range(warmup):
+        func()
+    latencies, queries = [], []
+    for _ in range(iterations):
+        profile, token = profiling.start_profile()
+        start = time.perf_counter()
+        try:
+            func()
+        finally:
+            latencies.append((time.perf_counter() - start) * 1000)
+            profiling.end_profile(token)
+        queries.append(profile.queries)
+    return {
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(_percentile(latencies, 95), 2),
+        'queries': max(queries),
+    }
+
+
+@contextmanager
+def benchmark_environment():
+    """
+    Usuario admin temporal (se revierte al terminar), MEDIA_ROOT temporal,
+    correo en memoria y sin el muestreo de ProfilingMiddleware
+    """
+    from apps.users.models import Role, User, UserRole
+
+    for connection in connections.all():
+        profiling.install_query_recorder(connection)
+
+    media_root = tempfile.mkdtemp(prefix='hr-benchmarks-')
+    try:
+        with override_settings(
+            ALLOWED_HOSTS=['*'],
+            MEDIA_ROOT=media_root,
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            PROFILING_SAMPLE_RATE=0,
+            PROFILING_STRICT=False,
+        ), transaction.atomic():
+            admin = User.objects.create(username='benchmark-admin', email='benchmark-admin@example.com')
+            UserRole.objects.create(user=admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+            try:
+                yield BenchmarkContext(admin, media_root)
+            finally:
+                transaction.set_rollback(True)
+    finally:
+        shutil.rmtree(media_root, ignore_errors=True)
+
+
+def compare(results, baseline, tolerance, noise_ms=5.0):
+    """
+    Regresiones respecto a la línea base: más consultas, o p50 más lento
+    que baseline × (1 + tolerance) por más de noise_ms
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result['queries'] > previous['queries']:
+            regressions.append(f"{name}: {previous['queries']} → {result['queries']} consultas")
+        limit = previous['p50_ms'] * (1 + tolerance)
+        if result['p50_ms'] > limit and result['p50_ms'] - previous['p50_ms'] > noise_ms:
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.1f}ms → {result['p50_ms']:.1f}ms")
+    return regressions
@@ -0,0 +1,73 @@
+"""
+Compresión gzip / brotli de las respuestas (ver CompressionMiddleware)
+
+- Se elige la codificación por Accept-Encoding (q-values); con empate gana br
+- Solo respuestas no streaming de tipos de texto (JSON, CSS, JS, SVG...)
+  de al menos COMPRESSION_MIN_SIZE bytes y sin Content-Encoding propio
+  (los estáticos de WhiteNoise ya vienen precomprimidos y son streaming)
+- Brotli con calidad baja (COMPRESSION_BROTLI_QUALITY, 4 por defecto): en las
+  respuestas de la API sale más chico que gzip -6 en un tiempo similar
+  (python manage.py bench_rendering)
+"""
+import gzip
+
+import brotli
+from django.conf import settings
+
+# Sin text/html: las páginas del admin llevan el token CSRF junto a datos
+# controlados por el usuario (BREACH); la API es JSON
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+    'text/css', 'text/csv', 'text/javascript', 'text/plain', 'text/xml',
+)
+ENCODINGS = ('br', 'gzip')
+
+
+def accepted_encoding(accept_encoding):
+    """'br', 'gzip' o None según el header Accept-Encoding"""
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+    best, best_quality = None, 0.0
+    for coding in ENCODINGS:
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compressible(response):
+    """Respuesta no streaming, de texto, sin Content-Encoding y de al menos COMPRESSION_MIN_SIZE bytes"""
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+    if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+        return False
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def apply(response, encoding, content):
+    """Reemplaza el cuerpo por `content` (comprimido con `encoding`) y ajusta los headers"""
+    response.content = content
+    response['Content-Length'] = str(len(content))
+    response['Content-Encoding'] = encoding
+    # Una ETag fuerte identifica los bytes exactos: la versión comprimida es otra
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
@@ -0,0 +1,158 @@
+"""
+Conexiones a la base de datos: pre-apertura y métricas de uso
+
+Modos (ver DATABASES en settings.py):
+
+- persistent: CONN_MAX_AGE > 0. Cada hilo del worker conserva su conexión
+  entre requests; CONN_HEALTH_CHECKS la verifica antes de reutilizarla y
+  Django la descarta si hubo errores o si Neon la cerró al suspender
+- pool: DB_POOL=True (psycopg 3). Conexiones compartidas por el proceso;
+  el pool revisa cada conexión al entregarla y cierra las ociosas antes de
+  que Neon suspenda (max_idle)
+- per_request: CONN_MAX_AGE = 0 sin pool (una conexión nueva por request)
+
+prewarm_connections() se llama desde gunicorn (post_worker_init) para que la
+primera request de cada hilo no pague el handshake TLS. connection_stats()
+alimenta GET /api/core/db-stats/ (los valores son del worker que responde).
+"""
+import os
+import threading
+import weakref
+
+from django.db import connections
+
+_lock = threading.Lock()
+_counters = {'connects': 0, 'requests': 0}
+_wrappers = weakref.WeakSet()
+
+
+def record_connection(connection):
+    """connection_created: conexión nueva (o tomada del pool)"""
+    with _lock:
+        _counters['connects'] += 1
+        _wrappers.add(connection)
+
+
+def record_request():
+    with _lock:
+        _counters['requests'] += 1
+
+
+def connection_mode(alias='default'):
+    settings_dict = connections[alias].settings_dict
+    if settings_dict['OPTIONS'].get('pool'):
+        return 'pool'
+    if settings_dict['CONN_MAX_AGE']:
+        return 'persistent'
+    return 'per_request'
+
+
+def prewarm_connections(worker=None, alias='default', timeout=10):
+    """
+    Abre las conexiones antes de la primera request. Devuelve cuántas quedaron abiertas.
+
+    - pool: abre el pool y espera a que tenga min_size conexiones
+    - persistent con workers gthread: una conexión en cada hilo del worker
+    - per_request: nada que pre-abrir
+    """
+    connection = connections[alias]
+    mode = connection_mode(alias)
+    if mode == 'pool':
+        pool = connection.pool
+        pool.open(wait=True, timeout=timeout)
+        return pool.get_stats()['pool_size']
+    if mode == 'per_request':
+        return 0
+
+    thread_pool = getattr(worker, 'tpool', None)
+    if thread_pool is None:
+        connection.ensure_connection()
+        return 1
+
+    # Cada tarea retiene su hilo hasta que todas abrieron su conexión, así
+    # el ThreadPoolExecutor de gunicorn las reparte en hilos distintos
+    threads = worker.cfg.threads
+    barrier = threading.Barrier(threads, timeout=timeout)
+
+    def open_connection():
+        try:
+            connections[alias].ensure_connection()
+        finally:
+            barrier.wait()
+
+    futures = [thread_pool.submit(open_connection) for _ in range(threads)]
+    errors = [future.exception() for future in futures]
+    failed = [error for error in errors if error is not None]
+    if len(failed) == len(futures):
+        raise failed[0]
+    return len(futures) - len(failed)
+
+
+def connection_stats(alias='default'):
+    """
+    {
+        "mode": "persistent",
+        "pid": 12,
+        "requests": 1500,
+        "connects": 4,          # conexiones abiertas (o tomadas del pool)
+        "reuse_ratio": 0.997,   # requests que no abrieron conexión
+        "open_connections": 2,  # conexiones abiertas ahora en este worker
+        "pool": {...}           # solo con DB_POOL (psycopg_pool.get_stats())
+    }
+    """
+    connection = connections[alias]
+    with _lock:
+        counters = dict(_counters)
+        open_connections = sum(1 for wrapper in list(_wrappers) if wrapper.connection is not None)
+
+    mode = connection_mode(alias)
+    stats = {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'mode': mode,
+        'pid': os.getpid(),
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+        'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+        'requests': counters['requests'],
+        'connects': counters['connects'],
+        'reuse_ratio': None,
+        'open_connections': open_connections,
+    }
+    if counters['requests'] and mode != 'pool':
+        # Con pool cada request toma una conexión: el reuso se ve en pool.connections_num
+        stats['reuse_ratio'] = round(max(0, 1 - counters['connects'] / counters['requests']), 4)
+
+    if mode == 'pool':
+        pool_stats = connection.pool.get_stats()
+        in_use = pool_stats.get('pool_size', 0) - pool_stats.get('pool_available', 0)
+        stats['open_connections'] = pool_stats.get('pool_size', 0)
+        stats['pool'] = {
+            **pool_stats,
+            'in_use': in_use,
+            'utilization': round(in_use / pool_stats['pool_max'], 4) if pool_stats.get('pool_max') else None,
+        }
+    return stats
+
+
+_schema_current = set()
+
+
+def pending_migrations(alias='default'):
+    """
+    Migraciones sin aplicar (['app.0012_x', ...]). Las migraciones se aplican
+    con el servicio `migrate` de docker-compose antes de levantar el backend;
+    /readyz responde 503 mientras haya pendientes.
+
+    Las migraciones del código no cambian mientras el proceso vive, así que
+    el resultado "al día" se cachea
+    """
+    if alias in _schema_current:
+        return []
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connections[alias])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    pending = [f'{migration.app_label}.{migration.name}' for migration, _ in plan]
+    if not pending:
+        _schema_current.add(alias)
+    return pending
@@ -0,0 +1,167 @@
+"""
+Compara la latencia por request según cómo se obtienen las conexiones a PostgreSQL.
+
+USO:
+    python manage.py bench_db_connections
+    python manage.py bench_db_connections --latency-ms 40 --requests 300
+    python manage.py bench_db_connections --modes per_request,persistent
+
+MODOS (ver apps/core/db.py):
+    per_request  conexión nueva en cada request (CONN_MAX_AGE = 0)
+    persistent   conexión reutilizada + health check (CONN_MAX_AGE > 0)
+    pool         pool de psycopg 3 (requiere psycopg[pool])
+
+Cada "request" reproduce el ciclo de Django: close_if_unusable_or_obsolete()
+al empezar y al terminar, y --queries consultas SELECT 1 entre medio.
+
+--latency-ms pasa las conexiones por un proxy TCP local que agrega esa
+latencia a cada ida y vuelta, para simular contra un Postgres local la
+distancia a Neon (el handshake de conexión hace varias idas y vueltas).
+"""
+import copy
+import socket
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+MODES = ['per_request', 'persistent', 'pool']
+
+
+class LatencyProxy:
+    """Proxy TCP local que agrega `delay` segundos a cada ida y vuelta (aprox.)"""
+
+    def __init__(self, target_host, target_port, delay):
+        self.target = (target_host or 'localhost', int(target_port or 5432))
+        self.half_delay = delay / 2
+        self.server = socket.create_server(('127.0.0.1', 0))
+        self.port = self.server.getsockname()[1]
+
+    def start(self):
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.close()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return
+            upstream = socket.create_connection(self.target)
+            for source, target in ((client, upstream), (upstream, client)):
+                threading.Thread(target=self._pump, args=(source, target), daemon=True).start()
+
+    def _pump(self, source, target):
+        try:
+            while data := source.recv(65536):
+                time.sleep(self.half_delay)
+                target.sendall(data)
+        except OSError:
+            pass
+        finally:
+            for sock in (source, target):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            source.close()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark de latencia p50/p99: conexión por request vs persistente vs pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests por modo (default: 200)')
+        parser.add_argument('--queries', type=int, default=2, help='Consultas por request (default: 2)')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Latencia agregada por ida y vuelta')
+        parser.add_argument('--modes', default=','.join(MODES), help=f'Modos separados por coma ({", ".join(MODES)})')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if connections[alias].vendor != 'postgresql':
+            raise CommandError('Este benchmark requiere PostgreSQL')
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f'Modos desconocidos: {", ".join(sorted(unknown))}')
+
+        settings_dict = connections[alias].settings_dict
+        host, port = settings_dict['HOST'], settings_dict['PORT']
+        proxy = None
+        if options['latency_ms']:
+            proxy = LatencyProxy(host, port, options['latency_ms'] / 1000).start()
+            host, port = '127.0.0.1', proxy.port
+            self.stdout.write(f"🐢 Proxy con +{options['latency_ms']:.0f}ms por ida y vuelta en 127.0.0.1:{port}")
+
+        self.stdout.write(f"🚀 {options['requests']} requests × {options['queries']} consulta(s) por modo\n")
+        try:
+            for mode in modes:
+                self._bench_mode(alias, mode, host, port, options['requests'], options['queries'])
+        finally:
+            if proxy:
+                proxy.stop()
+
+    def _make_wrapper(self, alias, mode, host, port):
+        settings_dict = copy.deepcopy(connections[alias].settings_dict)
+        settings_dict.update(HOST=host, PORT=str(port), CONN_HEALTH_CHECKS=True)
+        settings_dict['OPTIONS'].pop('pool', None)
+        if mode == 'per_request':
+            settings_dict['CONN_MAX_AGE'] = 0
+        elif mode == 'persistent':
+            settings_dict['CONN_MAX_AGE'] = 600
+        else:
+            settings_dict['CONN_MAX_AGE'] = 0
+            settings_dict['OPTIONS']['pool'] = {'min_size': 1, 'max_size': 2}
+        backend = load_backend(settings_dict['ENGINE'])
+        return backend.DatabaseWrapper(settings_dict, alias=f'bench_{mode}')
+
+    def _bench_mode(self, alias, mode, host, port, requests, queries):
+        try:
+            wrapper = self._make_wrapper(alias, mode, host, port)
+        except Exception as exc:
+            self.stdout.write(self.style.WARNING(f'⚠️  {mode}: {exc}'))
+            return
+
+        connects = []
+
+        def count_connect(sender, connection, **kwargs):
+            if connection is wrapper:
+                connects.append(1)
+
+        connection_created.connect(count_connect, weak=False)
+        latencies = []
+        try:
+            for _ in range(requests):
+                # request_started
+                wrapper.close_if_unusable_or_obsolete()
+                start = time.perf_counter()
+                with wrapper.cursor() as cursor:
+                    for _ in range(queries):
+                        cursor.execute('SELECT 1')
+                        cursor.fetchone()
+                # request_finished
+                wrapper.close_if_unusable_or_obsolete()
+                latencies.append((time.perf_counter() - start) * 1000)
+        except Exception as exc:
+            self.stdout.write(self.style.WARNING(f'⚠️  {mode}: {exc}'))
+            return
+        finally:
+            connection_created.disconnect(count_connect)
+            wrapper.close()
+            if mode == 'pool':
+                wrapper.close_pool()
+
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {mode:<12} p50 {p50:7.2f}ms · p99 {p99:7.2f}ms · '
+            f'media {statistics.mean(latencies):7.2f}ms · conexiones {len(connects)}'
+        ))
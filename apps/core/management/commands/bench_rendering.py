@@ -0,0 +1,86 @@
+"""
+Tiempo de render JSON y bytes enviados de los endpoints más pesados.
+
+USO:
+    python manage.py seed_synthetic --properties 200
+    python manage.py bench_rendering
+    python manage.py bench_rendering --iterations 50
+
+Para cada endpoint obtiene response.data una vez y compara:
+    - render con el JSONRenderer de DRF (json de la stdlib) vs ORJSONRenderer
+    - bytes sin comprimir vs gzip vs brotli (con la configuración de
+      CompressionMiddleware) y el tiempo de compresión
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.benchmarks import benchmark_environment
+from apps.core.compression import compress
+from apps.properties.models import Property
+from hr_properties.renderers import ORJSONRenderer
+
+
+def _best_of(func, iterations):
+    """Menor tiempo en ms de `iterations` ejecuciones (menos ruido que la media)"""
+    best = float('inf')
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+class Command(BaseCommand):
+    help = 'Compara el render JSON (stdlib vs orjson) y los bytes con gzip / brotli de los endpoints pesados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Iteraciones por medición (default: 20)')
+
+    def handle(self, *args, **options):
+        if not Property.objects.exists():
+            raise CommandError('No hay propiedades: ejecutar primero python manage.py seed_synthetic')
+        iterations = options['iterations']
+
+        with benchmark_environment() as context:
+            endpoints = {
+                'obligations_list': '/api/obligations/',
+                'rentals_list': '/api/rentals/',
+                'property_list': '/api/properties/',
+                'property_financials': f'/api/properties/{context.property.pk}/financials/',
+                'rental_payments': f'/api/properties/{context.property.pk}/rentals/{context.rental.pk}/payments/',
+                'dashboard': '/api/dashboard/',
+            }
+            self.stdout.write(
+                f'🚀 Render: stdlib vs orjson · compresión: gzip -{settings.COMPRESSION_GZIP_LEVEL} '
+                f'vs brotli q{settings.COMPRESSION_BROTLI_QUALITY} · mejor de {iterations}\n'
+            )
+            header = (
+                f"{'endpoint':<20} {'json':>9} {'orjson':>9} {'×':>5}   "
+                f"{'bytes':>9} {'gzip':>8} {'ms':>6} {'br':>8} {'ms':>6}"
+            )
+            self.stdout.write(header)
+            self.stdout.write('─' * len(header))
+
+            for name, url in endpoints.items():
+                response = context.client.get(url, HTTP_HOST='localhost')
+                if response.status_code != 200:
+                    self.stdout.write(self.style.WARNING(f'⚠️  {name}: {url} respondió {response.status_code}'))
+                    continue
+                data = response.data
+                stdlib_ms = _best_of(lambda: JSONRenderer().render(data), iterations)
+                orjson_ms = _best_of(lambda: ORJSONRenderer().render(data), iterations)
+                body = ORJSONRenderer().render(data)
+                if body != JSONRenderer().render(data):
+                    self.stdout.write(self.style.WARNING(f'⚠️  {name}: la salida de orjson difiere de la de DRF'))
+                gzip_body, brotli_body = compress(body, 'gzip'), compress(body, 'br')
+                gzip_ms = _best_of(lambda: compress(body, 'gzip'), iterations)
+                brotli_ms = _best_of(lambda: compress(body, 'br'), iterations)
+                self.stdout.write(
+                    f'{name:<20} {stdlib_ms:7.2f}ms {orjson_ms:7.2f}ms {stdlib_ms / orjson_ms:5.1f}   '
+                    f'{len(body):9,} {len(gzip_body):8,} {gzip_ms:6.2f} {len(brotli_body):8,} {brotli_ms:6.2f}'
+                )
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Listo'))
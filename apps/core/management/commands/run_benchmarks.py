@@ -0,0 +1,111 @@
+"""
+Benchmarks de latencia y consultas de los caminos calientes (ver apps/core/benchmarks.py)
+
+USO:
+    python manage.py seed_synthetic --properties 500 --years 3
+    python manage.py run_benchmarks                      # compara con la línea base
+    python manage.py run_benchmarks --save-baseline      # guarda la línea base
+    python manage.py run_benchmarks --only dashboard,property_list --iterations 50
+
+La línea base se guarda por motor de BD en .benchmarks/baseline-<vendor>.json
+(SQLite y PostgreSQL no son comparables entre sí). Falla (exit code 1) si:
+    - un benchmark supera su presupuesto de consultas
+    - respecto a la línea base hay más consultas, o el p50 empeora más que --tolerance
+"""
+import json
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core.benchmarks import BENCHMARKS, benchmark_environment, compare, measure
+from apps.properties.models import Property
+
+
+class Command(BaseCommand):
+    help = 'Mide latencia p50/p95 y consultas de dashboard, propiedades, finanzas, alertas y media'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Iteraciones medidas (default: 20)')
+        parser.add_argument('--warmup', type=int, default=2, help='Iteraciones de calentamiento (default: 2)')
+        parser.add_argument('--only', default='', help=f'Benchmarks separados por coma ({", ".join(BENCHMARKS)})')
+        parser.add_argument('--baseline', default=None, help='Archivo de línea base (default: .benchmarks/baseline-<vendor>.json)')
+        parser.add_argument('--save-baseline', action='store_true', help='Guardar los resultados como línea base')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='Empeoramiento de p50 tolerado (default: 0.5 = 50%%)')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['only'].split(',') if name.strip()] or list(BENCHMARKS)
+        unknown = set(names) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f'Benchmarks desconocidos: {", ".join(sorted(unknown))}')
+        if not Property.objects.exists():
+            raise CommandError('No hay propiedades: ejecutar primero python manage.py seed_synthetic')
+
+        baseline_path = options['baseline'] or os.path.join(
+            settings.BASE_DIR, '.benchmarks', f'baseline-{connection.vendor}.json'
+        )
+        self.stdout.write(
+            f"🚀 {len(names)} benchmark(s) · {options['iterations']} iteraciones · "
+            f"{connection.vendor} · {Property.objects.count()} propiedades\n"
+        )
+
+        results, over_budget = {}, []
+        with benchmark_environment() as context:
+            for name in names:
+                result = measure(getattr(context, name), options['iterations'], options['warmup'])
+                results[name] = result
+                budget = BENCHMARKS[name]
+                line = (
+                    f"{name:<20} p50 {result['p50_ms']:8.2f}ms · p95 {result['p95_ms']:8.2f}ms · "
+                    f"{result['queries']:>3} consultas (máx. {budget})"
+                )
+                if result['queries'] > budget:
+                    over_budget.append(f"{name}: {result['queries']} consultas, presupuesto {budget}")
+                    self.stdout.write(self.style.ERROR(f'✗ {line}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'✓ {line}'))
+
+        if options['save_baseline']:
+            self._save_baseline(baseline_path, results)
+            regressions = []
+        else:
+            regressions = self._compare(baseline_path, results, options['tolerance'])
+
+        failures = over_budget + regressions
+        if failures:
+            raise CommandError('Benchmarks fallidos:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('\n✅ Benchmarks dentro del presupuesto'))
+
+    def _save_baseline(self, path, results):
+        baseline = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                baseline = json.load(file).get('results', {})
+        baseline.update(results)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({
+                'vendor': connection.vendor,
+                'properties': Property.objects.count(),
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+                'results': baseline,
+            }, file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'\n💾 Línea base guardada en {path}'))
+
+    def _compare(self, path, results, tolerance):
+        if not os.path.exists(path):
+            self.stdout.write(self.style.WARNING(f'\n⚠️  Sin línea base ({path}): usar --save-baseline'))
+            return []
+        with open(path) as file:
+            data = json.load(file)
+        if data.get('properties') != Property.objects.count():
+            self.stdout.write(self.style.WARNING(
+                f"\n⚠️  La línea base se tomó con {data.get('properties')} propiedades: "
+                'las latencias no son comparables'
+            ))
+        regressions = compare(results, data.get('results', {}), tolerance)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'\n✓ Sin regresiones respecto a {path}'))
+        return regressions
@@ -0,0 +1,386 @@
+"""
+Genera datos sintéticos realistas para medir rendimiento (run_benchmarks).
+
+USO:
+    python manage.py seed_synthetic
+    python manage.py seed_synthetic --properties 500 --years 5
+    python manage.py seed_synthetic --clear          # borra los datos sintéticos anteriores
+
+Genera, con bulk_create (sin señales), para cada propiedad:
+    - PropertyDetails
+    - Rentals: mensuales (contratos de 6-12 meses con un pago por mes y su
+      MonthlyRental) y Airbnb (estadías de 2-10 noches con AirbnbRental y pago)
+    - Obligaciones (impuesto anual, seguro anual, administración mensual)
+      con sus pagos hasta hoy
+    - Reparaciones
+y además tenants, vehículos con obligaciones/pagos/reparaciones,
+notificaciones e historial de alertas (AlertSent).
+
+occupancy_status / current_rental_check_out se calculan al final y se
+reconstruye el índice de búsqueda. Los datos se marcan para poder borrarlos:
+propiedades "[synthetic] ...", tenants @synthetic.test, vehículos del
+conductor "[synthetic]".
+
+Por seguridad solo corre con DEBUG=True o con --force.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.emails.models import AlertSent
+from apps.finance.models import Notification, Obligation, ObligationType, PaymentMethod, PropertyPayment
+from apps.maintenance.models import Repair
+from apps.properties.models import Property, PropertyDetails
+from apps.rentals.models import AirbnbRental, MonthlyRental, Rental, RentalPayment, Tenant
+from apps.vehicles.models import ObligationVehicle, Vehicle, VehiclePayment, VehicleRepair
+
+SYNTHETIC_PREFIX = '[synthetic]'
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.test'
+BATCH_SIZE = 1000
+
+CITIES = [
+    ('Cali', 'Valle del Cauca'), ('Palmira', 'Valle del Cauca'), ('Jamundí', 'Valle del Cauca'),
+    ('Bogotá', 'Cundinamarca'), ('Medellín', 'Antioquia'), ('Cartagena', 'Bolívar'),
+]
+FIRST_NAMES = ['Ana', 'Carlos', 'María', 'Luis', 'Sofía', 'Andrés', 'Valentina', 'Jorge', 'Camila', 'Diego']
+LAST_NAMES = ['Gómez', 'Rodríguez', 'López', 'Martínez', 'García', 'Hernández', 'Torres', 'Ramírez']
+STREETS = ['Calle', 'Carrera', 'Avenida', 'Diagonal', 'Transversal']
+REPAIRS = ['Plomería', 'Pintura', 'Electricidad', 'Cerrajería', 'Techo', 'Jardinería']
+BRANDS = [('Toyota', 'Corolla'), ('Mazda', '3'), ('Chevrolet', 'Spark'), ('Renault', 'Duster'), ('Kia', 'Picanto')]
+
+
+def months_between(start, end):
+    """Primer día de cada mes entre start y end"""
+    current = start.replace(day=1)
+    while current <= end:
+        yield current
+        current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos (propiedades, rentals, pagos, obligaciones, vehículos...) para benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--properties', type=int, default=200, help='Propiedades a generar (default: 200)')
+        parser.add_argument('--years', type=int, default=3, help='Años de historia hasta hoy (default: 3)')
+        parser.add_argument('--vehicles', type=int, default=None, help='Vehículos (default: propiedades / 10)')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla aleatoria (default: 42)')
+        parser.add_argument('--clear', action='store_true', help='Borrar los datos sintéticos existentes antes de generar')
+        parser.add_argument('--force', action='store_true', help='Permitir ejecutar con DEBUG=False')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('seed_synthetic escribe miles de filas: usar DEBUG=True o --force')
+
+        self.random = random.Random(options['seed'])
+        self.today = timezone.now().date()
+        self.start = self.today.replace(year=self.today.year - options['years'])
+        self.payment_methods = list(PaymentMethod.objects.all())
+        if not self.payment_methods:
+            self.payment_methods = [PaymentMethod.objects.create(name='cash')]
+        self.counts = {}
+
+        with transaction.atomic():
+            if options['clear']:
+                self._clear()
+            properties = self._properties(options['properties'])
+            self._details(properties)
+            self._rentals(properties)
+            obligations = self._obligations(properties)
+            self._repairs(properties)
+            self._vehicles(options['vehicles'] if options['vehicles'] is not None else max(options['properties'] // 10, 1))
+            self._notifications(obligations)
+            self._alert_history(obligations)
+
+        call_command('rebuild_search_index', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('\n✅ Datos sintéticos generados'))
+        for name, total in self.counts.items():
+            self.stdout.write(f'   {name}: {total}')
+
+    # ── Utilidades ──────────────────────────────────────────────────────────
+
+    def _bulk(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        self.counts[model._meta.verbose_name_plural] = self.counts.get(model._meta.verbose_name_plural, 0) + len(created)
+        return created
+
+    def _money(self, low, high, step=1000):
+        return Decimal(self.random.randrange(low, high, step))
+
+    def _day_between(self, start, end):
+        return start + timedelta(days=self.random.randint(0, max((end - start).days, 0)))
+
+    def _clear(self):
+        Property.objects.filter(name__startswith=SYNTHETIC_PREFIX).delete()
+        Tenant.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').delete()
+        Vehicle.objects.filter(driver=SYNTHETIC_PREFIX).delete()
+        Notification.objects.filter(title__startswith=SYNTHETIC_PREFIX).delete()
+        AlertSent.objects.filter(recipient_email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').delete()
+        self.stdout.write(self.style.WARNING('🗑️  Datos sintéticos anteriores eliminados'))
+
+    # ── Propiedades ─────────────────────────────────────────────────────────
+
+    def _properties(self, count):
+        properties = []
+        for i in range(count):
+            city, state = self.random.choice(CITIES)
+            use = self.random.choices(['rental', 'personal', 'commercial'], weights=[7, 2, 1])[0]
+            properties.append(Property(
+                name=f'{SYNTHETIC_PREFIX} Propiedad {i + 1}',
+                use=use,
+                rental_type=self.random.choice(['monthly', 'airbnb']) if use == 'rental' else 'monthly',
+                address=f'{self.random.choice(STREETS)} {self.random.randint(1, 120)} # {self.random.randint(1, 99)}-{self.random.randint(1, 99)}',
+                zip_code=f'76{self.random.randint(0, 9999):04d}',
+                type_building=self.random.choice(['house', 'apartment', 'apartment', 'office', 'land']),
+                city=city,
+                state=state,
+            ))
+        return self._bulk(Property, properties)
+
+    def _details(self, properties):
+        self._bulk(PropertyDetails, [
+            PropertyDetails(
+                property=prop,
+                bedrooms=self.random.randint(1, 5),
+                bathrooms=self.random.randint(1, 3),
+                half_bathrooms=self.random.randint(0, 1),
+                floors=self.random.randint(1, 3),
+                observations='',
+            )
+            for prop in properties
+        ])
+
+    # ── Rentals ─────────────────────────────────────────────────────────────
+
+    def _tenant(self, tenants):
+        index = len(tenants)
+        tenants.append(Tenant(
+            name=self.random.choice(FIRST_NAMES),
+            lastname=self.random.choice(LAST_NAMES),
+            email=f'tenant{index}.{self.random.randint(0, 10**6)}@{SYNTHETIC_EMAIL_DOMAIN}',
+            phone1=f'9{self.random.randint(0, 10**9 - 1):09d}',
+            birth_year=self.random.randint(1960, 2002),
+        ))
+        return tenants[-1]
+
+    def _rentals(self, properties):
+        tenants, rentals, payments, monthly, airbnb = [], [], [], [], []
+        phones = set(Tenant.objects.values_list('phone1', flat=True))
+
+        for prop in properties:
+            if prop.use != 'rental':
+                continue
+            if prop.rental_type == 'monthly':
+                stays = self._monthly_contracts()
+            else:
+                stays = self._airbnb_stays()
+            for check_in, check_out, amount in stays:
+                tenant = self._tenant(tenants)
+                while tenant.phone1 in phones:
+                    tenant.phone1 = f'9{self.random.randint(0, 10**9 - 1):09d}'
+                phones.add(tenant.phone1)
+                occupied = check_in <= self.today < check_out
+                rentals.append((prop, tenant, Rental(
+                    property=prop,
+                    rental_type=prop.rental_type,
+                    check_in=check_in,
+                    check_out=check_out,
+                    amount=amount,
+                    total_amount=amount if prop.rental_type == 'airbnb' else None,
+                    people_count=self.random.randint(1, 5),
+                    status='occupied' if occupied else 'available',
+                )))
+
+        tenants = self._bulk(Tenant, tenants)
+        for _, tenant, rental in rentals:
+            rental.tenant = tenant
+        created = self._bulk(Rental, [rental for _, _, rental in rentals])
+
+        for rental in created:
+            if rental.rental_type == 'monthly':
+                monthly.append(MonthlyRental(rental=rental, deposit_amount=rental.amount, is_refundable=True))
+                for month in months_between(rental.check_in, min(rental.check_out, self.today)):
+                    payments.append(self._rental_payment(rental, month + timedelta(days=self.random.randint(0, 9))))
+            else:
+                airbnb.append(AirbnbRental(rental=rental, is_paid=rental.check_in <= self.today, deposit_amount=0))
+                if rental.check_in <= self.today:
+                    payments.append(self._rental_payment(rental, rental.check_in, rental.total_amount))
+        self._bulk(MonthlyRental, monthly)
+        self._bulk(AirbnbRental, airbnb)
+        self._bulk(RentalPayment, payments)
+        self._update_occupancy(properties, created)
+
+    def _monthly_contracts(self):
+        stays, current = [], self.start + timedelta(days=self.random.randint(0, 60))
+        while current < self.today + timedelta(days=180):
+            months = self.random.randint(6, 12)
+            check_out = current + timedelta(days=30 * months)
+            stays.append((current, check_out, self._money(800_000, 3_500_000, 50_000)))
+            # Período vacío entre contratos
+            current = check_out + timedelta(days=self.random.choice([0, 0, 15, 30, 60]))
+        return stays
+
+    def _airbnb_stays(self):
+        stays, current = [], self.start + timedelta(days=self.random.randint(0, 10))
+        nightly = self._money(120_000, 450_000, 10_000)
+        while current < self.today + timedelta(days=60):
+            nights = self.random.randint(2, 10)
+            check_out = current + timedelta(days=nights)
+            stays.append((current, check_out, nightly * nights))
+            current = check_out + timedelta(days=self.random.randint(0, 12))
+        return stays
+
+    def _rental_payment(self, rental, day, amount=None):
+        return RentalPayment(
+            rental=rental,
+            payment_method=self.random.choice(self.payment_methods),
+            payment_location=self.random.choice(['office', 'online', 'online']),
+            date=min(day, self.today),
+            amount=amount or rental.amount,
+        )
+
+    def _update_occupancy(self, properties, rentals):
+        occupied = {}
+        for rental in rentals:
+            if rental.status == 'occupied':
+                current = occupied.get(rental.property_id)
+                occupied[rental.property_id] = min(current, rental.check_out) if current else rental.check_out
+        for prop in properties:
+            prop.occupancy_status = 'occupied' if prop.pk in occupied else 'available'
+            prop.current_rental_check_out = occupied.get(prop.pk)
+        Property.objects.bulk_update(properties, ['occupancy_status', 'current_rental_check_out'], batch_size=BATCH_SIZE)
+
+    # ── Obligaciones, reparaciones ──────────────────────────────────────────
+
+    def _obligations(self, properties):
+        types = {name: ObligationType.objects.get_or_create(name=name)[0] for name in ('tax', 'insurance', 'fee')}
+        obligations = []
+        for prop in properties:
+            for year in range(self.start.year, self.today.year + 1):
+                obligations.append(Obligation(
+                    property=prop, obligation_type=types['tax'], entity_name='Impuesto predial',
+                    amount=self._money(600_000, 4_000_000), due_date=date(year, 3, 31), temporality='annual',
+                ))
+                obligations.append(Obligation(
+                    property=prop, obligation_type=types['insurance'], entity_name='Seguro hogar',
+                    amount=self._money(300_000, 1_500_000), due_date=date(year, 7, 15), temporality='annual',
+                ))
+            if prop.type_building == 'apartment':
+                for month in months_between(self.start, self.today + timedelta(days=60)):
+                    obligations.append(Obligation(
+                        property=prop, obligation_type=types['fee'], entity_name='Administración',
+                        amount=self._money(150_000, 600_000, 10_000), due_date=month.replace(day=10), temporality='monthly',
+                    ))
+        obligations = self._bulk(Obligation, obligations)
+
+        payments = [
+            PropertyPayment(
+                obligation=obligation,
+                payment_method=self.random.choice(self.payment_methods),
+                payment_location=self.random.choice(['office', 'online']),
+                amount=obligation.amount,
+                date=obligation.due_date - timedelta(days=self.random.randint(0, 10)),
+            )
+            for obligation in obligations
+            # ~90% de las vencidas están pagadas
+            if obligation.due_date <= self.today and self.random.random() < 0.9
+        ]
+        self._bulk(PropertyPayment, payments)
+        return obligations
+
+    def _repairs(self, properties):
+        repairs = []
+        for prop in properties:
+            for _ in range(self.random.randint(0, 2) * max((self.today - self.start).days // 365, 1)):
+                kind = self.random.choice(REPAIRS)
+                repairs.append(Repair(
+                    property=prop,
+                    cost=self._money(50_000, 2_000_000),
+                    date=self._day_between(self.start, self.today),
+                    description=kind,
+                    observation='',
+                ))
+        self._bulk(Repair, repairs)
+
+    # ── Vehículos ───────────────────────────────────────────────────────────
+
+    def _vehicles(self, count):
+        vehicles = self._bulk(Vehicle, [
+            Vehicle(
+                driver=SYNTHETIC_PREFIX,
+                type=self.random.choice(['car', 'motorcycle', 'truck']),
+                purchase_date=self._day_between(self.start, self.today),
+                purchase_price=self._money(20_000_000, 120_000_000, 100_000),
+                brand=brand,
+                model=model,
+            )
+            for brand, model in (self.random.choice(BRANDS) for _ in range(count))
+        ])
+        obligations, repairs = [], []
+        for vehicle in vehicles:
+            for year in range(self.start.year, self.today.year + 1):
+                for name, due in (('SOAT', date(year, 2, 1)), ('Impuesto vehicular', date(year, 5, 30))):
+                    obligations.append(ObligationVehicle(
+                        name=name, vehicle=vehicle, entity_name=name, due_date=due,
+                        amount=self._money(300_000, 1_500_000), temporality='annual',
+                    ))
+            repairs.append(VehicleRepair(
+                vehicle=vehicle, date=self._day_between(self.start, self.today),
+                description='Mantenimiento preventivo', cost=self._money(150_000, 1_200_000),
+            ))
+        obligations = self._bulk(ObligationVehicle, obligations)
+        self._bulk(VehicleRepair, repairs)
+        self._bulk(VehiclePayment, [
+            VehiclePayment(
+                obligation=obligation,
+                payment_method=self.random.choice(self.payment_methods),
+                date=obligation.due_date,
+                amount=obligation.amount,
+            )
+            for obligation in obligations
+            if obligation.due_date <= self.today
+        ])
+
+    # ── Notificaciones y alertas ────────────────────────────────────────────
+
+    def _notifications(self, obligations):
+        due = [obligation for obligation in obligations if obligation.due_date <= self.today + timedelta(days=30)]
+        sample = self.random.sample(due, min(len(due), 2000))
+        notifications = self._bulk(Notification, [
+            Notification(
+                type='obligation_due',
+                priority=self.random.choice(['low', 'medium', 'high']),
+                title=f'{SYNTHETIC_PREFIX} {obligation.entity_name}',
+                message=f'Vence el {obligation.due_date}',
+                is_read=obligation.due_date < self.today - timedelta(days=15),
+                obligation=obligation,
+            )
+            for obligation in sample
+        ])
+        # created_at es auto_now_add: repartirlas en el tiempo como en producción
+        for notification, obligation in zip(notifications, sample):
+            notification.created_at = timezone.make_aware(
+                datetime.combine(obligation.due_date - timedelta(days=5), time(8))
+            )
+        Notification.objects.bulk_update(notifications, ['created_at'], batch_size=BATCH_SIZE)
+
+    def _alert_history(self, obligations):
+        content_type = ContentType.objects.get_for_model(Obligation)
+        self._bulk(AlertSent, [
+            AlertSent(
+                content_type=content_type,
+                object_id=obligation.pk,
+                alert_type=alert_type,
+                recipient_email=f'admin@{SYNTHETIC_EMAIL_DOMAIN}',
+            )
+            for obligation in obligations
+            if obligation.due_date < self.today
+            for alert_type in ('5_days', '1_day')
+        ])
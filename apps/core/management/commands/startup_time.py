@@ -0,0 +1,94 @@
+"""
+Mide el arranque de la aplicación en un intérprete nuevo (lo que paga cada worker de gunicorn).
+
+USO:
+    python manage.py startup_time
+    python manage.py startup_time --top 20
+    python manage.py startup_time --check    # falla si un módulo perezoso se importa al arrancar
+
+Fases: django.setup() (settings + apps), URLconf (todas las vistas) y la
+aplicación WSGI/ASGI. Lista los módulos que más tardan en importarse
+(python -X importtime).
+
+LAZY_MODULES se importan solo dentro de la función que los usa (p. ej. el
+cliente de Google en verify_google_token, Pillow en apps/media/derivatives.py):
+importarlos a nivel de módulo agregaría su costo a cada worker y a cada comando.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+LAZY_MODULES = ['google.oauth2', 'google.auth.transport.requests', 'PIL.Image']
+
+_PROBE = '''
+import json, os, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+t1 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t2 = time.perf_counter()
+from hr_properties.{server_mode}sgi import application
+t3 = time.perf_counter()
+print(json.dumps({{
+    'setup': t1 - t0, 'urls': t2 - t1, 'application': t3 - t2,
+    'lazy_loaded': [name for name in {lazy_modules!r} if name in sys.modules],
+}}))
+'''
+
+
+def _slowest_imports(importtime_output, top):
+    """[(ms acumulados, módulo)] de los imports de primer nivel más lentos"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Solo imports de primer nivel (sin indentación) para no contar dos veces
+        if name.startswith('  '):
+            continue
+        rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+class Command(BaseCommand):
+    help = 'Mide el tiempo de arranque (setup, URLconf, aplicación) y los imports más lentos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='Imports más lentos a mostrar (default: 10)')
+        parser.add_argument('--asgi', action='store_true', help='Medir hr_properties.asgi en vez de wsgi')
+        parser.add_argument('--check', action='store_true', help='Fallar si se importa algún módulo de LAZY_MODULES')
+
+    def handle(self, *args, **options):
+        probe = _PROBE.format(server_mode='a' if options['asgi'] else 'w', lazy_modules=LAZY_MODULES)
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'hr_properties.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', probe],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'El arranque falló:\n{result.stderr[-2000:]}')
+        phases = json.loads(result.stdout.strip().splitlines()[-1])
+
+        total = phases['setup'] + phases['urls'] + phases['application']
+        self.stdout.write(self.style.SUCCESS(f'🚀 Arranque: {total * 1000:.0f}ms'))
+        self.stdout.write(f"   django.setup()  {phases['setup'] * 1000:7.0f}ms")
+        self.stdout.write(f"   URLconf         {phases['urls'] * 1000:7.0f}ms")
+        self.stdout.write(f"   aplicación      {phases['application'] * 1000:7.0f}ms")
+
+        self.stdout.write("\n🐢 Imports más lentos (acumulado):")
+        for milliseconds, name in _slowest_imports(result.stderr, options['top']):
+            self.stdout.write(f'   {milliseconds:7.1f}ms  {name}')
+
+        if phases['lazy_loaded']:
+            message = f"Módulos perezosos importados al arrancar: {', '.join(phases['lazy_loaded'])}"
+            if options['check']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(f'\n⚠️  {message}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('\n✓ Ningún módulo de LAZY_MODULES se importa al arrancar'))
@@ -0,0 +1,192 @@
+"""
+Métricas Prometheus de la API, el cache, el envío de emails y los comandos programados
+
+GET /metrics (ver views.py) expone:
+
+    http_request_duration_seconds{view, method}        histograma de latencia
+    http_responses_total{view, method, status}         respuestas por código
+    db_queries_total{view}, db_query_seconds_total{view}
+    cache_requests_total{cache, result}                 hit / miss (catálogo)
+    email_send_duration_seconds{kind}, email_send_failures_total{kind}
+    job_last_run_timestamp_seconds{job}, job_last_success_timestamp_seconds{job},
+    job_duration_seconds{job}, job_failures_total{job}
+    db_replica_routing_total{target}                    replica / sticky / unavailable
+    db_replica_lag_seconds                              retraso de la réplica (última verificación)
+    throttle_rejections_total{scope, kind}              429 por throttle (hr_properties/throttling.py)
+
+`view` es la vista DRF y su acción ('ObligationViewSet.list', 'DashboardView'),
+no la URL, para que la cantidad de series no crezca con los ids.
+
+Varios procesos (workers de gunicorn, comandos de cron): con la variable de
+entorno PROMETHEUS_MULTIPROC_DIR cada proceso escribe sus valores en ese
+directorio y /metrics los agrega (gunicorn.conf.py lo limpia al arrancar y
+marca los workers que terminan). Sin la variable, cada proceso expone solo
+los suyos (runserver, tests).
+"""
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+from prometheus_client import (  # noqa: E402  (después de crear MULTIPROC_DIR)
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de las requests por vista', ['view', 'method'],
+)
+RESPONSES = Counter(
+    'http_responses_total', 'Respuestas por vista y código de estado', ['view', 'method', 'status'],
+)
+DB_QUERIES = Counter('db_queries_total', 'Consultas SQL por vista', ['view'])
+DB_QUERY_TIME = Counter('db_query_seconds_total', 'Tiempo en consultas SQL por vista', ['view'])
+CACHE_REQUESTS = Counter('cache_requests_total', 'Lecturas de cache (hit / miss)', ['cache', 'result'])
+EMAIL_DURATION = Histogram(
+    'email_send_duration_seconds', 'Duración del envío de emails', ['kind'],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+EMAIL_FAILURES = Counter('email_send_failures_total', 'Emails que fallaron al enviarse', ['kind'])
+JOB_LAST_RUN = Gauge(
+    'job_last_run_timestamp_seconds', 'Última ejecución de un comando programado', ['job'],
+    multiprocess_mode='mostrecent',
+)
+JOB_LAST_SUCCESS = Gauge(
+    'job_last_success_timestamp_seconds', 'Última ejecución sin errores de un comando programado', ['job'],
+    multiprocess_mode='mostrecent',
+)
+JOB_DURATION = Gauge(
+    'job_duration_seconds', 'Duración de la última ejecución de un comando programado', ['job'],
+    multiprocess_mode='mostrecent',
+)
+JOB_FAILURES = Counter('job_failures_total', 'Ejecuciones fallidas de un comando programado', ['job'])
+REPLICA_ROUTING = Counter(
+    'db_replica_routing_total', 'Requests de vistas read_replica por destino de las lecturas', ['target'],
+)
+THROTTLE_REJECTIONS = Counter(
+    'throttle_rejections_total', 'Requests rechazadas por throttling', ['scope', 'kind'],
+)
+REPLICA_LAG = Gauge(
+    'db_replica_lag_seconds', 'Retraso de replicación medido en la última verificación',
+    multiprocess_mode='mostrecent',
+)
+
+
+# ── Consultas SQL de la request actual ──────────────────────────────────────
+
+class DbUsage:
+    def __init__(self):
+        self.queries = 0
+        self.time = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, duration):
+        # gather_queries ejecuta consultas de la misma request en varios hilos
+        with self._lock:
+            self.queries += 1
+            self.time += duration
+
+
+_db_usage = contextvars.ContextVar('metrics_db_usage', default=None)
+
+
+def start_request():
+    usage = DbUsage()
+    return usage, _db_usage.set(usage)
+
+
+def end_request(token):
+    _db_usage.reset(token)
+
+
+def count_query(execute, sql, params, many, context):
+    """execute_wrapper de las conexiones (ver signals.py)"""
+    usage = _db_usage.get()
+    if usage is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        usage.add(time.perf_counter() - start)
+
+
+def install_query_counter(connection):
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+def observe_request(view, method, status, duration, usage):
+    REQUEST_LATENCY.labels(view, method).observe(duration)
+    RESPONSES.labels(view, method, str(status)).inc()
+    if usage.queries:
+        DB_QUERIES.labels(view).inc(usage.queries)
+        DB_QUERY_TIME.labels(view).inc(usage.time)
+
+
+# ── Cache, email, comandos ──────────────────────────────────────────────────
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+@contextmanager
+def time_email(kind):
+    """Duración del envío; si lanza una excepción cuenta el fallo y la propaga"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EMAIL_FAILURES.labels(kind).inc()
+        raise
+    finally:
+        EMAIL_DURATION.labels(kind).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_job(job):
+    """
+    Última ejecución, último éxito y duración de un comando programado.
+    Se usa como decorador de handle():
+
+        @track_job('send_due_alerts')
+        def handle(self, *args, **options): ...
+    """
+    started_at = time.time()
+    start = time.perf_counter()
+    JOB_LAST_RUN.labels(job).set(started_at)
+    try:
+        yield
+    except Exception:
+        JOB_FAILURES.labels(job).inc()
+        raise
+    else:
+        JOB_LAST_SUCCESS.labels(job).set(time.time())
+    finally:
+        JOB_DURATION.labels(job).set(time.perf_counter() - start)
+
+
+def record_replica_routing(target):
+    REPLICA_ROUTING.labels(target).inc()
+
+
+def record_replica_lag(seconds):
+    REPLICA_LAG.set(seconds)
+
+
+def record_throttled(scope, kind):
+    THROTTLE_REJECTIONS.labels(scope, kind).inc()
+
+
+def render():
+    """(contenido, content_type) en formato de texto de Prometheus"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,274 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from hr_properties.media_views import stream_async
+
+from . import compression, metrics, profiling, replicas
+
+
+def _view_name(view_func, method):
+    """'ObligationViewSet.list', 'DashboardView', 'protected_media'"""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', repr(view_func))
+    action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+    return f'{view_class.__name__}.{action}' if action else view_class.__name__
+
+
+class ProfilingMiddleware:
+    """
+    Consultas, tiempo de BD, de serialización y total por request (ver apps/core/profiling.py)
+
+    - PROFILING_SAMPLE_RATE: fracción de requests instrumentadas (0 = desactivado)
+    - Con PROFILING_STRICT=True se instrumentan todas
+    Funciona en modo WSGI y ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        profiling.install_serializer_timing()
+
+    def _sampled(self):
+        if settings.PROFILING_STRICT:
+            return True
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    def _finish(self, profile, request, response):
+        if settings.PROFILING_SERVER_TIMING:
+            response['Server-Timing'] = profile.server_timing()
+        profiling.report(profile, request, response)
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        profile, token = profiling.start_profile()
+        request.profile = profile
+        try:
+            response = self.get_response(request)
+        finally:
+            profiling.end_profile(token)
+        return self._finish(profile, request, response)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        profile, token = profiling.start_profile()
+        request.profile = profile
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiling.end_profile(token)
+        return self._finish(profile, request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.view = _view_name(view_func, request.method)
+
+
+class MetricsMiddleware:
+    """
+    Latencia, código de estado y consultas SQL de cada request (ver apps/core/metrics.py)
+
+    Va primero en MIDDLEWARE para medir también el resto de middlewares.
+    Funciona en modo WSGI y ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _finish(self, request, response, start, usage):
+        metrics.observe_request(
+            getattr(request, 'metrics_view', 'unmatched'), request.method,
+            response.status_code, time.perf_counter() - start, usage,
+        )
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        usage, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self._finish(request, response, start, usage)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        usage, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self._finish(request, response, start, usage)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = _view_name(view_func, request.method)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise (archivos de STATIC_ROOT con hash, gzip/brotli y cache de un año)
+    que además funciona en modo ASGI sin pasar toda la request por un hilo.
+
+    Bajo ASGI el archivo se envía con un iterador async, como en protected_media.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _static_file(self, request):
+        if self.autorefresh:
+            return self.find_file(request.path_info)
+        return self.files.get(request.path_info)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        static_file = self._static_file(request)
+        if static_file is not None:
+            return stream_async(self.serve(static_file, request))
+        return await self.get_response(request)
+
+
+class CompressionMiddleware:
+    """
+    gzip / brotli negociado por Accept-Encoding (ver apps/core/compression.py)
+
+    Reemplaza a GZipMiddleware: agrega brotli y un tamaño mínimo
+    (COMPRESSION_MIN_SIZE). Bajo ASGI los cuerpos de más de
+    COMPRESSION_OFFLOAD_SIZE bytes se comprimen en el pool de hilos para no
+    bloquear el event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _negotiate(self, request, response):
+        if not compression.compressible(response):
+            return None
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return compression.accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+    def _apply(self, response, encoding, content):
+        if len(content) >= len(response.content):
+            return response
+        return compression.apply(response, encoding, content)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        encoding = self._negotiate(request, response)
+        if encoding is None:
+            return response
+        return self._apply(response, encoding, compression.compress(response.content, encoding))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        encoding = self._negotiate(request, response)
+        if encoding is None:
+            return response
+        if len(response.content) > settings.COMPRESSION_OFFLOAD_SIZE:
+            content = await sync_to_async(compression.compress, thread_sensitive=False)(response.content, encoding)
+        else:
+            content = compression.compress(response.content, encoding)
+        return self._apply(response, encoding, content)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lecturas de los GET de vistas con `read_replica = True` a la réplica y
+    marca read-your-writes después de cada escritura (ver apps/core/replicas.py)
+
+    Sin el alias `replica` en DATABASES no hace nada. Funciona en modo WSGI
+    y ASGI: bajo ASGI process_view es async para que la marca de la réplica
+    (una ContextVar) quede en el contexto de la request y no en el de un hilo.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self._process_view_async
+
+    def _wrote(self, request, response):
+        return (
+            request.method not in replicas.SAFE_METHODS
+            and response.status_code < 400
+            and replicas.replica_configured()
+        )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = replicas.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.end_request(token)
+        if self._wrote(request, response):
+            replicas.pin_to_primary(request)
+        return response
+
+    async def __acall__(self, request):
+        token = replicas.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            replicas.end_request(token)
+        if self._wrote(request, response):
+            await sync_to_async(replicas.pin_to_primary)(request)
+        return response
+
+    def _route(self, request, target):
+        if target is None:
+            return
+        request.db_routing = target
+        metrics.record_replica_routing(target)
+        if target == 'replica':
+            replicas.read_from_replica()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self._route(request, replicas.route_request(request, view_func))
+
+    async def _process_view_async(self, request, view_func, view_args, view_kwargs):
+        # Cache y verificación de la réplica en un hilo; la ContextVar se fija aquí
+        self._route(request, await sync_to_async(replicas.route_request)(request, view_func))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('key', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('full_at', models.FloatField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Throttle Bucket',
+                'verbose_name_plural': 'Throttle Buckets',
+                'db_table': 'throttle_bucket',
+            },
+        ),
+    ]
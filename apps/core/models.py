@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class ThrottleBucket(models.Model):
+    """
+    Estado GCRA de un bucket de throttling (ver hr_properties/throttling.py)
+
+    full_at: instante (epoch) en que el bucket vuelve a estar lleno. Una fila
+    con full_at en el pasado equivale a no tener fila y se puede borrar.
+    """
+    key = models.CharField(max_length=200, primary_key=True)
+    full_at = models.FloatField(db_index=True)
+
+    class Meta:
+        db_table = 'throttle_bucket'
+        verbose_name = 'Throttle Bucket'
+        verbose_name_plural = 'Throttle Buckets'
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,220 @@
+"""
+Instrumentación por request: consultas SQL, tiempo de BD, de serialización y total
+
+ProfilingMiddleware (apps/core/middleware.py) abre un RequestProfile para
+una muestra de las requests (PROFILING_SAMPLE_RATE) y al terminar:
+
+- agrega el header Server-Timing:
+      Server-Timing: db;dur=12.4;desc="9 queries", serialize;dur=30.1, total;dur=51.7
+- registra en el log 'apps.core.profiling' las requests lentas
+  (PROFILING_SLOW_REQUEST_MS) o con muchas consultas (PROFILING_MAX_QUERIES)
+- detecta N+1: la misma forma de SQL (sin parámetros) repetida
+  PROFILING_N_PLUS_ONE_THRESHOLD veces o más, indicando la vista y el campo
+  del serializer que la disparó:
+      N+1 en ObligationViewSet.list: ObligationDetailSerializer.payments
+      ejecutó 25× SELECT ... FROM "property_payment" WHERE ... IN (...)
+- con PROFILING_STRICT=True lanza NPlusOneDetected (para que fallen los tests)
+
+Las consultas se miden con un execute_wrapper que se instala en cada conexión
+(señal connection_created) y no hace nada si la request no está muestreada.
+El contexto viaja en un ContextVar, así cuenta también las consultas de
+sync_to_async / gather_queries en otros hilos.
+"""
+import contextvars
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+# Normalización de SQL a su "forma": literales y listas IN (...) → ?
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:[^()]|\([^()]*\))*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class NPlusOneDetected(AssertionError):
+    """Modo estricto: la request repitió la misma consulta N+1 veces"""
+
+
+def sql_shape(sql: str) -> str:
+    shape = _STRING_LITERAL.sub('?', sql)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+def _query_origin():
+    """
+    (serializer, campo, archivo:línea) de quien disparó la consulta actual:
+    el to_representation de serializer más interno que está recorriendo un
+    campo, y el primer frame de código del proyecto
+    """
+    from rest_framework.serializers import Serializer
+
+    serializer = field = location = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if location is None:
+            filename = code.co_filename
+            if filename.startswith(_PROJECT_ROOT) and 'site-packages' not in filename and filename != __file__:
+                location = f'{os.path.relpath(filename, _PROJECT_ROOT)}:{frame.f_lineno}'
+        if serializer is None and code.co_name == 'to_representation':
+            owner = frame.f_locals.get('self')
+            current_field = frame.f_locals.get('field')
+            if isinstance(owner, Serializer) and current_field is not None:
+                serializer = type(owner).__name__
+                field = getattr(current_field, 'field_name', None)
+        if serializer is not None and location is not None:
+            break
+        frame = frame.f_back
+    return serializer, field, location
+
+
+class RequestProfile:
+    def __init__(self, n_plus_one_threshold):
+        self.started = time.perf_counter()
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.view = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.shapes = Counter()
+        self.origins = {}
+        self._serialize_depth = 0
+        self._lock = threading.Lock()
+
+    def record_query(self, sql, duration):
+        shape = sql_shape(sql)
+        with self._lock:
+            self.queries += 1
+            self.db_time += duration
+            self.shapes[shape] += 1
+            count = self.shapes[shape]
+        if count == self.n_plus_one_threshold:
+            # Solo se inspecciona el stack al cruzar el umbral (una vez por forma)
+            self.origins[shape] = _query_origin()
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def n_plus_one(self):
+        """[{sql, count, serializer, field, location}] de las formas repetidas"""
+        return [
+            {
+                'sql': shape,
+                'count': count,
+                'serializer': self.origins.get(shape, (None,) * 3)[0],
+                'field': self.origins.get(shape, (None,) * 3)[1],
+                'location': self.origins.get(shape, (None,) * 3)[2],
+            }
+            for shape, count in self.shapes.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+    def server_timing(self):
+        total = self.total_time
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def current_profile():
+    return _current_profile.get()
+
+
+def start_profile():
+    profile = RequestProfile(settings.PROFILING_N_PLUS_ONE_THRESHOLD)
+    return profile, _current_profile.set(profile)
+
+
+def end_profile(token):
+    _current_profile.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper de las conexiones (ver signals.py)"""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed_serializer_data(fget):
+    @wraps(fget)
+    def data(serializer):
+        profile = _current_profile.get()
+        if profile is None:
+            return fget(serializer)
+        # Solo el serializer más externo (uno anidado que llame a .data no suma dos veces)
+        profile._serialize_depth += 1
+        start = time.perf_counter()
+        try:
+            return fget(serializer)
+        finally:
+            profile._serialize_depth -= 1
+            if profile._serialize_depth == 0:
+                profile.serialize_time += time.perf_counter() - start
+    data._profiled = True
+    return data
+
+
+def install_serializer_timing():
+    """Mide BaseSerializer.data (donde DRF ejecuta to_representation)"""
+    from rest_framework.serializers import BaseSerializer
+
+    if not getattr(BaseSerializer.data.fget, '_profiled', False):
+        BaseSerializer.data = property(_timed_serializer_data(BaseSerializer.data.fget))
+
+
+def report(profile, request, response):
+    """Log de request lenta / con muchas consultas / N+1. Lanza NPlusOneDetected en modo estricto"""
+    view = profile.view or request.path
+    total_ms = profile.total_time * 1000
+    problems = profile.n_plus_one()
+
+    for problem in problems:
+        origin = f"{problem['serializer']}.{problem['field']}" if problem['serializer'] else problem['location']
+        logger.warning(
+            'N+1 en %s: %s ejecutó %s× %s',
+            view, origin or 'código desconocido', problem['count'], problem['sql'][:300],
+        )
+
+    if total_ms >= settings.PROFILING_SLOW_REQUEST_MS or profile.queries >= settings.PROFILING_MAX_QUERIES:
+        logger.warning(
+            'Request lenta %s %s (%s): %.0fms total, %s consultas en %.0fms, serialización %.0fms',
+            request.method, request.path, view, total_ms,
+            profile.queries, profile.db_time * 1000, profile.serialize_time * 1000,
+        )
+
+    if problems and settings.PROFILING_STRICT:
+        problem = problems[0]
+        raise NPlusOneDetected(
+            f"N+1 en {view}: {problem['serializer']}.{problem['field']} "
+            f"({problem['location']}) ejecutó {problem['count']}× {problem['sql']}"
+        )
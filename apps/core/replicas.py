@@ -0,0 +1,214 @@
+"""
+Lecturas en una réplica de la base de datos (alias `replica`, opcional)
+
+Con DB_REPLICA_HOST (PostgreSQL) o DB_REPLICA_NAME (p. ej. otro archivo
+SQLite en desarrollo) settings.py agrega el alias `replica` y:
+
+- ReplicaRoutingMiddleware manda a la réplica las lecturas de los GET/HEAD
+  de las vistas con `read_replica = True` (dashboard, finanzas, listados)
+- on_replica(queryset) hace lo mismo para los escaneos de los comandos
+  (send_due_alerts)
+- Las escrituras, las transacciones y todo lo demás van al primario
+
+Read-your-writes: después de una request que escribe (POST/PUT/PATCH/DELETE
+sin error), las lecturas del mismo cliente (mismo header Authorization o
+misma IP si es anónimo) van al primario durante REPLICA_STICKY_SECONDS.
+
+Fallback: cada REPLICA_CHECK_INTERVAL segundos cada proceso verifica la
+réplica (conexión + retraso de replicación en PostgreSQL). Si no responde,
+o el retraso supera REPLICA_MAX_LAG_SECONDS, las lecturas vuelven al
+primario hasta la siguiente verificación. Un error de conexión en una
+consulta la marca caída de inmediato.
+
+Prueba local con dos archivos SQLite:
+
+    DB_ENGINE=django.db.backends.sqlite3 DB_NAME=/tmp/primary.sqlite3 DB_REPLICA_NAME=/tmp/replica.sqlite3
+    python manage.py migrate && cp /tmp/primary.sqlite3 /tmp/replica.sqlite3
+
+(la copia es una "réplica" congelada: lo que se escriba después solo se ve
+en el primario, útil para probar read-your-writes). Las migraciones nunca se
+aplican a `replica`: en PostgreSQL llegan por replicación.
+"""
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import InterfaceError, OperationalError
+
+from hr_properties.throttling import client_ip
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ALIAS = 'replica'
+PIN_CACHE_PREFIX = 'replica:pin:'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Retraso de replicación en segundos (0 si está al día o no es un standby)
+_POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+_lock = threading.Lock()
+_health = {'available': False, 'checked_at': None, 'lag': None}
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _measure_lag():
+    """Segundos de retraso de la réplica (None si no se puede saber)"""
+    connection = connections[REPLICA_ALIAS]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(_POSTGRES_LAG_SQL)
+            lag = cursor.fetchone()[0]
+            return float(lag) if lag is not None else None
+        cursor.execute('SELECT 1')
+        return 0.0
+
+
+def check_replica():
+    """Verifica la réplica ahora y actualiza el estado compartido del proceso"""
+    try:
+        lag = _measure_lag()
+    except Exception as exc:
+        _set_health(False, None, f'no disponible ({exc})')
+        return False
+    if lag is None or lag > settings.REPLICA_MAX_LAG_SECONDS:
+        _set_health(False, lag, f'retraso de {lag}s')
+        return False
+    _set_health(True, lag)
+    return True
+
+
+def _set_health(available, lag, reason=''):
+    with _lock:
+        was_available = _health['available']
+        _health.update(available=available, lag=lag, checked_at=time.monotonic())
+    if lag is not None:
+        metrics.record_replica_lag(lag)
+    if was_available and not available:
+        logger.warning('Réplica %s: %s; lecturas al primario', REPLICA_ALIAS, reason)
+    elif available and not was_available:
+        logger.info('Réplica %s disponible (retraso %.1fs)', REPLICA_ALIAS, lag)
+
+
+def replica_available():
+    """Estado de la réplica, verificado como mucho cada REPLICA_CHECK_INTERVAL segundos"""
+    if not replica_configured():
+        return False
+    checked_at = _health['checked_at']
+    if checked_at is None or time.monotonic() - checked_at >= settings.REPLICA_CHECK_INTERVAL:
+        return check_replica()
+    return _health['available']
+
+
+def mark_replica_down(execute, sql, params, many, context):
+    """execute_wrapper de la conexión `replica`: un error de conexión la saca de inmediato"""
+    try:
+        return execute(sql, params, many, context)
+    except (OperationalError, InterfaceError) as exc:
+        _set_health(False, None, f'error en consulta ({exc})')
+        raise
+
+
+def install_replica_guard(connection):
+    if connection.alias == REPLICA_ALIAS and mark_replica_down not in connection.execute_wrappers:
+        connection.execute_wrappers.append(mark_replica_down)
+
+
+def start_request():
+    return _replica_reads.set(False)
+
+
+def end_request(token):
+    _replica_reads.reset(token)
+
+
+def read_from_replica():
+    """Desde aquí hasta end_request() las lecturas van a la réplica"""
+    _replica_reads.set(True)
+
+
+@contextmanager
+def replica_reads():
+    """Las lecturas dentro del bloque van a la réplica (si está disponible)"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def on_replica(queryset):
+    """El queryset en la réplica si está disponible; si no, sin cambios"""
+    return queryset.using(REPLICA_ALIAS) if replica_available() else queryset
+
+
+class ReplicaRouter:
+    """
+    Lecturas a la réplica solo dentro de replica_reads() (middleware) y fuera
+    de transacciones; las instancias siguen en la base de la que salieron.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or hints.get('instance') is not None:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_ALIAS if replica_available() else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_migrate(self, db, app_label, **hints):
+        return False if db == REPLICA_ALIAS else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Mismos datos en las dos bases
+        databases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+# ── Read-your-writes ────────────────────────────────────────────────────────
+
+def _client_key(request):
+    """Identidad del cliente para la marca de read-your-writes"""
+    identity = request.META.get('HTTP_AUTHORIZATION', '') or client_ip(request)
+    return PIN_CACHE_PREFIX + hashlib.sha256(identity.encode()).hexdigest()[:32]
+
+
+def pin_to_primary(request):
+    cache.set(_client_key(request), 1, settings.REPLICA_STICKY_SECONDS)
+
+
+def pinned_to_primary(request):
+    return cache.get(_client_key(request)) is not None
+
+
+def route_request(request, view_func):
+    """'replica', 'sticky' (escribió hace poco) o 'unavailable'; None si la vista no lee de la réplica"""
+    if request.method not in SAFE_METHODS or not replica_configured():
+        return None
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if not getattr(view_class, 'read_replica', False):
+        return None
+    if pinned_to_primary(request):
+        return 'sticky'
+    return 'replica' if replica_available() else 'unavailable'
@@ -0,0 +1,21 @@
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .db import record_connection, record_request
+from .metrics import install_query_counter
+from .profiling import install_query_recorder
+from .replicas import install_replica_guard
+
+
+@receiver(connection_created)
+def track_connection_created(sender, connection, **kwargs):
+    record_connection(connection)
+    install_query_recorder(connection)
+    install_query_counter(connection)
+    install_replica_guard(connection)
+
+
+@receiver(request_started)
+def track_request_started(sender, **kwargs):
+    record_request()
@@ -0,0 +1,400 @@
+import gzip
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+import brotli
+from django.core.management import call_command
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from apps.finance.models import Obligation, ObligationType, PaymentMethod, PropertyPayment
+from apps.finance.serializers import ObligationDetailSerializer
+from apps.finance.tests import seed_obligations
+from apps.properties.models import Property
+from apps.properties.tests import seed_properties
+from apps.users.models import Role, User, UserRole
+from hr_properties.renderers import ORJSONRenderer
+from hr_properties.throttling import IPThrottle, parse_rate
+
+from . import db, profiling, replicas
+from .models import ThrottleBucket
+
+
+class SqlShapeTests(TestCase):
+
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            profiling.sql_shape("SELECT * FROM t WHERE id = 5 AND name = 'x''y' AND k IN (1, 2, 3)"),
+            'SELECT * FROM t WHERE id = ? AND name = ? AND k IN (...)',
+        )
+
+
+@override_settings(ALLOWED_HOSTS=['*'], PROFILING_SAMPLE_RATE=1, PROFILING_N_PLUS_ONE_THRESHOLD=5)
+class ProfilingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        obligations = seed_obligations(seed_properties(5), count=10)
+        payment_method, _ = PaymentMethod.objects.get_or_create(name='cash')
+        PropertyPayment.objects.bulk_create([
+            PropertyPayment(obligation=obligation, payment_method=payment_method, amount=10, date=obligation.due_date)
+            for obligation in obligations
+        ])
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_n_plus_one_names_serializer_field(self):
+        profile, token = profiling.start_profile()
+        try:
+            ObligationDetailSerializer(Obligation.objects.all(), many=True).data
+        finally:
+            profiling.end_profile(token)
+        fields = {(problem['serializer'], problem['field']) for problem in profile.n_plus_one()}
+        self.assertIn(('ObligationDetailSerializer', 'obligation_type'), fields)
+        self.assertIn(('PropertyPaymentSerializer', 'payment_method_name'), fields)
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/obligations/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('serialize;dur=', response['Server-Timing'])
+
+    @override_settings(PROFILING_STRICT=True)
+    def test_strict_mode_raises(self):
+        profile = profiling.RequestProfile(n_plus_one_threshold=3)
+        for _ in range(3):
+            profile.record_query('SELECT * FROM "payment_method" WHERE "id" = %s', 0.001)
+        with self.assertLogs('apps.core.profiling', 'WARNING'), self.assertRaises(profiling.NPlusOneDetected):
+            profiling.report(profile, RequestFactory().get('/api/obligations/'), None)
+
+    @override_settings(PROFILING_STRICT=True)
+    def test_obligation_list_has_no_n_plus_one(self):
+        # En modo estricto un N+1 lanza NPlusOneDetected y el test falla
+        self.assertEqual(self.client.get('/api/obligations/').status_code, 200)
+        self.assertEqual(self.client.get('/api/vehicle-obligations/').status_code, 200)
+
+
+class BenchmarkTests(TestCase):
+
+    def test_seeded_benchmarks_stay_within_query_budgets(self):
+        out = StringIO()
+        call_command('seed_synthetic', properties=4, years=1, force=True, stdout=out)
+        self.assertTrue(Property.objects.filter(name__startswith='[synthetic]').exists())
+        # Supera un presupuesto de consultas → CommandError
+        call_command(
+            'run_benchmarks', iterations=1, warmup=0,
+            baseline=os.path.join(tempfile.mkdtemp(), 'baseline.json'), stdout=out,
+        )
+        self.assertIn('Benchmarks dentro del presupuesto', out.getvalue())
+
+
+@override_settings(ALLOWED_HOSTS=['*'], METRICS_TOKEN='secret')
+class MetricsTests(TestCase):
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_metrics_require_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+
+    def test_request_and_job_metrics(self):
+        self.client.get('/api/properties/')
+        call_command('update_rental_status', stdout=StringIO())
+        body = self.scrape()
+        self.assertIn('http_responses_total{method="GET",status="200",view="PropertyViewSet.list"}', body)
+        self.assertIn('db_queries_total{view="PropertyViewSet.list"}', body)
+        self.assertIn('job_last_success_timestamp_seconds{job="update_rental_status"}', body)
+
+    def test_readyz_checks_database_and_media(self):
+        self.assertEqual(self.client.get('/healthz').status_code, 200)
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['checks'], {'database': 'ok', 'migrations': 'ok', 'media': 'ok'})
+        missing = os.path.join(media_root, 'missing')
+        with override_settings(MEDIA_ROOT=missing), self.assertLogs('apps.core.views', 'WARNING'):
+            response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks'], {'database': 'ok', 'migrations': 'ok', 'media': 'error'})
+        self.assertNotIn(missing, response.content.decode())
+
+    def test_readyz_reports_pending_migrations(self):
+        with mock.patch('apps.core.views.pending_migrations', return_value=['finance.0099_next']), \
+                self.assertLogs('apps.core.views', 'WARNING') as logs:
+            response = self.client.get('/readyz')
+            detailed = self.client.get('/readyz', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 503)
+        # Respuesta pública sin detalles; el detalle queda en el log
+        self.assertEqual(response.json()['checks']['migrations'], 'error')
+        self.assertIn('finance.0099_next', logs.output[0])
+        self.assertIn('finance.0099_next', detailed.json()['checks']['migrations'])
+
+
+class StartupTests(TestCase):
+
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        # startup_time --check arranca la app en un intérprete nuevo
+        call_command('startup_time', check=True, top=0, stdout=StringIO())
+
+
+@override_settings(ALLOWED_HOSTS=['*'], COMPRESSION_MIN_SIZE=100)
+class RenderingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_obligations(seed_properties(5), count=10)
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_orjson_output_matches_drf(self):
+        data = {
+            'amount': Decimal('12.50'), 'created': timezone.now(), 'day': date(2024, 1, 2),
+            'id': uuid.uuid4(), 1: 'int key', 'text': 'ñ\u2028', 'big': 2 ** 70,
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_negotiated_compression(self):
+        plain = self.client.get('/api/obligations/')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        for accept, encoding, decompress in (('gzip, br', 'br', brotli.decompress), ('gzip', 'gzip', gzip.decompress)):
+            response = self.client.get('/api/obligations/', HTTP_ACCEPT_ENCODING=accept)
+            self.assertEqual(response['Content-Encoding'], encoding)
+            self.assertEqual(decompress(response.content), plain.content)
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get('/api/obligations/', HTTP_ACCEPT_ENCODING='br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class ReplicaRouterTests(SimpleTestCase):
+
+    def test_reads_go_to_replica_only_inside_replica_reads(self):
+        with mock.patch.object(replicas, 'replica_available', return_value=True):
+            self.assertEqual(Obligation.objects.all().db, 'default')
+            with replicas.replica_reads():
+                self.assertEqual(Obligation.objects.all().db, replicas.REPLICA_ALIAS)
+                self.assertEqual(Obligation.objects.db_manager().db, replicas.REPLICA_ALIAS)
+        with mock.patch.object(replicas, 'replica_available', return_value=False), replicas.replica_reads():
+            self.assertEqual(Obligation.objects.all().db, 'default')
+
+    @override_settings(REPLICA_MAX_LAG_SECONDS=10)
+    def test_lagging_replica_falls_back_to_primary(self):
+        with mock.patch.object(replicas, '_measure_lag', return_value=30.0), self.assertLogs('apps.core.replicas', 'WARNING'):
+            replicas._set_health(True, 0.0)
+            self.assertFalse(replicas.check_replica())
+        with mock.patch.object(replicas, '_measure_lag', return_value=1.0):
+            self.assertTrue(replicas.check_replica())
+
+
+@override_settings(
+    ALLOWED_HOSTS=['*'], CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class ReplicaStickinessTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.properties = seed_properties(2)
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        patcher = mock.patch.multiple(replicas, replica_configured=lambda: True, replica_available=lambda: True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_are_pinned_to_primary_after_a_write(self):
+        # Dentro de la transacción del TestCase el router igual usa default
+        response = self.client.get('/api/obligations/', HTTP_AUTHORIZATION='Bearer a')
+        self.assertEqual(response.wsgi_request.db_routing, 'replica')
+        self.assertFalse(hasattr(self.client.get('/api/core/db-stats/').wsgi_request, 'db_routing'))
+
+        property_id = self.properties[1].pk  # la 0 está eliminada
+        response = self.client.post(f'/api/properties/{property_id}/add_obligation/', {
+            'obligation_type': ObligationType.objects.get_or_create(name='tax')[0].pk,
+            'entity_name': 'EAAB', 'amount': 100, 'due_date': '2026-02-15', 'temporality': 'monthly',
+        }, format='json', HTTP_AUTHORIZATION='Bearer a')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get('/api/obligations/', HTTP_AUTHORIZATION='Bearer a').wsgi_request.db_routing, 'sticky')
+        # Otro cliente sigue leyendo de la réplica
+        self.assertEqual(self.client.get('/api/obligations/', HTTP_AUTHORIZATION='Bearer b').wsgi_request.db_routing, 'replica')
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle'},
+})
+class ThrottlingTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        patcher = mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, {
+            'catalog.ip': '3/min', 'login.ip': '20/min', 'login.username': '2/min',
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('20/min'), (20, 60.0))
+        self.assertEqual(parse_rate('5/s'), (5, 1.0))
+        self.assertIsNone(parse_rate(None))
+
+    def test_login_is_limited_per_username_across_ips(self):
+        def login(username, ip):
+            return self.client.post('/api/users/login/', {'username': username, 'password': 'x'},
+                                    format='json', HTTP_CF_CONNECTING_IP=ip)
+
+        self.assertEqual([login('victim', f'10.0.0.{i}').status_code for i in range(2)], [401, 401])
+        response = login(' Victim', '10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        # Una ficha cada 30 s
+        self.assertTrue(0 < int(response['Retry-After']) <= 30)
+        self.assertEqual(login('other', '10.0.0.9').status_code, 401)
+
+    def test_public_catalog_is_limited_per_ip(self):
+        seed_properties(2)
+        url = '/api/properties/?rental_status=available'
+        codes = [self.client.get(url, HTTP_CF_CONNECTING_IP='10.0.0.1').status_code for _ in range(4)]
+        self.assertEqual(codes, [200, 200, 200, 429])
+        self.assertEqual(self.client.get(url, HTTP_CF_CONNECTING_IP='10.0.0.2').status_code, 200)
+
+        admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+        self.client.force_authenticate(admin)
+        self.assertEqual(self.client.get('/api/properties/', HTTP_CF_CONNECTING_IP='10.0.0.1').status_code, 200)
+
+    @override_settings(THROTTLE_STORE='cache')
+    def test_concurrent_requests_cannot_share_a_token(self):
+        view = SimpleNamespace(throttle_scope='catalog')
+        request = RequestFactory().get('/', HTTP_CF_CONNECTING_IP='10.0.0.3')
+        barrier = threading.Barrier(12)
+
+        def attempt(_):
+            barrier.wait()
+            return IPThrottle().allow_request(request, view)
+
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            allowed = list(pool.map(attempt, range(12)))
+        self.assertEqual(allowed.count(True), 3)
+
+
+class DatabaseThrottleStoreTests(TestCase):
+    """Buckets en throttle_bucket (THROTTLE_STORE=database, el default)"""
+    view = SimpleNamespace(throttle_scope='catalog')
+
+    def setUp(self):
+        patcher = mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, {'catalog.ip': '3/min'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def attempt(self, ip='10.0.0.1', at=1000.0):
+        throttle = IPThrottle()
+        request = RequestFactory().get('/', HTTP_CF_CONNECTING_IP=ip)
+        with mock.patch('hr_properties.throttling.time.time', return_value=at):
+            return throttle.allow_request(request, self.view), throttle.wait()
+
+    def test_bucket_is_shared_and_refills(self):
+        self.assertEqual(settings.THROTTLE_STORE, 'database')
+        self.assertEqual([self.attempt()[0] for _ in range(3)], [True, True, True])
+        allowed, wait = self.attempt()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 20.0)
+        self.assertEqual(ThrottleBucket.objects.get().full_at, 1060.0)
+        # Una ficha cada 20 s
+        self.assertEqual(self.attempt(at=1020.0)[0], True)
+        self.assertEqual(self.attempt(at=1020.0)[0], False)
+        self.assertEqual(self.attempt(ip='10.0.0.2', at=1020.0)[0], True)
+
+    def test_token_is_one_conditional_update(self):
+        self.attempt()
+        with self.assertNumQueries(1):
+            self.assertTrue(self.attempt()[0])
+
+    @override_settings(THROTTLE_PURGE_EVERY=2)
+    def test_full_buckets_are_purged(self):
+        self.attempt(ip='10.0.0.1')
+        self.attempt(ip='10.0.0.2', at=2000.0)
+        self.attempt(ip='10.0.0.2', at=2000.0)
+        self.attempt(ip='10.0.0.2', at=2000.0)
+        self.assertEqual(list(ThrottleBucket.objects.values_list('key', flat=True)), ['tb:catalog:ip:10.0.0.2'])
+
+    def test_fails_open(self):
+        with mock.patch.object(ThrottleBucket.objects, 'using', side_effect=DatabaseError), \
+                self.assertLogs('hr_properties.throttling', 'WARNING'):
+            self.assertEqual(self.attempt(), (True, None))
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class DatabaseConnectionTests(TestCase):
+    """Modos de conexión, pre-apertura y /api/core/db-stats/"""
+
+    def settings_patch(self, **values):
+        return mock.patch.dict(connections['default'].settings_dict, values)
+
+    def test_connection_mode(self):
+        with self.settings_patch(CONN_MAX_AGE=600):
+            self.assertEqual(db.connection_mode(), 'persistent')
+        with self.settings_patch(CONN_MAX_AGE=0):
+            self.assertEqual(db.connection_mode(), 'per_request')
+            with mock.patch.dict(connections['default'].settings_dict['OPTIONS'], {'pool': {'max_size': 4}}):
+                self.assertEqual(db.connection_mode(), 'pool')
+
+    def test_prewarm_opens_one_connection_per_worker_thread(self):
+        threads = set()
+        worker = SimpleNamespace(tpool=ThreadPoolExecutor(max_workers=3), cfg=SimpleNamespace(threads=3))
+        with self.settings_patch(CONN_MAX_AGE=600), \
+                mock.patch('apps.core.signals.record_connection', lambda connection: threads.add(threading.get_ident())):
+            opened = db.prewarm_connections(worker)
+        worker.tpool.submit(connections.close_all).result()
+        worker.tpool.shutdown()
+        self.assertEqual(opened, 3)
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.get_ident(), threads)
+
+        with self.settings_patch(CONN_MAX_AGE=0):
+            self.assertEqual(db.prewarm_connections(worker), 0)
+
+    def test_db_stats(self):
+        admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+        client = APIClient()
+        self.assertEqual(client.get('/api/core/db-stats/').status_code, 401)
+
+        client.force_authenticate(admin)
+        with self.settings_patch(CONN_MAX_AGE=600):
+            first = client.get('/api/core/db-stats/').data
+            second = client.get('/api/core/db-stats/').data
+        self.assertEqual(first['mode'], 'persistent')
+        self.assertEqual(first['vendor'], 'sqlite')
+        self.assertEqual(second['requests'], first['requests'] + 1)
+        # La conexión del hilo de tests se reutiliza: ninguna conexión nueva
+        self.assertEqual(second['connects'], first['connects'])
+        self.assertGreaterEqual(second['open_connections'], 1)
+        self.assertGreater(second['reuse_ratio'], 0)
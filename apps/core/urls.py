@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import DatabaseStatsView
+
+urlpatterns = [
+    path('core/db-stats/', DatabaseStatsView.as_view(), name='db-stats'),
+]
@@ -0,0 +1,121 @@
+import logging
+import secrets
+import tempfile
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.users.permissions import IsAdminUser
+
+from . import metrics
+from .db import connection_stats, pending_migrations
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseStatsView(APIView):
+    """
+    Uso de conexiones a la BD del worker que atiende la request (solo admins)
+
+    GET /api/core/db-stats/
+
+    {
+        "mode": "pool",
+        "requests": 1500,
+        "connects": 1500,
+        "open_connections": 4,
+        "pool": {"pool_min": 2, "pool_max": 6, "pool_size": 4, "pool_available": 3,
+                 "in_use": 1, "utilization": 0.1667, "requests_waiting": 0, ...}
+    }
+
+    Ver apps/core/db.py para el significado de cada modo.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(connection_stats())
+
+
+# Las vistas siguientes son de Django puro: sin autenticación JWT, sesión ni BD
+# (salvo el ping de /readyz), para que los probes cada pocos segundos sean baratos.
+
+def _metrics_authorized(request):
+    """Header con METRICS_TOKEN (sin METRICS_TOKEN configurado: solo con DEBUG)"""
+    token = settings.METRICS_TOKEN
+    if token:
+        return secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    return settings.DEBUG
+
+
+@never_cache
+@require_GET
+def metrics_view(request):
+    """
+    GET /metrics — formato de texto de Prometheus (ver apps/core/metrics.py)
+
+    Requiere "Authorization: Bearer <METRICS_TOKEN>"; sin METRICS_TOKEN solo con DEBUG.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        if not secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG:
+        return HttpResponse(status=404)
+    content, content_type = metrics.render()
+    return HttpResponse(content, content_type=content_type)
+
+
+@never_cache
+@require_GET
+def healthz(request):
+    """GET /healthz — el proceso responde (liveness, HEALTHCHECK de Docker)"""
+    return JsonResponse({'status': 'ok'})
+
+
+def _check_database():
+    with connections['default'].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def _check_migrations():
+    pending = pending_migrations()
+    if pending:
+        raise RuntimeError(f'{len(pending)} migración(es) pendiente(s): {", ".join(pending[:5])}')
+
+
+def _check_media():
+    # Crear y borrar un archivo en el volumen de media
+    with tempfile.NamedTemporaryFile(dir=settings.MEDIA_ROOT, prefix='.readyz-'):
+        pass
+
+
+@never_cache
+@require_GET
+def readyz(request):
+    """
+    GET /readyz — puede atender tráfico (readiness)
+
+    200 {"status": "ok", "checks": {"database": "ok", "migrations": "ok", "media": "ok"}}
+    503 {"status": "error", "checks": {"database": "ok", "migrations": "error", "media": "ok"}}
+
+    Es público (Cloudflare Tunnel): el detalle de cada falla (host de la base,
+    rutas, migraciones) va al log, y en la respuesta solo con
+    "Authorization: Bearer <METRICS_TOKEN>" (sin METRICS_TOKEN, con DEBUG).
+    """
+    show_details = _metrics_authorized(request)
+    checks = {}
+    for name, check in (('database', _check_database), ('migrations', _check_migrations), ('media', _check_media)):
+        try:
+            check()
+            checks[name] = 'ok'
+        except Exception as exc:
+            logger.warning('readyz: falla el chequeo %s', name, exc_info=True)
+            checks[name] = f'{type(exc).__name__}: {exc}' if show_details else 'error'
+    healthy = all(result == 'ok' for result in checks.values())
+    return JsonResponse({'status': 'ok' if healthy else 'error', 'checks': checks}, status=200 if healthy else 503)
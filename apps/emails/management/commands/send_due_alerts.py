@@ -29,6 +29,8 @@ import os
 from apps.rentals.models import Rental, RentalPayment
 from apps.finance.models import Obligation
 from apps.emails.models import AlertSent
+from apps.core.metrics import track_job
+from apps.core.replicas import on_replica
 from apps.emails.utils import (
     send_obligation_alert,
     send_rental_due_alert,
@@ -48,6 +50,7 @@ class Command(BaseCommand):
             help='Días específicos para enviar alertas (default: 5 y 1 día antes). Ejemplo: --alert-days 5 1'
         )
 
+    @track_job('send_due_alerts')
     def handle(self, *args, **options):
         today = timezone.now().date()
         alert_days_list = options['alert_days']
@@ -93,9 +96,10 @@ class Command(BaseCommand):
         """Envía alertas de obligaciones que vencen en la fecha especificada"""
         self.stdout.write(self.style.WARNING(f'\n[1] Obligaciones que vencen el {alert_date}...'))
         
-        obligations = Obligation.objects.filter(
+        # Escaneo en la réplica (si hay); AlertSent se consulta y escribe en el primario
+        obligations = on_replica(Obligation.objects.filter(
             due_date=alert_date,
-        ).select_related('property', 'obligation_type')
+        ).select_related('property', 'obligation_type'))
 
         sent_count = 0
         content_type = ContentType.objects.get_for_model(Obligation)
@@ -171,10 +175,10 @@ class Command(BaseCommand):
         """Envía alertas de rentas que vencen en la fecha especificada"""
         self.stdout.write(self.style.WARNING(f'\n[2] Rentas que vencen el {alert_date}...'))
         
-        rentals = Rental.objects.filter(
+        rentals = on_replica(Rental.objects.filter(
             check_out=alert_date,
             status='occupied'
-        ).select_related('tenant', 'property')
+        ).select_related('tenant', 'property'))
 
         sent_count = 0
         content_type = ContentType.objects.get_for_model(Rental)
@@ -234,10 +238,10 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING(f'\n[3] Pagos de renta pendientes (vencen el {alert_date})...'))
         
         # Rentas que vencen en la fecha especificada y no tienen suficientes pagos
-        rentals = Rental.objects.filter(
+        rentals = on_replica(Rental.objects.filter(
             check_out=alert_date,
             status='occupied'
-        ).select_related('tenant', 'property')
+        ).select_related('tenant', 'property'))
 
         sent_count = 0
         content_type = ContentType.objects.get_for_model(Rental)
@@ -1,3 +1,38 @@
+from datetime import date
+
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 
-# Create your tests here.
+from apps.finance.models import Obligation
+from apps.finance.tests import seed_obligations
+from apps.properties.tests import seed_properties
+from hr_properties.query_plans import QueryPlanAssertionsMixin
+
+from .models import AlertSent
+
+
+class AlertSentQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        obligations = seed_obligations(seed_properties(5))
+        cls.content_type = ContentType.objects.get_for_model(Obligation)
+        AlertSent.objects.bulk_create([
+            AlertSent(
+                content_type=cls.content_type,
+                object_id=obligation.id,
+                alert_type=alert_type,
+                recipient_email='admin@example.com',
+            )
+            for obligation in obligations
+            for alert_type in ('5_days', '1_day')
+        ])
+
+    def test_dedup_lookup(self):
+        """send_due_alerts: ¿ya se envió esta alerta? (índice del unique_together)"""
+        queryset = AlertSent.objects.filter(
+            content_type=self.content_type,
+            object_id=1,
+            alert_type='5_days',
+        )
+        self.assertNoSequentialScan(queryset, tables=['alert_sent'])
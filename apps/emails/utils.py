@@ -17,8 +17,10 @@ IMPORTANTE PARA PRODUCCIÓN:
 from django.core.mail import send_mail
 from django.conf import settings
 
+from apps.core.metrics import time_email
 
-def send_custom_email(subject, message, to_email, from_email=None):
+
+def send_custom_email(subject, message, to_email, from_email=None, kind='custom'):
     """
     Función genérica para enviar correos electrónicos
     
@@ -27,6 +29,7 @@ def send_custom_email(subject, message, to_email, from_email=None):
         message (str): Cuerpo del mensaje (texto plano)
         to_email (str): Email del destinatario
         from_email (str, optional): Email del remitente. Si es None, usa DEFAULT_FROM_EMAIL
+        kind (str, optional): Tipo de correo para las métricas (email_send_duration_seconds)
     
     Raises:
         Exception: Si hay error en el envío
@@ -38,13 +41,14 @@ def send_custom_email(subject, message, to_email, from_email=None):
             to_email="usuario@example.com"
         )
     """
-    send_mail(
-        subject,
-        message,
-        from_email,  # Usa el DEFAULT_FROM_EMAIL si es None
-        [to_email],
-        fail_silently=False,
-    )
+    with time_email(kind):
+        send_mail(
+            subject,
+            message,
+            from_email,  # Usa el DEFAULT_FROM_EMAIL si es None
+            [to_email],
+            fail_silently=False,
+        )
 
 
 def send_obligation_alert(obligation, recipient_email, days=None):
@@ -93,7 +97,7 @@ Best regards,
 HR Properties
     """.strip()
     
-    send_custom_email(subject, message, recipient_email)
+    send_custom_email(subject, message, recipient_email, kind='obligation_alert')
 
 
 def send_rental_due_alert(rental, recipient_email, days=None):
@@ -135,7 +139,7 @@ Best regards,
 HR Properties
     """.strip()
     
-    send_custom_email(subject, message, recipient_email)
+    send_custom_email(subject, message, recipient_email, kind='rental_due_alert')
 
 
 def send_rental_payment_reminder(rental, recipient_email, total_paid, days=None):
@@ -181,4 +185,4 @@ Best regards,
 HR Properties
     """.strip()
     
-    send_custom_email(subject, message, recipient_email)
\ No newline at end of file
+    send_custom_email(subject, message, recipient_email, kind='rental_payment_reminder')
\ No newline at end of file
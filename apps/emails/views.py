@@ -190,20 +190,24 @@ EJEMPLO DE USO EN CÓDIGO:
 ========================================
 """
 
-from rest_framework.views import APIView
+from asgiref.sync import sync_to_async
 from rest_framework.response import Response
 from rest_framework import status
+from hr_properties.async_views import AsyncAPIView
 from .utils import send_custom_email
 
 
-class EmailAPIView(APIView):
+class EmailAPIView(AsyncAPIView):
     """
     Vista API para envío manual de correos electrónicos
     
     Ver documentación completa al inicio de este archivo.
+    
+    Vista async: la conversación SMTP corre en el pool de hilos, el worker
+    sigue atendiendo otras requests mientras el servidor de correo responde.
     """
     
-    def post(self, request):
+    async def post(self, request):
         """
         Envía un correo electrónico
         
@@ -229,8 +233,8 @@ class EmailAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Enviar correo
-            send_custom_email(subject, message, to_email)
+            # Enviar correo (SMTP bloqueante, fuera del hilo de la request)
+            await sync_to_async(send_custom_email, thread_sensitive=False)(subject, message, to_email)
             
             return Response(
                 {'message': 'Email sent successfully'},
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0014_alter_paymentmethod_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', 'created_at'], name='notification_read_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['created_at'], name='notification_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='obligation',
+            index=models.Index(fields=['due_date'], name='obligation_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertypayment',
+            index=models.Index(fields=['date'], name='property_payment_date_idx'),
+        ),
+    ]
@@ -93,6 +93,10 @@ class Obligation(models.Model):
         verbose_name = 'Obligation'
         verbose_name_plural = 'Obligations'
         ordering = ['-due_date']
+        indexes = [
+            # Rangos de vencimiento (dashboard, filtros, send_due_alerts)
+            models.Index(fields=['due_date'], name='obligation_due_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.entity_name} - {self.property.name}"
@@ -167,6 +171,9 @@ class PropertyPayment(models.Model):
         verbose_name = 'Obligation Payment'
         verbose_name_plural = 'Obligation Payments'
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date'], name='property_payment_date_idx'),
+        ]
     
     def __str__(self):
         return f"Pago {self.amount} - {self.obligation.entity_name}"
@@ -219,6 +226,16 @@ class Notification(models.Model):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_read', 'created_at'], name='notification_read_created_idx'),
+            # Listado por defecto (no leídas, más recientes primero). Parcial porque
+            # is_read=False se compila como NOT is_read y SQLite no usa el índice anterior
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_read=False),
+                name='notification_unread_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.get_type_display()} - {self.title}"
@@ -1,5 +1,8 @@
+from django.db.models import OuterRef, Subquery, Sum
 from rest_framework import serializers
 from .models import ObligationType, Obligation, PaymentMethod, PropertyPayment, Notification
+from hr_properties.media_signing import SignedMediaModelSerializer
+from hr_properties.flex_fields import FlexFieldsSerializerMixin
 
 
 class ObligationTypeSerializer(serializers.ModelSerializer):
@@ -18,7 +21,7 @@ class PaymentMethodSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class PropertyPaymentSerializer(serializers.ModelSerializer):
+class PropertyPaymentSerializer(SignedMediaModelSerializer):
     """Serializer completo para pagos de obligaciones"""
     payment_method_name = serializers.CharField(source='payment_method.name', read_only=True)
     obligation_name = serializers.CharField(source='obligation.entity_name', read_only=True)
@@ -29,14 +32,14 @@ class PropertyPaymentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class PropertyPaymentCreateSerializer(serializers.ModelSerializer):
+class PropertyPaymentCreateSerializer(SignedMediaModelSerializer):
     """Serializer para crear pagos sin especificar obligation"""
     class Meta:
         model = PropertyPayment
         exclude = ['id', 'obligation']
 
 
-class ObligationSerializer(serializers.ModelSerializer):
+class ObligationSerializer(FlexFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer básico para obligaciones"""
     obligation_type_name = serializers.CharField(source='obligation_type.name', read_only=True)
     property_name = serializers.CharField(source='property.name', read_only=True)
@@ -47,7 +50,7 @@ class ObligationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class ObligationDetailSerializer(serializers.ModelSerializer):
+class ObligationDetailSerializer(FlexFieldsSerializerMixin, SignedMediaModelSerializer):
     """Serializer completo con todos los pagos asociados"""
     obligation_type = ObligationTypeSerializer(read_only=True)
     payments = PropertyPaymentSerializer(many=True, read_only=True)
@@ -63,6 +66,15 @@ class ObligationDetailSerializer(serializers.ModelSerializer):
             'payments', 'total_paid', 'pending_amount'
         ]
         read_only_fields = ['id']
+        expandable_fields = ['obligation_type', 'payments']
+        field_prefetches = {'total_paid': ['payments'], 'pending_amount': ['payments']}
+        # Listados con FastListMixin (hr_properties/fast_serializers.py)
+        fast_annotations = {
+            'payments_total': Subquery(
+                PropertyPayment.objects.filter(obligation=OuterRef('pk'))
+                .values('obligation').annotate(total=Sum('amount')).values('total')
+            ),
+        }
     
     def get_total_paid(self, obj):
         """Calcular total pagado de esta obligación"""
@@ -72,6 +84,13 @@ class ObligationDetailSerializer(serializers.ModelSerializer):
         """Calcular monto pendiente"""
         total_paid = self.get_total_paid(obj)
         return obj.amount - total_paid
+    
+    def fast_total_paid(self, row):
+        """total_paid desde la anotación (0 sin pagos, igual que sum())"""
+        return row['payments_total'] if row['payments_total'] is not None else 0
+    
+    def fast_pending_amount(self, row):
+        return row['amount'] - self.fast_total_paid(row)
 
 
 class ObligationCreateSerializer(serializers.ModelSerializer):
@@ -1,3 +1,212 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connections
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from apps.properties.tests import seed_properties
+from apps.users.models import Role, User, UserRole
+from apps.users.tokens import CachedRefreshToken
+from hr_properties.async_views import gather_queries
+from hr_properties.fast_serializers import compile_serializer
+from hr_properties.query_plans import QueryPlanAssertionsMixin
+
+from .models import Notification, Obligation, ObligationType, PaymentMethod, PropertyPayment
+from .serializers import NotificationSerializer, ObligationDetailSerializer, PropertyPaymentSerializer
+
+
+def seed_obligations(properties, count=60):
+    obligation_type, _ = ObligationType.objects.get_or_create(name='tax')
+    start = date(2026, 1, 1)
+    return Obligation.objects.bulk_create([
+        Obligation(
+            property=properties[i % len(properties)],
+            obligation_type=obligation_type,
+            entity_name=f'Entity {i}',
+            amount=1000,
+            due_date=start + timedelta(days=i),
+            temporality='monthly',
+        )
+        for i in range(count)
+    ])
+
+
+class FinanceQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """Consultas calientes de DashboardView, ObligationFilter y NotificationViewSet"""
+
+    @classmethod
+    def setUpTestData(cls):
+        properties = seed_properties(5)
+        obligations = seed_obligations(properties)
+        payment_method, _ = PaymentMethod.objects.get_or_create(name='cash')
+        PropertyPayment.objects.bulk_create([
+            PropertyPayment(
+                obligation=obligation,
+                payment_method=payment_method,
+                amount=500,
+                date=obligation.due_date,
+            )
+            for obligation in obligations
+        ])
+        Notification.objects.bulk_create([
+            Notification(type='obligation_due', title=f'N{i}', message='-', is_read=i % 2 == 0)
+            for i in range(40)
+        ])
+
+    def test_obligation_due_date_range(self):
+        queryset = Obligation.objects.filter(due_date__gte=date(2026, 2, 1), due_date__lte=date(2026, 2, 28))
+        self.assertNoSequentialScan(queryset, tables=['obligation'])
+
+    def test_obligation_due_on_date(self):
+        """send_due_alerts: obligaciones que vencen en una fecha"""
+        queryset = Obligation.objects.filter(due_date=date(2026, 2, 5)).select_related('property', 'obligation_type')
+        self.assertNoSequentialScan(queryset, tables=['obligation'])
+
+    def test_property_payments_of_month(self):
+        queryset = PropertyPayment.objects.filter(date__gte=date(2026, 2, 1), date__lte=date(2026, 2, 15))
+        self.assertNoSequentialScan(queryset, tables=['property_payment'])
+
+    def test_unread_notifications(self):
+        self.assertNoSequentialScan(Notification.objects.filter(is_read=False), tables=['notification'])
+
+
+class FastListSerializationTests(TestCase):
+    """FastListMixin devuelve los mismos bytes que los serializers completos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        properties = seed_properties(3)
+        cls.obligations = seed_obligations(properties, count=12)
+        payment_method, _ = PaymentMethod.objects.get_or_create(name='cash')
+        PropertyPayment.objects.bulk_create([
+            PropertyPayment(
+                obligation=obligation,
+                payment_method=payment_method,
+                amount='333.33',
+                date=obligation.due_date,
+                voucher_url=f'vouchers/{i}.pdf' if i % 2 else '',
+            )
+            for i, obligation in enumerate(cls.obligations[:8] * 2)
+        ])
+        Notification.objects.bulk_create([
+            Notification(type='obligation_due', priority='high', title=f'N{i}', message='-',
+                         obligation=cls.obligations[i] if i % 2 else None)
+            for i in range(6)
+        ])
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_both(self, url):
+        responses = []
+        for enabled in (True, False):
+            with override_settings(FAST_LIST_SERIALIZATION=enabled):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            responses.append(response.content)
+        return responses
+
+    def test_fast_lists_match_full_serializers(self):
+        obligation = self.obligations[1]
+        for url in (
+            '/api/obligations/?ordering=entity_name',
+            '/api/obligations/?page=2&page_size=5&ordering=-amount',
+            f'/api/properties/{obligation.property_id}/obligations/',
+            f'/api/properties/{obligation.property_id}/obligations/{obligation.pk}/payments/',
+            '/api/notifications/',
+        ):
+            fast, full = self.get_both(url)
+            self.assertEqual(fast, full, url)
+
+    def test_serializers_compile(self):
+        for serializer_class in (ObligationDetailSerializer, PropertyPaymentSerializer, NotificationSerializer):
+            self.assertIsNotNone(compile_serializer(serializer_class()), serializer_class.__name__)
+
+        class WithProperty(serializers.ModelSerializer):
+            label = serializers.CharField(source='__str__')
+
+            class Meta:
+                model = Obligation
+                fields = ['id', 'label']
+
+        self.assertIsNone(compile_serializer(WithProperty()))
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class DashboardTests(TestCase):
+    """DashboardView (AsyncAPIView) bajo WSGI y ASGI, y gather_queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.properties = seed_properties(6)
+        seed_obligations(cls.properties[1:], count=10)
+        seed_obligations(cls.properties[:1], count=3)  # Propiedad soft-deleted
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def test_dashboard_under_wsgi(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['properties']['total'], 5)
+        self.assertEqual(response.data['obligations']['total_count'], 10)
+        self.assertEqual(response.data['obligations']['total_amount'], 10000)
+
+    async def test_dashboard_under_asgi_matches_wsgi(self):
+        token = await sync_to_async(lambda: str(CachedRefreshToken.for_user(self.admin).access_token))()
+        response = await AsyncClient().get('/api/dashboard/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+
+        def wsgi_response():
+            client = APIClient()
+            client.force_authenticate(self.admin)
+            return client.get('/api/dashboard/')
+
+        self.assertEqual(response.json(), (await sync_to_async(wsgi_response)()).json())
+        self.assertEqual((await AsyncClient().get('/api/dashboard/')).status_code, 401)
+
+    def query(self, value):
+        def run():
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+                self.query_threads.add(threading.get_ident())
+            time.sleep(0.05)
+            with self.lock:
+                self.running -= 1
+            return value
+        return run
+
+    def gather(self, pool):
+        self.lock, self.running, self.peak, self.query_threads = threading.Lock(), 0, 0, set()
+        closed_in = set()
+        queries = {f'q{i}': self.query(i) for i in range(5)}
+        connection = connections['default']
+        with mock.patch.object(type(connection), 'vendor', 'postgresql'), \
+                mock.patch.dict(connection.settings_dict['OPTIONS'], {'pool': pool} if pool else {}), \
+                mock.patch.object(connections, 'close_all', lambda: closed_in.add(threading.get_ident())):
+            results = async_to_sync(gather_queries)(queries, max_concurrency=2)
+        self.assertEqual(results, {f'q{i}': i for i in range(5)})
+        return closed_in
+
+    def test_gather_queries_with_pool_runs_concurrently_and_releases_connections(self):
+        closed_in = self.gather(pool={'max_size': 4})
+        self.assertEqual(self.peak, 2)
+        self.assertNotIn(threading.get_ident(), self.query_threads)
+        # Cada hilo que ejecutó una consulta devolvió su conexión
+        self.assertEqual(closed_in, self.query_threads)
+
+    def test_gather_queries_without_pool_runs_sequentially(self):
+        closed_in = self.gather(pool=None)
+        self.assertEqual(self.peak, 1)
+        self.assertEqual(len(self.query_threads), 1)
+        self.assertEqual(closed_in, set())
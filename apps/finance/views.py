@@ -4,12 +4,14 @@ from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.shortcuts import get_object_or_404
-from django.db.models import Sum, Count, Q
+from django.db.models import Sum, Count, Q, Prefetch
 from django.utils import timezone
 from datetime import timedelta
 
 from apps.users.permissions import IsAdminUser
+from hr_properties.async_views import AsyncAPIView, gather_queries
+from hr_properties.fast_serializers import FastListMixin
+from hr_properties.flex_fields import FlexFieldsViewMixin
 from .models import ObligationType, Obligation, PaymentMethod, PropertyPayment, Notification
 from .serializers import (
     ObligationTypeSerializer, 
@@ -25,6 +27,7 @@ from .serializers import (
 from .filters import ObligationFilter, PropertyPaymentFilter, NotificationFilter
 from .pagination import StandardPagination, LargePagination
 from apps.properties.models import Property
+from apps.properties.nested import PROPERTY_LEVEL, PropertyNestedMixin
 
 
 # ========== VIEWSETS PARA CRUD COMPLETO ==========
@@ -81,7 +84,7 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
         })
 
 
-class ObligationViewSet(viewsets.ModelViewSet):
+class ObligationViewSet(FastListMixin, FlexFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet para todas las obligaciones del sistema con filtros y paginación
     
@@ -115,8 +118,14 @@ class ObligationViewSet(viewsets.ModelViewSet):
     EJEMPLO COMBINADO:
     GET /api/obligations/?property=2&due_date_from=2026-02-01&ordering=-amount&page=1
     """
-    queryset = Obligation.objects.filter(property__is_deleted__isnull=True)
+    queryset = Obligation.objects.filter(property__is_deleted__isnull=True).select_related(
+        'property', 'obligation_type'
+    ).prefetch_related(
+        # payment_method_name de cada pago sin una consulta por pago
+        Prefetch('payments', queryset=PropertyPayment.objects.select_related('payment_method'))
+    )
     permission_classes = [IsAdminUser]  # Solo admins
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     pagination_class = StandardPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = ObligationFilter
@@ -143,7 +152,7 @@ class ObligationViewSet(viewsets.ModelViewSet):
 
 # ========== VISTAS ANIDADAS PARA PROPERTIES ==========
 
-class PropertyAddObligationView(generics.CreateAPIView):
+class PropertyAddObligationView(PropertyNestedMixin, generics.CreateAPIView):
     """
     Crear una obligación asociada a una propiedad
     POST /api/properties/{property_id}/add_obligation/
@@ -159,10 +168,6 @@ class PropertyAddObligationView(generics.CreateAPIView):
     """
     serializer_class = ObligationCreateSerializer
     
-    def get_property(self):
-        property_id = self.kwargs.get('property_id')
-        return get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-    
     def create(self, request, *args, **kwargs):
         property_instance = self.get_property()
         
@@ -179,23 +184,27 @@ class PropertyAddObligationView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PropertyObligationsListView(generics.ListAPIView):
+class PropertyObligationsListView(PropertyNestedMixin, FastListMixin, FlexFieldsViewMixin, generics.ListAPIView):
     """
     Listar todas las obligaciones de una propiedad
     GET /api/properties/{property_id}/obligations/
+    GET /api/properties/{property_id}/obligations/?fields=id,entity_name,amount
     
     Retorna lista completa con pagos realizados y montos pendientes
     """
     serializer_class = ObligationDetailSerializer
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return Obligation.objects.filter(property_id=property_id)
+        # Valida que la propiedad exista y no esté eliminada
+        return Obligation.objects.filter(property=self.get_property()).select_related(
+            'property', 'obligation_type'
+        ).prefetch_related(
+            Prefetch('payments', queryset=PropertyPayment.objects.select_related('payment_method'))
+        )
 
 
-class PropertyObligationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PropertyObligationDetailView(PropertyNestedMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Ver, editar o eliminar una obligación específica de una propiedad
     GET /api/properties/{property_id}/obligations/{obligation_id}/
@@ -203,16 +212,14 @@ class PropertyObligationDetailView(generics.RetrieveUpdateDestroyAPIView):
     DELETE /api/properties/{property_id}/obligations/{obligation_id}/
     """
     serializer_class = ObligationDetailSerializer
+    nested_chain = (PROPERTY_LEVEL, ('obligation_id', Obligation, 'property'))
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return Obligation.objects.filter(property_id=property_id)
+        return Obligation.objects.filter(property=self.get_property())
     
     def get_object(self):
-        obligation_id = self.kwargs.get('obligation_id')
-        return get_object_or_404(self.get_queryset(), pk=obligation_id)
+        # Propiedad (no eliminada) + obligación en una sola consulta
+        return self.get_nested_leaf()
     
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -235,7 +242,7 @@ class PropertyObligationDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # ========== VISTAS PARA PAGOS DE OBLIGACIONES ==========
 
-class ObligationAddPaymentView(generics.CreateAPIView):
+class ObligationAddPaymentView(PropertyNestedMixin, generics.CreateAPIView):
     """
     Añadir un pago a una obligación específica
     POST /api/properties/{property_id}/obligations/{obligation_id}/add_payment/
@@ -249,17 +256,11 @@ class ObligationAddPaymentView(generics.CreateAPIView):
     }
     """
     serializer_class = PropertyPaymentCreateSerializer
+    nested_chain = (PROPERTY_LEVEL, ('obligation_id', Obligation, 'property'))
     
     def get_obligation(self):
-        property_id = self.kwargs.get('property_id')
-        obligation_id = self.kwargs.get('obligation_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return get_object_or_404(
-            Obligation, 
-            pk=obligation_id, 
-            property_id=property_id
-        )
+        # Propiedad (no eliminada) + obligación en una sola consulta
+        return self.get_nested_leaf()
     
     def create(self, request, *args, **kwargs):
         obligation_instance = self.get_obligation()
@@ -308,26 +309,21 @@ class ObligationAddPaymentView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ObligationPaymentsListView(generics.ListAPIView):
+class ObligationPaymentsListView(PropertyNestedMixin, FastListMixin, generics.ListAPIView):
     """
     Listar todos los pagos de una obligación
     GET /api/properties/{property_id}/obligations/{obligation_id}/payments/
     """
     serializer_class = PropertyPaymentSerializer
+    nested_chain = (PROPERTY_LEVEL, ('obligation_id', Obligation, 'property'))
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        obligation_id = self.kwargs.get('obligation_id')
-        
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        # Validar que la obligación pertenezca a la propiedad
-        get_object_or_404(Obligation, pk=obligation_id, property_id=property_id)
-        
-        return PropertyPayment.objects.filter(obligation_id=obligation_id)
+        # Valida propiedad (no eliminada) + obligación con una consulta
+        return PropertyPayment.objects.filter(obligation=self.get_nested('obligation_id'))
 
 
-class ObligationPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ObligationPaymentDetailView(PropertyNestedMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Ver, editar o eliminar un pago específico de una obligación
     GET /api/properties/{property_id}/obligations/{obligation_id}/payments/{payment_id}/
@@ -335,21 +331,14 @@ class ObligationPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
     DELETE /api/properties/{property_id}/obligations/{obligation_id}/payments/{payment_id}/
     """
     serializer_class = PropertyPaymentSerializer
+    nested_chain = (PROPERTY_LEVEL, ('obligation_id', Obligation, 'property'), ('payment_id', PropertyPayment, 'obligation'))
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        obligation_id = self.kwargs.get('obligation_id')
-        
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        # Validar que la obligación pertenezca a la propiedad
-        get_object_or_404(Obligation, pk=obligation_id, property_id=property_id)
-        
-        return PropertyPayment.objects.filter(obligation_id=obligation_id)
+        return PropertyPayment.objects.filter(obligation=self.get_nested('obligation_id'))
     
     def get_object(self):
-        payment_id = self.kwargs.get('payment_id')
-        return get_object_or_404(self.get_queryset(), pk=payment_id)
+        # Propiedad (no eliminada) + obligación + pago en una sola consulta
+        return self.get_nested_leaf()
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -361,7 +350,7 @@ class ObligationPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 # ========== DASHBOARD - ESTADÍSTICAS GENERALES ==========
 
-class DashboardView(APIView):
+class DashboardView(AsyncAPIView):
     """
     Vista de Dashboard con estadísticas del sistema
     Solo accesible para administradores
@@ -400,214 +389,160 @@ class DashboardView(APIView):
     
     FUNCIONAMIENTO:
     - Calcula estadísticas en tiempo real
+    - Las consultas se ejecutan concurrentemente (vista async)
     - Útil para mostrar en pantalla principal
     - Puede ser llamado cada vez que el usuario accede al dashboard
     """
     permission_classes = [IsAdminUser]  # Solo admins
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     
-    def get(self, request):
+    async def get(self, request):
+        from apps.rentals.models import Rental, RentalPayment
+        from apps.maintenance.models import Repair
+
         today = timezone.now().date()
         first_day_of_month = today.replace(day=1)
-        
-        # ========== 1. OBLIGACIONES ==========
-        total_obligations = Obligation.objects.filter(property__is_deleted__isnull=True).count()
-        total_obligation_amount = Obligation.objects.filter(property__is_deleted__isnull=True).aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # Total pagado en obligaciones
-        total_paid_obligations = PropertyPayment.objects.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        pending_obligations = total_obligation_amount - total_paid_obligations
-        
-        # Obligaciones que vencen en los próximos 7 días
-        upcoming_obligations = Obligation.objects.filter(property__is_deleted__isnull=True,
-            due_date__gte=today,
-            due_date__lte=today + timedelta(days=7)
-        ).count()
-        
-        # ========== 1.1 OBLIGACIONES DEL MES ==========
-        # Obligaciones del mes actual (por fecha de vencimiento)
+        next_week = today + timedelta(days=7)
+        ending_soon_date = today + timedelta(days=15)
         # NOTA: Incluye TODAS las obligaciones del mes, no solo las que ya vencieron
         last_day_of_month = (first_day_of_month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-        
-        month_obligations = Obligation.objects.filter(property__is_deleted__isnull=True,
+
+        obligations = Obligation.objects.filter(property__is_deleted__isnull=True)
+        month_obligations = obligations.filter(
             due_date__gte=first_day_of_month,
             due_date__lte=last_day_of_month  # Hasta el último día del mes
         )
-        
-        month_obligations_count = month_obligations.count()
-        month_obligations_amount = month_obligations.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # Pagos de obligaciones del mes (pagos realizados este mes)
-        month_obligations_paid = PropertyPayment.objects.filter(
-            
-            date__gte=first_day_of_month,
-            date__lte=today
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        month_obligations_pending = month_obligations_amount - month_obligations_paid
-        
-        # Obligaciones del mes que vencen en los próximos 7 días
-        # Solo cuenta las que están dentro del mes Y vencen en los próximos 7 días
-        month_upcoming = month_obligations.filter(
-            due_date__gte=today,
-            due_date__lte=today + timedelta(days=7)
-        ).count()
-        
-        # ========== 2. PROPIEDADES ==========
-        # Solo contar propiedades activas (no soft-deleted)
-        total_properties = Property.objects.filter(is_deleted__isnull=True).count()
-        properties_by_use = Property.objects.filter(is_deleted__isnull=True).values('use').annotate(count=Count('id'))
-        
-        # ========== 3. RENTALS ==========
-        from apps.rentals.models import Rental, RentalPayment
-        
-        occupied_rentals = Rental.objects.filter(
-            status='occupied',
-            property__is_deleted__isnull=True
-        ).count()
-        
-        # Propiedades de rental sin rental activo (solo activas)
-        available_properties = Property.objects.filter(
-            use='rental',
-            is_deleted__isnull=True  # Excluir soft-deleted
-        ).exclude(
-            rentals__status='occupied'
-        ).distinct().count()
-        
-        # Rentals que terminan en los próximos 15 días
-        upcoming_rental_ends = Rental.objects.filter(
-            status='occupied',
-            property__is_deleted__isnull=True,
-            check_out__gte=today,
-            check_out__lte=today + timedelta(days=15)
-        ).count()
-        
-        # Estadísticas detalladas por tipo de rental (30 días para ending_soon)
-        ending_soon_date = today + timedelta(days=15)
-        
-        # Monthly properties
-        # Ocupadas: propiedades con rental_type='monthly' que tienen un rental activo
-        monthly_occupied = Property.objects.filter(
-            use='rental',
-            rental_type='monthly',
-            is_deleted__isnull=True,
-            rentals__status='occupied'
-        ).distinct().count()
-        
-        # Disponibles: propiedades con rental_type='monthly' sin rental activo
-        monthly_available = Property.objects.filter(
-            use='rental',
-            rental_type='monthly',
-            is_deleted__isnull=True
-        ).exclude(
-            rentals__status='occupied'
-        ).distinct().count()
-        
-        monthly_ending_soon = Rental.objects.filter(
-            rental_type='monthly',
-            status='occupied',
-            property__is_deleted__isnull=True,
-            check_out__gte=today,
-            check_out__lte=ending_soon_date
-        ).count()
-        
-        # Airbnb properties
-        # Ocupadas: propiedades con rental_type='airbnb' que tienen un rental activo
-        airbnb_occupied = Property.objects.filter(
-            use='rental',
-            rental_type='airbnb',
-            is_deleted__isnull=True,
-            rentals__status='occupied'
-        ).distinct().count()
-        
-        # Disponibles: propiedades con rental_type='airbnb' sin rental activo
-        airbnb_available = Property.objects.filter(
-            use='rental',
-            rental_type='airbnb',
-            is_deleted__isnull=True
-        ).exclude(
-            rentals__status='occupied'
-        ).distinct().count()
-        
-        airbnb_ending_soon = Rental.objects.filter(
-            rental_type='airbnb',
-            status='occupied',
-            property__is_deleted__isnull=True,
-            check_out__gte=today,
-            check_out__lte=ending_soon_date
-        ).count()
-        
-        # ========== 4. RESUMEN FINANCIERO DEL MES ==========
-        # Ingresos: pagos de rentals
-        monthly_rental_payments = RentalPayment.objects.filter(
-            date__gte=first_day_of_month,
-            date__lte=today
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Gastos: pagos de obligaciones
-        monthly_obligation_payments = PropertyPayment.objects.filter(
-            date__gte=first_day_of_month,
-            date__lte=today
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Gastos: reparaciones
-        from apps.maintenance.models import Repair
-        monthly_repairs = Repair.objects.filter(
-            date__gte=first_day_of_month
-        ).aggregate(total=Sum('cost'))['total'] or 0
-        
+        month_payments = PropertyPayment.objects.filter(date__gte=first_day_of_month, date__lte=today)
+
+        # Consultas independientes entre sí: se ejecutan concurrentemente
+        # (ver hr_properties.async_views.gather_queries)
+        results = await gather_queries({
+            # ========== 1. OBLIGACIONES ==========
+            'obligations': lambda: obligations.aggregate(
+                count=Count('id'),
+                amount=Sum('amount'),
+                # Obligaciones que vencen en los próximos 7 días
+                upcoming=Count('id', filter=Q(due_date__gte=today, due_date__lte=next_week)),
+            ),
+            # Total pagado en obligaciones
+            'obligations_paid': lambda: PropertyPayment.objects.aggregate(total=Sum('amount'))['total'] or 0,
+
+            # ========== 1.1 OBLIGACIONES DEL MES ==========
+            'month_obligations': lambda: month_obligations.aggregate(
+                count=Count('id'),
+                amount=Sum('amount'),
+                # Solo las que están dentro del mes Y vencen en los próximos 7 días
+                upcoming=Count('id', filter=Q(due_date__gte=today, due_date__lte=next_week)),
+            ),
+            # Pagos de obligaciones realizados este mes (también es el gasto del resumen)
+            'month_payments': lambda: month_payments.aggregate(total=Sum('amount'))['total'] or 0,
+
+            # ========== 2. PROPIEDADES ==========
+            # Solo contar propiedades activas (no soft-deleted)
+            'properties_total': lambda: Property.objects.filter(is_deleted__isnull=True).count(),
+            'properties_by_use': lambda: list(
+                Property.objects.filter(is_deleted__isnull=True).values('use').annotate(count=Count('id'))
+            ),
+
+            # ========== 3. RENTALS ==========
+            # Ocupación por tipo de rental en una sola consulta sobre property
+            # (occupancy_status desnormalizado: sin JOIN con rentals ni DISTINCT)
+            'occupancy': lambda: Property.objects.filter(
+                use='rental',
+                is_deleted__isnull=True  # Excluir soft-deleted
+            ).aggregate(
+                available=Count('id', filter=Q(occupancy_status='available')),
+                monthly_occupied=Count('id', filter=Q(rental_type='monthly', occupancy_status='occupied')),
+                monthly_available=Count('id', filter=Q(rental_type='monthly', occupancy_status='available')),
+                airbnb_occupied=Count('id', filter=Q(rental_type='airbnb', occupancy_status='occupied')),
+                airbnb_available=Count('id', filter=Q(rental_type='airbnb', occupancy_status='available')),
+            ),
+            # Rentals ocupados y los que terminan en los próximos 15 días (total y por tipo)
+            'rentals': lambda: Rental.objects.filter(
+                status='occupied',
+                property__is_deleted__isnull=True
+            ).aggregate(
+                occupied=Count('id'),
+                ending_soon=Count('id', filter=Q(check_out__gte=today, check_out__lte=ending_soon_date)),
+                monthly_ending_soon=Count('id', filter=Q(
+                    rental_type='monthly', check_out__gte=today, check_out__lte=ending_soon_date
+                )),
+                airbnb_ending_soon=Count('id', filter=Q(
+                    rental_type='airbnb', check_out__gte=today, check_out__lte=ending_soon_date
+                )),
+            ),
+
+            # ========== 4. RESUMEN FINANCIERO DEL MES ==========
+            # Ingresos: pagos de rentals
+            'rental_income': lambda: RentalPayment.objects.filter(
+                date__gte=first_day_of_month,
+                date__lte=today
+            ).aggregate(total=Sum('amount'))['total'] or 0,
+            # Gastos: reparaciones
+            'repairs': lambda: Repair.objects.filter(
+                date__gte=first_day_of_month
+            ).aggregate(total=Sum('cost'))['total'] or 0,
+        })
+
+        totals = results['obligations']
+        total_obligation_amount = totals['amount'] or 0
+        total_paid_obligations = results['obligations_paid']
+        month = results['month_obligations']
+        month_obligations_amount = month['amount'] or 0
+        month_obligations_paid = results['month_payments']
+        occupancy = results['occupancy']
+        rentals = results['rentals']
+
         # Neto del mes
+        monthly_rental_payments = results['rental_income']
+        monthly_obligation_payments = results['month_payments']
+        monthly_repairs = results['repairs']
         monthly_net = monthly_rental_payments - monthly_obligation_payments - monthly_repairs
         
         return Response({
             'obligations': {
-                'total_count': total_obligations,
-                'total_amount': float(total_obligation_amount),
-                'total_paid': float(total_paid_obligations),
-                'pending': float(pending_obligations),
-                'upcoming_due': upcoming_obligations
+                'total_count': totals['count'],
+                'total_amount': total_obligation_amount,
+                'total_paid': total_paid_obligations,
+                'pending': total_obligation_amount - total_paid_obligations,
+                'upcoming_due': totals['upcoming']
             },
             'obligations_month': {
-                'total_count': month_obligations_count,
-                'total_amount': float(month_obligations_amount),
-                'total_paid': float(month_obligations_paid),
-                'pending': float(month_obligations_pending),
-                'upcoming_due': month_upcoming
+                'total_count': month['count'],
+                'total_amount': month_obligations_amount,
+                'total_paid': month_obligations_paid,
+                'pending': month_obligations_amount - month_obligations_paid,
+                'upcoming_due': month['upcoming']
             },
             'properties': {
-                'total': total_properties,
-                'by_use': list(properties_by_use)
+                'total': results['properties_total'],
+                'by_use': results['properties_by_use']
             },
             'rentals': {
-                'occupied': occupied_rentals,
-                'available': available_properties,
-                'ending_soon': upcoming_rental_ends,
+                'occupied': rentals['occupied'],
+                # Propiedades de rental sin rental activo (solo activas)
+                'available': occupancy['available'],
+                'ending_soon': rentals['ending_soon'],
                 # Estadísticas detalladas por tipo
-                'monthly_occupied': monthly_occupied,
-                'monthly_available': monthly_available,
-                'monthly_ending_soon': monthly_ending_soon,
-                'airbnb_occupied': airbnb_occupied,
-                'airbnb_available': airbnb_available,
-                'airbnb_ending_soon': airbnb_ending_soon
+                'monthly_occupied': occupancy['monthly_occupied'],
+                'monthly_available': occupancy['monthly_available'],
+                'monthly_ending_soon': rentals['monthly_ending_soon'],
+                'airbnb_occupied': occupancy['airbnb_occupied'],
+                'airbnb_available': occupancy['airbnb_available'],
+                'airbnb_ending_soon': rentals['airbnb_ending_soon']
             },
             'monthly_summary': {
-                'rental_income': float(monthly_rental_payments),
-                'obligation_payments': float(monthly_obligation_payments),
-                'repair_costs': float(monthly_repairs),
-                'net': float(monthly_net)
+                'rental_income': monthly_rental_payments,
+                'obligation_payments': monthly_obligation_payments,
+                'repair_costs': monthly_repairs,
+                'net': monthly_net
             }
         })
 
 
 # ========== NOTIFICACIONES ==========
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet para notificaciones del sistema
     
@@ -651,7 +586,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
        GET /api/notifications/unread_count/
        → {"count": 5}
     """
-    queryset = Notification.objects.all()
+    queryset = Notification.objects.select_related('obligation')
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     pagination_class = StandardPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = NotificationFilter
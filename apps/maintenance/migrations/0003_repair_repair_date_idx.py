@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0002_alter_repair_options_alter_repair_cost_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='repair',
+            index=models.Index(fields=['date'], name='repair_date_idx'),
+        ),
+    ]
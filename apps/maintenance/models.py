@@ -26,6 +26,9 @@ class Repair(models.Model):
         verbose_name = 'Repair'
         verbose_name_plural = 'Repairs'
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date'], name='repair_date_idx'),
+        ]
     
     def __str__(self):
         return f"Reparación - {self.property.name} - {self.date}"
\ No newline at end of file
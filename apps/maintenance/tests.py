@@ -1,3 +1,24 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.properties.tests import seed_properties
+from hr_properties.query_plans import QueryPlanAssertionsMixin
+
+from .models import Repair
+
+
+class RepairQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        properties = seed_properties(5)
+        start = date(2026, 1, 1)
+        Repair.objects.bulk_create([
+            Repair(property=properties[i % 5], cost=100, date=start + timedelta(days=i), description='Repair')
+            for i in range(60)
+        ])
+
+    def test_monthly_repairs(self):
+        """DashboardView: reparaciones desde el primer día del mes"""
+        self.assertNoSequentialScan(Repair.objects.filter(date__gte=date(2026, 2, 1)), tables=['repair'])
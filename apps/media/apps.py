@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MediaConfig(AppConfig):
+    name = 'apps.media'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        import apps.media.signals  # Registrar señales
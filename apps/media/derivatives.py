@@ -0,0 +1,226 @@
+"""
+Derivados de imágenes (miniaturas / tamaños responsive)
+
+Para cada foto subida se generan versiones reducidas en WebP y JPEG:
+
+    property_3/media/fachada.jpg
+    property_3/media/derivatives/fachada.jpg/320.webp
+    property_3/media/derivatives/fachada.jpg/320.jpg
+    property_3/media/derivatives/fachada.jpg/800.webp
+    ...
+    property_3/media/derivatives/fachada.jpg/manifest.json   ← se escribe al final
+
+- Se aplica la orientación EXIF y se descarta el resto de metadatos (GPS, cámara...)
+- Nunca se amplía: los anchos mayores que el original se reemplazan por el ancho original
+- Los nombres son deterministas (<ancho>.<formato>); el manifest lista los anchos
+  generados y se copia también a la fila del modelo (DERIVATIVE_FIELDS), así los
+  serializers construyen las URLs sin leer archivos
+"""
+import io
+import json
+import logging
+import posixpath
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = 'derivatives'
+MANIFEST_NAME = 'manifest.json'
+DERIVATIVE_FORMATS = ('webp', 'jpg')
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff'}
+
+# Se emite al terminar de escribir los derivados de un archivo (kwargs: name, storage, manifest)
+derivatives_generated = Signal()
+
+# (modelo, campo de archivo, campo JSON con el manifest de sus derivados)
+DERIVATIVE_FIELDS = (
+    ('properties.PropertyMedia', 'url', 'derivatives'),
+    ('properties.Property', 'image_url', 'image_derivatives'),
+    ('vehicles.Vehicle', 'photo', 'photo_derivatives'),
+    ('vehicles.VehicleImages', 'image', 'derivatives'),
+)
+
+
+def derivative_widths():
+    return tuple(sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (320, 800, 1600))))
+
+
+def _quality():
+    return int(getattr(settings, 'IMAGE_DERIVATIVE_QUALITY', 80))
+
+
+def is_image_name(name) -> bool:
+    """True si la extensión del archivo corresponde a una imagen procesable"""
+    if not name:
+        return False
+    return posixpath.splitext(str(name))[1].lower() in IMAGE_EXTENSIONS
+
+
+def is_derivative_name(name) -> bool:
+    return f'/{DERIVATIVES_DIR}/' in f'/{name}'
+
+
+def derivative_source(name: str):
+    """Nombre del original de un derivado (None si `name` no es un derivado)"""
+    folder, marker, rest = f'/{name}'.rpartition(f'/{DERIVATIVES_DIR}/')
+    if not marker or '/' not in rest:
+        return None
+    return posixpath.join(folder, rest.split('/', 1)[0]).lstrip('/')
+
+
+def derivatives_dir(name: str) -> str:
+    """Carpeta de derivados de un archivo: <carpeta>/derivatives/<archivo>"""
+    folder, filename = posixpath.split(name)
+    return posixpath.join(folder, DERIVATIVES_DIR, filename)
+
+
+def derivative_name(name: str, width: int, fmt: str) -> str:
+    return posixpath.join(derivatives_dir(name), f'{width}.{fmt}')
+
+
+def manifest_name(name: str) -> str:
+    return posixpath.join(derivatives_dir(name), MANIFEST_NAME)
+
+
+def has_derivatives(name: str, storage=None) -> bool:
+    storage = storage or default_storage
+    return storage.exists(manifest_name(name))
+
+
+def read_manifest(name: str, storage=None):
+    """Manifest de derivados de `name` o None si todavía no se generaron"""
+    storage = storage or default_storage
+    try:
+        with storage.open(manifest_name(name), 'rb') as fh:
+            return json.loads(fh.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def record_manifest(name: str, manifest) -> int:
+    """Copia el manifest (o None) a las filas que referencian `name`; devuelve cuántas"""
+    updated = 0
+    for label, file_field, manifest_field in DERIVATIVE_FIELDS:
+        model = apps.get_model(label)
+        updated += model.objects.filter(**{file_field: name}).update(**{manifest_field: manifest})
+    return updated
+
+
+def _replace(storage, name, content: bytes):
+    # storage.save agrega un sufijo si el archivo existe; los nombres deben ser fijos
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def _flatten(image):
+    """Convierte a RGB poniendo fondo blanco si hay transparencia (JPEG no la soporta)"""
+    from PIL import Image
+
+    if image.mode == 'RGB':
+        return image
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_derivatives(name: str, storage=None, force: bool = False) -> list:
+    """
+    Genera los derivados de `name` (nombre relativo al storage).
+
+    Devuelve la lista de archivos escritos ([] si ya existían, si no es una
+    imagen o si Pillow no la pudo abrir).
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    storage = storage or default_storage
+    if not is_image_name(name) or is_derivative_name(name):
+        return []
+    if not force and has_derivatives(name, storage):
+        return []
+
+    widths = derivative_widths()
+    quality = _quality()
+    written = []
+
+    try:
+        with storage.open(name, 'rb') as fh:
+            with Image.open(fh) as source:
+                # Decodificar JPEG directamente a menor escala (mucho más rápido en fotos de 4–8 MB)
+                source.draft('RGB', (widths[-1], widths[-1]))
+                image = ImageOps.exif_transpose(source)
+                image.load()
+    except FileNotFoundError:
+        logger.warning('Derivatives: %s does not exist', name)
+        return []
+    except (UnidentifiedImageError, OSError) as exc:
+        logger.warning('Derivatives: cannot open %s (%s)', name, exc)
+        return []
+
+    if force:
+        # Los anchos pueden cambiar (otra configuración u otro original): no dejar restos
+        delete_derivatives(name, storage)
+
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    icc_profile = image.info.get('icc_profile')
+
+    # Sin ampliar: 320/800/1600 sobre una foto de 1000px → 320/800/1000
+    targets = sorted({min(width, image.width) for width in widths})
+
+    # De mayor a menor: cada tamaño se reduce desde el anterior
+    current = image
+    for width in reversed(targets):
+        if width != current.width:
+            height = max(round(current.height * width / current.width), 1)
+            current = current.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+
+        # Sin exif=...: Pillow no copia metadatos EXIF al guardar
+        webp = io.BytesIO()
+        current.save(webp, 'WEBP', quality=quality, method=4, icc_profile=icc_profile)
+        jpeg = io.BytesIO()
+        _flatten(current).save(jpeg, 'JPEG', quality=quality, optimize=True, progressive=True, icc_profile=icc_profile)
+
+        for fmt, buffer in (('webp', webp), ('jpg', jpeg)):
+            target_name = derivative_name(name, width, fmt)
+            _replace(storage, target_name, buffer.getvalue())
+            written.append(target_name)
+
+    manifest = {
+        'source': name,
+        'width': image.width,
+        'height': image.height,
+        'widths': targets,
+        'formats': list(DERIVATIVE_FORMATS),
+    }
+    _replace(storage, manifest_name(name), json.dumps(manifest).encode())
+    written.append(manifest_name(name))
+    record_manifest(name, manifest)
+    derivatives_generated.send(sender=None, name=name, storage=storage, manifest=manifest)
+    return written
+
+
+def delete_derivatives(name: str, storage=None) -> int:
+    """Borra los derivados de `name` (manifest primero para que no se sirvan a medias)"""
+    storage = storage or default_storage
+    if not name or is_derivative_name(name):
+        return 0
+    folder = derivatives_dir(name)
+    try:
+        _, files = storage.listdir(folder)
+    except FileNotFoundError:
+        return 0
+    files = sorted(files, key=lambda filename: filename != MANIFEST_NAME)
+    record_manifest(name, None)
+    for filename in files:
+        storage.delete(posixpath.join(folder, filename))
+    return len(files)
@@ -0,0 +1,93 @@
+"""
+Deduplica en su lugar los archivos existentes de MEDIA_ROOT.
+
+Cada archivo se reemplaza por un hardlink a su blob en .blobs/ (ver
+apps/media/storage.py). Los nombres lógicos, la BD y las URLs no cambian.
+
+USO:
+    python manage.py dedupe_media --dry-run   # solo reportar
+    python manage.py dedupe_media
+"""
+import os
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.media.storage import BLOBS_DIR, ContentAddressedStorage, file_digest
+
+
+def iter_media_files(root):
+    """Recorre MEDIA_ROOT (sin .blobs) devolviendo rutas de archivos regulares"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not (directory == root and entry.name == BLOBS_DIR):
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+class Command(BaseCommand):
+    help = 'Reemplaza archivos duplicados de media por hardlinks a blobs SHA-256'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo mostrar cuánto espacio se liberaría'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = ContentAddressedStorage(location=settings.MEDIA_ROOT)
+        root = os.path.abspath(storage.location)
+
+        if not os.path.isdir(root):
+            self.stdout.write(self.style.WARNING(f'ℹ️  {root} no existe'))
+            return
+
+        scanned = linked = new_blobs = freed = 0
+        planned = set()  # blobs que se crearían (dry-run)
+
+        for path in iter_media_files(root):
+            scanned += 1
+            stat = os.stat(path)
+            digest = file_digest(path)
+            blob_path = storage.blob_path(digest)
+
+            if os.path.exists(blob_path):
+                if os.path.samefile(blob_path, path):
+                    continue
+                # Ya existe ese contenido: este archivo pasa a ser otra referencia
+                linked += 1
+                if stat.st_nlink == 1:
+                    freed += stat.st_size
+                if not dry_run:
+                    tmp_path = f'{path}.{uuid.uuid4().hex}.dedupe'
+                    os.link(blob_path, tmp_path)
+                    os.replace(tmp_path, path)
+                    self.stdout.write(f'🔗 {os.path.relpath(path, root)}')
+            elif dry_run:
+                if digest in planned:
+                    linked += 1
+                    freed += stat.st_size
+                else:
+                    planned.add(digest)
+                    new_blobs += 1
+            else:
+                # Primer archivo con este contenido: se convierte en el blob
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.link(path, blob_path)
+                new_blobs += 1
+
+        prefix = '[DRY-RUN] ' if dry_run else ''
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ {prefix}Archivos: {scanned} | Blobs nuevos: {new_blobs} | '
+                f'Duplicados enlazados: {linked} | Espacio liberado: {freed / 1024 / 1024:.1f} MB'
+            )
+        )
@@ -0,0 +1,109 @@
+"""
+Genera (backfill) los derivados de imagen de la media existente.
+
+USO:
+    python manage.py generate_image_derivatives
+    python manage.py generate_image_derivatives --workers 4
+    python manage.py generate_image_derivatives --force   # regenerar todo
+
+El trabajo de Pillow es CPU-bound, por eso se reparte en procesos
+(ProcessPoolExecutor) y no en threads.
+
+Las imágenes que ya tenían derivados solo copian su manifest a la fila del
+modelo (los serializers lo leen de ahí).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.properties.models import Property, PropertyMedia
+from apps.vehicles.models import Vehicle, VehicleImages
+
+from apps.media.derivatives import generate_derivatives, is_image_name, read_manifest, record_manifest
+
+
+def _init_worker():
+    # Con spawn/forkserver el proceso hijo arranca sin Django configurado
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _process(task):
+    name, force = task
+    try:
+        written = generate_derivatives(name, force=force)
+        if not written:
+            manifest = read_manifest(name)
+            if manifest:
+                record_manifest(name, manifest)
+        return name, len(written), None
+    except Exception as exc:  # un archivo corrupto no debe detener el backfill
+        return name, 0, str(exc)
+
+
+def iter_image_names():
+    """Nombres únicos de todas las imágenes referenciadas en la base de datos"""
+    sources = [
+        PropertyMedia.objects.filter(media_type='image').values_list('url', flat=True),
+        Property.objects.exclude(image_url='').exclude(image_url__isnull=True).values_list('image_url', flat=True),
+        Vehicle.objects.exclude(photo='').exclude(photo__isnull=True).values_list('photo', flat=True),
+        VehicleImages.objects.exclude(image='').values_list('image', flat=True),
+    ]
+    seen = set()
+    for queryset in sources:
+        for name in queryset.iterator():
+            if name and name not in seen and is_image_name(name):
+                seen.add(name)
+                yield name
+
+
+class Command(BaseCommand):
+    help = 'Genera miniaturas y tamaños responsive (WebP + JPEG) para las imágenes existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Número de procesos (default: número de CPUs)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerar aunque ya existan derivados'
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+        force = options['force']
+
+        names = list(iter_image_names())
+        self.stdout.write(self.style.SUCCESS(f'🖼️  {len(names)} imagen(es) encontradas, {workers} proceso(s)'))
+        if not names:
+            return
+
+        # No heredar conexiones abiertas en los procesos hijos
+        connections.close_all()
+
+        generated = skipped = failed = 0
+        tasks = [(name, force) for name in names]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            for name, written, error in executor.map(_process, tasks, chunksize=8):
+                if error:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'✗ {name}: {error}'))
+                elif written:
+                    generated += 1
+                    self.stdout.write(self.style.SUCCESS(f'✓ {name} ({written} archivos)'))
+                else:
+                    skipped += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Generados: {generated} | Omitidos: {skipped} | Errores: {failed}'
+            )
+        )
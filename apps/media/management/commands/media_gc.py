@@ -0,0 +1,146 @@
+"""
+Recolector de archivos huérfanos de MEDIA_ROOT.
+
+Un archivo es huérfano si ningún FileField/ImageField de ningún modelo lo
+referencia (p. ej. vouchers de RentalPayment borrados en cascada con su Rental).
+Los derivados de imagen cuentan como referenciados si su original lo está, y
+los blobs del storage deduplicado son huérfanos cuando ya ningún nombre lógico
+apunta a ellos.
+
+USO:
+    python manage.py media_gc                       # solo reporte
+    python manage.py media_gc --quarantine          # mover a MEDIA_ROOT/.quarantine/<fecha>/
+    python manage.py media_gc --grace-hours 72      # ignorar archivos más nuevos (default: 24)
+
+El escaneo usa os.scandir como generador y las referencias se leen con
+values_list().iterator(), así funciona con cientos de miles de archivos.
+"""
+import os
+import posixpath
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.utils import timezone
+
+from apps.media.derivatives import derivative_source
+from apps.media.storage import BLOBS_DIR
+
+QUARANTINE_DIR = '.quarantine'
+
+
+def iter_file_fields():
+    """(modelo, nombre de campo) de todos los FileField/ImageField del proyecto"""
+    for model in apps.get_models():
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field.name
+
+
+def iter_referenced_names():
+    """Nombres de archivo guardados en la BD, leídos por bloques"""
+    for model, field_name in iter_file_fields():
+        queryset = (
+            model._base_manager
+            .exclude(**{f'{field_name}__isnull': True})
+            .exclude(**{field_name: ''})
+            .values_list(field_name, flat=True)
+        )
+        for name in queryset.iterator(chunk_size=5000):
+            yield posixpath.normpath(str(name)).lstrip('/')
+
+
+def scan_media(root, relative=''):
+    """Genera (nombre relativo, stat) de cada archivo, sin cargar el árbol completo"""
+    with os.scandir(os.path.join(root, relative) if relative else root) as entries:
+        for entry in entries:
+            name = f'{relative}/{entry.name}' if relative else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                # .blobs y .quarantine se tratan aparte
+                if not (not relative and entry.name.startswith('.')):
+                    yield from scan_media(root, name)
+            elif entry.is_file(follow_symlinks=False):
+                yield name, entry.stat(follow_symlinks=False)
+
+
+def scan_orphan_blobs(root):
+    """Blobs sin ningún nombre lógico (link count 1) y temporales abandonados"""
+    blobs_root = os.path.join(root, BLOBS_DIR)
+    if not os.path.isdir(blobs_root):
+        return
+    for name, stat in scan_media(blobs_root):
+        if name.startswith('tmp/') or stat.st_nlink <= 1:
+            yield f'{BLOBS_DIR}/{name}', stat
+
+
+class Command(BaseCommand):
+    help = 'Reporta o pone en cuarentena archivos de media que ningún registro referencia'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--quarantine',
+            action='store_true',
+            help=f'Mover los huérfanos a MEDIA_ROOT/{QUARANTINE_DIR}/<fecha>/ (por defecto solo reporta)'
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='No tocar archivos modificados hace menos de N horas (default: 24)'
+        )
+
+    def handle(self, *args, **options):
+        root = os.path.abspath(settings.MEDIA_ROOT)
+        quarantine = options['quarantine']
+        cutoff = time.time() - options['grace_hours'] * 3600
+        verbosity = options['verbosity']
+
+        if not os.path.isdir(root):
+            self.stdout.write(self.style.WARNING(f'ℹ️  {root} no existe'))
+            return
+
+        referenced = set(iter_referenced_names())
+        self.stdout.write(self.style.SUCCESS(f'📚 {len(referenced)} archivo(s) referenciados en la BD'))
+
+        quarantine_root = os.path.join(
+            root, QUARANTINE_DIR, timezone.now().strftime('%Y%m%d-%H%M%S')
+        )
+
+        def orphans():
+            for name, stat in scan_media(root):
+                if name in referenced:
+                    continue
+                source = derivative_source(name)
+                if source and source in referenced:
+                    continue
+                yield name, stat
+            yield from scan_orphan_blobs(root)
+
+        scanned_recent = orphan_count = orphan_bytes = 0
+        for name, stat in orphans():
+            if stat.st_mtime > cutoff:
+                # Subida en curso (los archivos se escriben antes que la fila) o muy reciente
+                scanned_recent += 1
+                continue
+            orphan_count += 1
+            orphan_bytes += stat.st_size
+            if verbosity >= 2 or (not quarantine and orphan_count <= 50):
+                self.stdout.write(f'🗑️  {name} ({stat.st_size} bytes)')
+            if quarantine:
+                target = os.path.join(quarantine_root, *name.split('/'))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(os.path.join(root, *name.split('/')), target)
+
+        action = 'movidos a cuarentena' if quarantine else 'encontrados (solo reporte)'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Huérfanos {action}: {orphan_count} | '
+                f'{orphan_bytes / 1024 / 1024:.1f} MB | Dentro del período de gracia: {scanned_recent}'
+            )
+        )
+        if quarantine and orphan_count:
+            self.stdout.write(self.style.WARNING(f'📦 Cuarentena: {quarantine_root}'))
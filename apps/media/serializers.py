@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from hr_properties.media_signing import signed_media_url
+
+from .derivatives import derivative_name, is_image_name
+
+
+def derivatives_srcset(field_file, manifest, request=None):
+    """
+    Mapa estilo srcset de los derivados de un archivo:
+
+        {"webp": {"320w": url, "800w": url, ...}, "jpg": {...}}
+
+    `manifest` es el guardado en la fila (ver derivatives.record_manifest).
+    None si el archivo no es imagen, aún no tiene derivados o el manifest es
+    de un archivo anterior.
+    """
+    if not field_file or not manifest or not is_image_name(field_file.name):
+        return None
+    name = field_file.name
+    if manifest.get('source') != name:
+        return None
+    return {
+        fmt: {
+            f'{width}w': signed_media_url(derivative_name(name, width, fmt), request)
+            for width in manifest['widths']
+        }
+        for fmt in manifest['formats']
+    }
+
+
+class ImageDerivativesField(serializers.ReadOnlyField):
+    """
+    Campo de solo lectura con los derivados de un FileField/ImageField, a
+    partir del manifest guardado en la misma fila (sin leer el storage).
+
+    Uso: srcset = ImageDerivativesField(source='url', manifest='derivatives')
+    """
+
+    def __init__(self, manifest, **kwargs):
+        self.manifest = manifest
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return super().get_attribute(instance), getattr(instance, self.manifest)
+
+    def to_representation(self, value):
+        field_file, manifest = value
+        return derivatives_srcset(field_file, manifest, self.context.get('request'))
@@ -0,0 +1,48 @@
+"""
+Señales para la app de media
+
+Genera los derivados de imagen cuando se guarda una foto en:
+- PropertyMedia.url (solo media_type='image')
+- Property.image_url
+- Vehicle.photo
+- VehicleImages.image
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.properties.models import Property, PropertyMedia
+from apps.vehicles.models import Vehicle, VehicleImages
+
+from .derivatives import generate_derivatives, is_image_name
+from .tasks import enqueue_on_commit
+
+
+def schedule_derivatives(field_file, update_fields=None):
+    """Encola los derivados después del commit (si la transacción falla no se procesa nada)"""
+    if update_fields is not None and field_file.field.name not in update_fields:
+        return
+    if not field_file or not is_image_name(field_file.name):
+        return
+    name, storage = field_file.name, field_file.storage
+    enqueue_on_commit(generate_derivatives, name, storage)
+
+
+@receiver(post_save, sender=PropertyMedia)
+def property_media_derivatives(sender, instance, **kwargs):
+    if instance.media_type == 'image':
+        schedule_derivatives(instance.url, kwargs.get('update_fields'))
+
+
+@receiver(post_save, sender=Property)
+def property_image_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance.image_url, kwargs.get('update_fields'))
+
+
+@receiver(post_save, sender=Vehicle)
+def vehicle_photo_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance.photo, kwargs.get('update_fields'))
+
+
+@receiver(post_save, sender=VehicleImages)
+def vehicle_image_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance.image, kwargs.get('update_fields'))
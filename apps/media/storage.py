@@ -0,0 +1,144 @@
+"""
+Storage direccionado por contenido (deduplicación de media)
+
+Cada archivo se guarda una sola vez como blob nombrado por su SHA-256:
+
+    media/.blobs/3f/3f1a9c...e2        ← contenido real
+    media/property_3/media/foto.jpg    ← hardlink al blob (nombre lógico)
+    media/property_5/payments/v.jpg    ← otro hardlink al mismo blob
+
+- Los nombres lógicos siguen saliendo de los upload_to de siempre, así que
+  la BD, las URLs y protected_media no cambian
+- El contador de referencias es el link count del inode (st_nlink - 1):
+  al borrar la última referencia se borra también el blob
+- Re-subir la misma foto o voucher no ocupa disco extra; los backups con
+  hardlinks (rsync -H, tar) tampoco duplican
+
+Activar con MEDIA_STORAGE_BACKEND=apps.media.storage.ContentAddressedStorage
+y ejecutar `python manage.py dedupe_media` para deduplicar lo existente.
+"""
+import hashlib
+import os
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+
+BLOBS_DIR = '.blobs'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def is_blob_name(name) -> bool:
+    """True si el nombre apunta al área interna de blobs (nunca se sirve)"""
+    return str(name).replace('\\', '/').lstrip('/').split('/', 1)[0] == BLOBS_DIR
+
+
+def file_digest(path) -> str:
+    """SHA-256 de un archivo del disco"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage que deduplica por SHA-256 usando hardlinks"""
+
+    @property
+    def blobs_root(self):
+        return os.path.join(self.location, BLOBS_DIR)
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs_root, digest[:2], digest)
+
+    def refcount(self, name) -> int:
+        """Cuántos nombres lógicos comparten el contenido de `name`"""
+        return max(os.stat(self.path(name)).st_nlink - 1, 0)
+
+    def _makedirs(self, directory):
+        os.makedirs(directory, exist_ok=True)
+
+    def _spool(self, content):
+        """Escribe el contenido a un temporal dentro de .blobs calculando su hash"""
+        tmp_dir = os.path.join(self.blobs_root, 'tmp')
+        self._makedirs(tmp_dir)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        with open(tmp_path, 'wb') as fh:
+            for chunk in content.chunks():
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                digest.update(chunk)
+                fh.write(chunk)
+        if self.file_permissions_mode is not None:
+            os.chmod(tmp_path, self.file_permissions_mode)
+        return digest.hexdigest(), tmp_path
+
+    def _link_logical(self, source_path, name):
+        """Crea el nombre lógico como hardlink, buscando otro nombre si ya existe"""
+        full_path = self.path(name)
+        self._makedirs(os.path.dirname(full_path))
+        while True:
+            try:
+                os.link(source_path, full_path)
+            except FileExistsError:
+                name = self.get_available_name(name)
+                full_path = self.path(name)
+            else:
+                break
+        self._ensure_location_group_id(full_path)
+        return str(os.path.relpath(full_path, self.location)).replace('\\', '/')
+
+    def _save(self, name, content):
+        digest, tmp_path = self._spool(content)
+        blob_path = self.blob_path(digest)
+        self._makedirs(os.path.dirname(blob_path))
+        try:
+            while True:
+                # os.link no reemplaza: si dos requests suben lo mismo, gana el primero
+                try:
+                    os.link(tmp_path, blob_path)
+                except FileExistsError:
+                    pass
+                try:
+                    return self._link_logical(blob_path, name)
+                except FileNotFoundError:
+                    # El blob se borró entre medio (delete de la última referencia): recrearlo
+                    continue
+        finally:
+            os.unlink(tmp_path)
+
+    def link(self, source_name, name):
+        """Nuevo nombre lógico para el contenido de `source_name` (sin copiar bytes)"""
+        name = self.get_available_name(name)
+        return self._link_logical(self.path(source_name), name)
+
+    def delete(self, name):
+        if not name:
+            raise ValueError('The name must be given to delete().')
+        full_path = self.path(name)
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
+            return
+        if os.path.isdir(full_path) or is_blob_name(name):
+            return super().delete(name)
+
+        blob_path = None
+        if stat.st_nlink == 2:
+            # Última referencia lógica: la otra es el blob (si este archivo está deduplicado)
+            candidate = self.blob_path(file_digest(full_path))
+            try:
+                if os.path.samefile(candidate, full_path):
+                    blob_path = candidate
+            except FileNotFoundError:
+                pass
+
+        os.unlink(full_path)
+        if blob_path:
+            try:
+                os.unlink(blob_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,63 @@
+"""
+Cola en segundo plano para post-procesar media
+
+El request devuelve apenas los archivos están guardados; el trabajo pesado
+(derivados de imagen, etc.) corre en un pool de threads del propio proceso.
+
+- enqueue(func, *args): ejecuta func en segundo plano
+- enqueue_on_commit(func, *args): igual, pero solo si la transacción actual hace commit
+
+MEDIA_BACKGROUND_WORKERS = 0 ejecuta las tareas en línea (útil en tests y comandos).
+Si el proceso se reinicia con tareas pendientes, `generate_image_derivatives`
+completa lo que falte.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _workers() -> int:
+    return int(getattr(settings, 'MEDIA_BACKGROUND_WORKERS', 1))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_workers(),
+                    thread_name_prefix='media-tasks',
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Media task %s failed', getattr(func, '__name__', func))
+    finally:
+        # Las tareas pueden tocar la BD desde un thread que no es del request
+        close_old_connections()
+
+
+def enqueue(func, *args, **kwargs):
+    """Ejecuta func(*args, **kwargs) en segundo plano"""
+    if _workers() <= 0:
+        _run(func, args, kwargs)
+        return None
+    return _get_executor().submit(_run, func, args, kwargs)
+
+
+def enqueue_on_commit(func, *args, **kwargs):
+    """Encola la tarea cuando la transacción actual haga commit (si hace rollback se descarta)"""
+    transaction.on_commit(lambda: enqueue(func, *args, **kwargs))
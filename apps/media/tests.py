@@ -0,0 +1,374 @@
+import hashlib
+import io
+import os
+import tempfile
+import time
+import zipfile
+from unittest import mock
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.properties.models import Property, PropertyLaw, PropertyMedia
+from apps.properties.serializers import PropertyMediaSerializer
+from apps.properties.tests import seed_properties
+from apps.users.models import Role, User, UserRole
+from apps.users.tokens import CachedRefreshToken
+from hr_properties.media_signing import sign_media_path, signed_media_url, verify_media_signature
+
+from .derivatives import delete_derivatives, derivative_name, manifest_name
+from .storage import ContentAddressedStorage, file_digest
+
+
+def write_media(media_root, name, content=b'contenido'):
+    path = os.path.join(media_root, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as fh:
+        fh.write(content)
+    return path
+
+
+def jpeg_upload(name='foto.jpg', size=(2000, 1000)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 80, 40)).save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def create_admin():
+    admin = User.objects.create(username='admin', email='admin@example.com')
+    UserRole.objects.create(user=admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+    return admin
+
+
+def admin_client():
+    client = APIClient()
+    client.force_authenticate(create_admin())
+    return client
+
+
+def media_files(media_root):
+    """Archivos bajo MEDIA_ROOT (relativos), sin derivados"""
+    found = []
+    for folder, _, files in os.walk(media_root):
+        found += [os.path.relpath(os.path.join(folder, name), media_root) for name in files]
+    return sorted(name for name in found if '/derivatives/' not in name and not name.startswith('.'))
+
+
+class MediaRootMixin:
+    """MEDIA_ROOT temporal y tareas de media en línea"""
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.media_root = tmp.name
+        override = override_settings(MEDIA_ROOT=self.media_root, ALLOWED_HOSTS=['*'], MEDIA_BACKGROUND_WORKERS=0)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class MediaSigningTests(MediaRootMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        write_media(self.media_root, 'property_3/laws/contrato.pdf')
+        write_media(self.media_root, 'property_3/images/foto.jpg')
+
+    def test_signed_url_is_served_and_unsigned_is_rejected(self):
+        response = self.client.get(signed_media_url('property_3/laws/contrato.pdf'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'contenido')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.client.get('/media/property_3/laws/contrato.pdf').status_code, 403)
+
+    def test_tampered_or_expired_signature_is_rejected(self):
+        params = sign_media_path('property_3/laws/contrato.pdf')
+        # Firma de un archivo no sirve para otro
+        self.assertEqual(self.client.get(f'/media/property_3/laws/otro.pdf?{urlencode(params)}').status_code, 403)
+        tampered = {**params, 'sig': params['sig'][:-1] + ('0' if params['sig'][-1] != '0' else '1')}
+        self.assertEqual(self.client.get(f'/media/property_3/laws/contrato.pdf?{urlencode(tampered)}').status_code, 403)
+
+        expired = sign_media_path('property_3/laws/contrato.pdf', expires=int(time.time()) - 1)
+        self.assertFalse(verify_media_signature('property_3/laws/contrato.pdf', expired['exp'], expired['sig']))
+        self.assertEqual(self.client.get(f'/media/property_3/laws/contrato.pdf?{urlencode(expired)}').status_code, 403)
+
+    @override_settings(MEDIA_URL_TTL=60)
+    def test_same_url_within_a_ttl_block(self):
+        self.assertEqual(signed_media_url('property_3/laws/contrato.pdf'), signed_media_url('property_3/laws/contrato.pdf'))
+        expires = sign_media_path('property_3/laws/contrato.pdf')['exp']
+        self.assertTrue(60 <= expires - time.time() <= 120)
+
+    def test_public_folders_and_traversal(self):
+        response = self.client.get('/media/property_3/images/foto.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertEqual(self.client.get('/media/property_3/images/../../../etc/passwd').status_code, 404)
+        self.assertEqual(self.client.get('/media/.blobs/ab/abc').status_code, 404)
+
+
+@override_settings(IMAGE_DERIVATIVE_WIDTHS=(320, 800, 1600))
+class ImageDerivativesTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.property = seed_properties(2)[1]
+
+    def upload(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            media = PropertyMedia.objects.create(property=self.property, media_type='image', url=jpeg_upload(**kwargs))
+        media.refresh_from_db()
+        return media
+
+    def test_derivatives_are_generated_without_upscaling(self):
+        media = self.upload(size=(1000, 500))
+        name = media.url.name
+        for width in (320, 800, 1000):
+            for fmt in ('webp', 'jpg'):
+                with Image.open(os.path.join(self.media_root, derivative_name(name, width, fmt))) as image:
+                    self.assertEqual(image.width, width)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, derivative_name(name, 1600, 'jpg'))))
+        self.assertEqual(media.derivatives['widths'], [320, 800, 1000])
+        self.assertEqual(media.derivatives['source'], name)
+
+    def test_srcset_is_built_from_the_row_without_reading_storage(self):
+        media = self.upload()
+        with mock.patch('django.core.files.storage.FileSystemStorage.open', side_effect=AssertionError('I/O')), \
+                mock.patch('django.core.files.storage.FileSystemStorage.exists', side_effect=AssertionError('I/O')):
+            srcset = PropertyMediaSerializer(media).data['srcset']
+        self.assertEqual(list(srcset), ['webp', 'jpg'])
+        self.assertEqual(list(srcset['webp']), ['320w', '800w', '1600w'])
+        self.assertIn(f'{derivative_name(media.url.name, 800, "webp")}?exp=', srcset['webp']['800w'])
+
+    def test_stale_or_deleted_manifest_yields_no_srcset(self):
+        media = self.upload()
+        media.url.name = 'property_1/media/otra.jpg'
+        self.assertIsNone(PropertyMediaSerializer(media).data['srcset'])
+
+        media.refresh_from_db()
+        delete_derivatives(media.url.name, media.url.storage)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, manifest_name(media.url.name))))
+        media.refresh_from_db()
+        self.assertIsNone(media.derivatives)
+        self.assertIsNone(PropertyMediaSerializer(media).data['srcset'])
+
+
+class PropertyUploadMediaTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.property = seed_properties(2)[1]
+        self.client = admin_client()
+        self.url = f'/api/properties/{self.property.pk}/upload_media/'
+
+    def post_files(self, count=3):
+        files = [jpeg_upload(f'foto {i}.jpg', size=(40, 20)) for i in range(count)]
+        return self.client.post(self.url, {'files': files, 'media_type': 'image'}, format='multipart')
+
+    def test_files_are_saved_and_inserted_in_one_query(self):
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            response = self.post_files()
+        self.assertEqual(response.status_code, 201)
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "property_media"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(response.data['media']), 3)
+        prefix = f'property_{self.property.pk}/media/'
+        self.assertEqual(media_files(self.media_root), [f'{prefix}foto_{i}.jpg' for i in range(3)])
+        self.assertEqual(PropertyMedia.objects.filter(property=self.property).count(), 3)
+        # Los derivados quedan registrados en cada fila
+        self.assertTrue(all(media.derivatives for media in PropertyMedia.objects.filter(property=self.property)))
+
+    def test_failed_write_removes_the_files_already_saved(self):
+        storage = PropertyMedia._meta.get_field('url').storage
+        original_save = storage.save
+
+        def flaky_save(name, content, *args, **kwargs):
+            if name.endswith('foto_1.jpg'):
+                raise OSError('disco lleno')
+            return original_save(name, content, *args, **kwargs)
+
+        with mock.patch.object(storage, 'save', side_effect=flaky_save), self.assertRaises(OSError):
+            self.post_files()
+        self.assertEqual(media_files(self.media_root), [])
+        self.assertFalse(PropertyMedia.objects.exists())
+
+    def test_failed_insert_removes_the_files(self):
+        with mock.patch.object(PropertyMedia.objects, 'bulk_create', side_effect=IntegrityError), \
+                self.assertRaises(IntegrityError):
+            self.post_files()
+        self.assertEqual(media_files(self.media_root), [])
+        self.assertFalse(PropertyMedia.objects.exists())
+
+
+class ContentAddressedStorageTests(MediaRootMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = ContentAddressedStorage(location=self.media_root)
+
+    def test_same_content_is_stored_once(self):
+        first = self.storage.save('property_1/payments/voucher.jpg', ContentFile(b'voucher'))
+        second = self.storage.save('property_2/payments/voucher.jpg', ContentFile(b'voucher'))
+        other = self.storage.save('property_2/payments/otro.jpg', ContentFile(b'otro'))
+
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.blob_path(file_digest(self.storage.path(first)))))
+        self.assertEqual(self.storage.refcount(first), 2)
+        self.assertEqual(self.storage.refcount(other), 1)
+        with self.storage.open(second) as fh:
+            self.assertEqual(fh.read(), b'voucher')
+
+    def test_blob_is_removed_with_the_last_reference(self):
+        first = self.storage.save('property_1/payments/voucher.jpg', ContentFile(b'voucher'))
+        second = self.storage.save('property_2/payments/voucher.jpg', ContentFile(b'voucher'))
+        blob = self.storage.blob_path(file_digest(self.storage.path(first)))
+
+        self.storage.delete(first)
+        self.assertFalse(self.storage.exists(first))
+        self.assertTrue(os.path.exists(blob))
+        self.assertEqual(self.storage.refcount(second), 1)
+
+        self.storage.delete(second)
+        self.assertFalse(os.path.exists(blob))
+        # Volver a subir el mismo contenido recrea el blob
+        again = self.storage.save('property_3/payments/voucher.jpg', ContentFile(b'voucher'))
+        self.assertEqual(self.storage.refcount(again), 1)
+
+    def test_dedupe_media_links_existing_duplicates(self):
+        write_media(self.media_root, 'property_1/laws/a.pdf', b'mismo')
+        write_media(self.media_root, 'property_2/laws/b.pdf', b'mismo')
+        call_command('dedupe_media', stdout=io.StringIO())
+        a = os.path.join(self.media_root, 'property_1/laws/a.pdf')
+        self.assertTrue(os.path.samefile(a, os.path.join(self.media_root, 'property_2/laws/b.pdf')))
+        self.assertEqual(os.stat(a).st_nlink, 3)
+        self.assertEqual(media_files(self.media_root), ['property_1/laws/a.pdf', 'property_2/laws/b.pdf'])
+
+
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'apps.media.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class SetMainImageTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.property = seed_properties(2)[1]
+        self.client = admin_client()
+        self.url = f'/api/properties/{self.property.pk}/set_main_image/'
+        storage = PropertyMedia._meta.get_field('url').storage
+        self.media = [
+            PropertyMedia.objects.create(
+                property=self.property, media_type='image',
+                url=storage.save(f'property_{self.property.pk}/media/foto_{i}.jpg', jpeg_upload(size=(40 + i, 20))),
+            )
+            for i in range(2)
+        ]
+        self.storage = storage
+
+    def set_main_image(self, media):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'media_id': media.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.property.refresh_from_db()
+        return self.property.image_url.name
+
+    def test_replaced_link_is_deleted(self):
+        first = self.set_main_image(self.media[0])
+        self.assertEqual(self.storage.refcount(self.media[0].url.name), 2)
+
+        second = self.set_main_image(self.media[1])
+        self.assertNotEqual(first, second)
+        self.assertFalse(self.storage.exists(first))
+        self.assertEqual(self.storage.refcount(self.media[0].url.name), 1)
+        self.assertEqual(self.storage.refcount(second), 2)
+
+        # Repetir la misma multimedia tampoco acumula links
+        self.set_main_image(self.media[1])
+        self.assertEqual(self.storage.refcount(self.media[1].url.name), 2)
+
+    def test_image_shared_with_media_is_kept(self):
+        Property.objects.filter(pk=self.property.pk).update(image_url=self.media[0].url.name)
+        self.property.refresh_from_db()
+        self.set_main_image(self.media[1])
+        self.assertTrue(self.storage.exists(self.media[0].url.name))
+
+
+class MediaGCTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        property_instance = seed_properties(2)[1]
+        self.kept = f'property_{property_instance.pk}/media/fachada.jpg'
+        PropertyMedia.objects.create(property=property_instance, media_type='image', url=self.kept)
+        old = time.time() - 48 * 3600
+        for name in (self.kept, derivative_name(self.kept, 320, 'webp'), 'property_9/payments/borrado.jpg'):
+            os.utime(write_media(self.media_root, name), (old, old))
+        write_media(self.media_root, 'property_9/payments/subiendo.jpg')
+
+    def test_report_only_lists_old_orphans(self):
+        out = io.StringIO()
+        call_command('media_gc', stdout=out)
+        self.assertIn('property_9/payments/borrado.jpg', out.getvalue())
+        self.assertNotIn('subiendo.jpg', out.getvalue())
+        self.assertNotIn('fachada.jpg', out.getvalue())
+        self.assertIn('property_9/payments/borrado.jpg', media_files(self.media_root))
+
+    def test_quarantine_moves_orphans_and_keeps_references(self):
+        call_command('media_gc', quarantine=True, stdout=io.StringIO())
+        self.assertEqual(media_files(self.media_root), [self.kept, 'property_9/payments/subiendo.jpg'])
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, derivative_name(self.kept, 320, 'webp'))))
+        quarantined = media_files(os.path.join(self.media_root, '.quarantine'))
+        self.assertEqual(len(quarantined), 1)
+        self.assertTrue(quarantined[0].endswith('/property_9/payments/borrado.jpg'))
+
+
+class PropertyDocumentsZipTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.property = seed_properties(2)[1]
+        self.admin = create_admin()
+        self.url = f'/api/properties/{self.property.pk}/documents.zip'
+        folder = f'property_{self.property.pk}/laws'
+        self.contents = {f'{folder}/contrato.pdf': b'%PDF contrato', f'{folder}/predial.txt': b'predial ' * 1000}
+        for name, content in self.contents.items():
+            write_media(self.media_root, name, content)
+            PropertyLaw.objects.create(property=self.property, entity_name='Notaría', url=name)
+        PropertyLaw.objects.create(property=self.property, entity_name='Notaría', url=f'{folder}/perdido.pdf')
+
+    def assertZip(self, body):
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertIsNone(archive.testzip())
+            names = archive.namelist()
+            self.assertEqual(names, [*self.contents, 'MANIFEST.sha256', 'MISSING.txt'])
+            for name, content in self.contents.items():
+                self.assertEqual(archive.read(name), content)
+            manifest = archive.read('MANIFEST.sha256').decode()
+            self.assertIn(f'{hashlib.sha256(self.contents[names[0]]).hexdigest()}  {names[0]}', manifest)
+            self.assertTrue(archive.read('MISSING.txt').decode().endswith('/laws/perdido.pdf\n'))
+            self.assertEqual(archive.getinfo(names[0]).compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(archive.getinfo(names[1]).compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_zip_contents_under_wsgi(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertZip(b''.join(response.streaming_content))
+
+    async def test_zip_is_an_async_stream_under_asgi(self):
+        token = await sync_to_async(lambda: str(CachedRefreshToken.for_user(self.admin).access_token))()
+        response = await AsyncClient().get(self.url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        # Iterador async: Django no consume el ZIP completo antes de enviarlo
+        self.assertTrue(response.is_async)
+        self.assertZip(b''.join([chunk async for chunk in response.streaming_content]))
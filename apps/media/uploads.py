@@ -0,0 +1,49 @@
+"""
+Guardado concurrente de archivos subidos
+
+Escribe varios archivos al storage en paralelo (pool acotado por
+MEDIA_UPLOAD_WORKERS). Si alguno falla se borran los que ya se guardaron,
+así un lote nunca queda a medias en disco.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+def _upload_workers() -> int:
+    return max(int(getattr(settings, 'MEDIA_UPLOAD_WORKERS', 4)), 1)
+
+
+def delete_files(storage, names):
+    """Borra los archivos indicados ignorando los que ya no existen"""
+    for name in names:
+        try:
+            storage.delete(name)
+        except FileNotFoundError:
+            pass
+
+
+def save_files(storage, items):
+    """
+    Guarda [(nombre, archivo), ...] en el storage y devuelve los nombres finales
+    (el storage puede agregar un sufijo si el nombre ya existe), en el mismo orden.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = min(_upload_workers(), len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='media-upload') as executor:
+        futures = [executor.submit(storage.save, name, content) for name, content in items]
+
+    saved, errors = [], []
+    for future in futures:
+        try:
+            saved.append(future.result())
+        except Exception as exc:
+            errors.append(exc)
+
+    if errors:
+        delete_files(storage, saved)
+        raise errors[0]
+    return saved
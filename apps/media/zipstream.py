@@ -0,0 +1,118 @@
+"""
+ZIP en streaming
+
+Genera un archivo ZIP por partes (generador de bytes) para enviarlo con
+StreamingHttpResponse: el ZIP nunca está completo en memoria ni en disco.
+
+- zipfile escribe sobre un buffer no "seekable" → usa data descriptors
+  (CRC y tamaños van después de cada archivo), así no necesita volver atrás
+- Cada archivo se lee por bloques de ZIP_CHUNK_SIZE; tras cada bloque se
+  entrega lo que haya en el buffer
+- Al final se agrega MANIFEST.sha256 (formato de `sha256sum -c`)
+- Bajo ASGI se usa astream_storage_zip: con un iterador sync Django lo
+  consumiría completo (sync_to_async(list)) antes de enviar el primer byte
+"""
+import hashlib
+import posixpath
+import zipfile
+
+from asgiref.sync import sync_to_async
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+ZIP_CHUNK_SIZE = 1024 * 1024
+MANIFEST_NAME = 'MANIFEST.sha256'
+MISSING_NAME = 'MISSING.txt'
+
+# Formatos ya comprimidos: comprimirlos otra vez solo gasta CPU
+STORED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.mp4', '.mov', '.avi',
+    '.zip', '.gz', '.rar', '.7z', '.pdf', '.docx', '.xlsx', '.pptx',
+}
+
+
+class _StreamBuffer:
+    """Destino de escritura sin seek: acumula bytes hasta que el generador los entrega"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _zip_info(arcname, modified, size):
+    date_time = timezone.localtime(modified).timetuple()[:6] if modified else timezone.localtime().timetuple()[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    info = zipfile.ZipInfo(arcname, date_time=date_time)
+    extension = posixpath.splitext(arcname)[1].lower()
+    info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    info.file_size = size or 0  # solo para decidir ZIP64; zipfile lo recalcula
+    return info
+
+
+def stream_storage_zip(names, storage=None, chunk_size=ZIP_CHUNK_SIZE):
+    """
+    Generador de bytes de un ZIP con los archivos `names` del storage.
+
+    La ruta dentro del ZIP es el mismo nombre del storage (estructura de
+    upload_to). Los archivos que ya no existen se listan en MISSING.txt.
+    """
+    storage = storage or default_storage
+    buffer = _StreamBuffer()
+    checksums = []
+    missing = []
+
+    with zipfile.ZipFile(buffer, mode='w', allowZip64=True) as archive:
+        for name in names:
+            try:
+                size = storage.size(name)
+                modified = storage.get_modified_time(name)
+                source = storage.open(name, 'rb')
+            except (FileNotFoundError, OSError):
+                missing.append(name)
+                continue
+
+            digest = hashlib.sha256()
+            info = _zip_info(name, modified, size)
+            with source, archive.open(info, mode='w', force_zip64=size > zipfile.ZIP64_LIMIT // 2) as target:
+                for chunk in source.chunks(chunk_size):
+                    digest.update(chunk)
+                    target.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            # Data descriptor del archivo (CRC y tamaños)
+            data = buffer.drain()
+            if data:
+                yield data
+            checksums.append(f'{digest.hexdigest()}  {name}\n')
+
+        archive.writestr(_zip_info(MANIFEST_NAME, None, 0), ''.join(checksums))
+        if missing:
+            archive.writestr(_zip_info(MISSING_NAME, None, 0), ''.join(f'{name}\n' for name in missing))
+    # Al cerrar se escribe el directorio central
+    yield buffer.drain()
+
+
+async def astream_storage_zip(names, storage=None, chunk_size=ZIP_CHUNK_SIZE):
+    """stream_storage_zip como iterador async: cada bloque se genera en el pool de hilos"""
+    chunks = stream_storage_zip(names, storage, chunk_size)
+    next_chunk = sync_to_async(next, thread_sensitive=False)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        chunks.close()
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class PropertiesConfig(AppConfig):
     name = 'apps.properties'
+
+    def ready(self):
+        import apps.properties.signals  # Registrar señales
@@ -0,0 +1,141 @@
+"""
+Catálogo público cacheado (listado y detalle de propiedades disponibles)
+
+GET /api/properties/?rental_status=available y GET /api/properties/{id}/ son
+los únicos endpoints anónimos. Para usuarios anónimos la respuesta se guarda
+ya renderizada (bytes JSON) en el cache:
+
+    catalog:version                         ← versión (uuid)
+    catalog:<version>:<hash de la request>  ← {'body': bytes, 'etag': '"..."'}
+
+- Cualquier cambio en Property, Rental, PropertyMedia, PropertyDetails,
+  EnserInventory, Enser o Repair reemplaza la versión por un uuid nuevo (al
+  hacer commit), así todas las entradas viejas quedan inalcanzables y
+  expiran solas. Es un set y no un incr: en el cache en disco incr no es
+  atómico y dos invalidaciones simultáneas podían terminar en una sola
+- La consulta real solo corre cuando la entrada no está en cache
+- ETag fuerte + Cache-Control; If-None-Match responde 304 sin cuerpo
+- La clave incluye el bloque de expiración de las URLs firmadas de media, así
+  el snapshot nunca entrega URLs vencidas
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+from apps.core.metrics import record_cache
+from hr_properties.media_signing import signed_expiry
+from hr_properties.renderers import ORJSONRenderer
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _timeout() -> int:
+    # Las URLs firmadas del snapshot valen como mínimo MEDIA_URL_TTL segundos
+    return min(int(getattr(settings, 'CATALOG_CACHE_TIMEOUT', 3600)), int(settings.MEDIA_URL_TTL))
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex
+
+
+def catalog_version() -> str:
+    cache = _cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Cache vacío o reiniciado: el primero que llega fija la versión
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def _bump_version():
+    # Siempre un valor nuevo: aunque dos workers escriban a la vez, ninguno deja la versión anterior
+    _cache().set(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+
+
+def invalidate_catalog():
+    """Invalida el catálogo cuando la transacción actual haga commit"""
+    transaction.on_commit(_bump_version)
+
+
+def catalog_key(request, *parts) -> str:
+    """Clave de cache para la request (ruta, query, host) dentro de la versión actual"""
+    query = sorted(request.GET.lists())
+    raw = repr((
+        request.path,
+        query,
+        request.scheme,
+        request.get_host(),
+        signed_expiry(),
+        parts,
+    ))
+    digest = hashlib.sha256(raw.encode()).hexdigest()
+    return f'catalog:{catalog_version()}:{digest}'
+
+
+def _not_modified(request, etag) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    # Comparación débil (RFC 9110): CompressionMiddleware convierte la ETag en W/"..."
+    etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+    return '*' in etags or etag in etags
+
+
+def _finalize(request, entry, hit):
+    etag = entry['etag']
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['body'], content_type='application/json')
+    response['ETag'] = etag
+    response['X-Catalog-Cache'] = 'HIT' if hit else 'MISS'
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=int(getattr(settings, 'CATALOG_MAX_AGE', 60)),
+    )
+    return response
+
+
+def cached_response(request, key_parts, build):
+    """
+    Responde desde el cache o construye la respuesta.
+
+    `build()` devuelve los datos serializados (solo se llama en un miss).
+    """
+    cache = _cache()
+    key = catalog_key(request, *key_parts)
+    entry = cache.get(key)
+    hit = entry is not None
+    record_cache('catalog', hit)
+    if not hit:
+        body = ORJSONRenderer().render(build())
+        entry = {
+            'body': body,
+            'etag': f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        }
+        cache.set(key, entry, timeout=_timeout())
+    return _finalize(request, entry, hit)
+
+
+def cached_value(name, build):
+    """Valor cualquiera (p. ej. ids disponibles) cacheado dentro de la versión actual"""
+    cache = _cache()
+    key = f'catalog:{catalog_version()}:value:{name}'
+    value = cache.get(key)
+    record_cache('catalog_value', value is not None)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout=_timeout())
+    return value
@@ -0,0 +1,131 @@
+"""
+Facetas del catálogo de propiedades (conteo por valor de cada filtro)
+
+GET /api/properties/facets/ devuelve, para el queryset ya filtrado, cuántas
+propiedades hay por cada valor de use, type_building, city, state,
+rental_type, bedrooms y bathrooms:
+
+- PostgreSQL: una sola consulta con GROUPING SETS (incluye el total)
+- Otros motores: una consulta GROUP BY por faceta + el total (número fijo)
+
+Los mismos parámetros sirven para filtrar el listado (apply_facet_filters),
+así los chips del frontend y /api/properties/ siempre coinciden.
+"""
+from django.db import connection
+from django.db.models import Count
+
+from .models import Property, PropertyDetails
+
+# faceta → (modelo, campo, lookup desde Property)
+FACETS = {
+    'use': (Property, 'use', 'use'),
+    'type_building': (Property, 'type_building', 'type_building'),
+    'city': (Property, 'city', 'city'),
+    'state': (Property, 'state', 'state'),
+    'rental_type': (Property, 'rental_type', 'rental_type'),
+    'bedrooms': (PropertyDetails, 'bedrooms', 'details__bedrooms'),
+    'bathrooms': (PropertyDetails, 'bathrooms', 'details__bathrooms'),
+}
+
+# Filtros que get_queryset todavía no aplica (use y rental_type ya existen)
+FILTER_PARAMS = ['type_building', 'city', 'state', 'bedrooms', 'bathrooms']
+INTEGER_FACETS = {'bedrooms', 'bathrooms'}
+
+
+def apply_facet_filters(queryset, params):
+    """
+    Filtros por valores de faceta (múltiples separados por coma):
+    ?city=Cali,Palmira&type_building=house&bedrooms=2,3
+    """
+    for name in FILTER_PARAMS:
+        raw = params.get(name)
+        if not raw:
+            continue
+        values = [value.strip() for value in raw.split(',') if value.strip()]
+        if name in INTEGER_FACETS:
+            values = [int(value) for value in values if value.isdigit()]
+        if not values:
+            # Solo valores inválidos (?bedrooms=abc): ignorar el filtro, no vaciar el catálogo
+            continue
+        _, _, lookup = FACETS[name]
+        queryset = queryset.filter(**{f'{lookup}__in': values})
+    return queryset
+
+
+def _sorted_buckets(counts):
+    """[{value, count}] de mayor a menor conteo, sin valores nulos/vacíos"""
+    buckets = [
+        {'value': value, 'count': count}
+        for value, count in counts.items()
+        if value not in (None, '')
+    ]
+    buckets.sort(key=lambda bucket: (-bucket['count'], str(bucket['value'])))
+    return buckets
+
+
+def _postgres_facets(queryset):
+    quote = connection.ops.quote_name
+    aliases = {Property: 'p', PropertyDetails: 'd'}
+    columns = [
+        f'{aliases[model]}.{quote(model._meta.get_field(field).column)}'
+        for model, field, _ in FACETS.values()
+    ]
+    inner_sql, inner_params = queryset.order_by().values('pk').query.sql_with_params()
+
+    select = ', '.join(f'{column}, GROUPING({column})' for column in columns)
+    grouping_sets = ', '.join(f'({column})' for column in columns)
+    sql = f"""
+        SELECT {select}, COUNT(*)
+        FROM {quote(Property._meta.db_table)} p
+        LEFT JOIN {quote(PropertyDetails._meta.db_table)} d
+            ON d.{quote(PropertyDetails._meta.get_field('property').column)} = p.{quote(Property._meta.pk.column)}
+        WHERE p.{quote(Property._meta.pk.column)} IN ({inner_sql})
+        GROUP BY GROUPING SETS ({grouping_sets}, ())
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, inner_params)
+        rows = cursor.fetchall()
+
+    names = list(FACETS)
+    counts = {name: {} for name in names}
+    total = 0
+    for row in rows:
+        count = row[-1]
+        # GROUPING(col) = 0 → la fila pertenece al grupo de esa columna
+        grouped = [i for i, name in enumerate(names) if row[2 * i + 1] == 0]
+        if not grouped:
+            total = count
+            continue
+        i = grouped[0]
+        counts[names[i]][row[2 * i]] = count
+    return total, counts
+
+
+def _generic_facets(queryset):
+    queryset = queryset.order_by()
+    counts = {}
+    for name, (_, _, lookup) in FACETS.items():
+        rows = queryset.values(lookup).annotate(total=Count('pk', distinct=True)).values_list(lookup, 'total')
+        counts[name] = dict(rows)
+    return queryset.count(), counts
+
+
+def compute_facets(queryset) -> dict:
+    """
+    {
+        "count": 12,
+        "facets": {
+            "city": [{"value": "Cali", "count": 8}, {"value": "Palmira", "count": 4}],
+            "bedrooms": [{"value": 3, "count": 7}, ...],
+            ...
+        }
+    }
+    """
+    if connection.vendor == 'postgresql':
+        total, counts = _postgres_facets(queryset)
+    else:
+        total, counts = _generic_facets(queryset)
+    return {
+        'count': total,
+        'facets': {name: _sorted_buckets(counts[name]) for name in FACETS},
+    }
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:05
+
+from django.db import migrations, models
+from django.db.models import Case, Exists, OuterRef, Subquery, Value, When
+from django.utils import timezone
+
+
+def populate_occupancy(apps, schema_editor):
+    """Calcular occupancy_status y current_rental_check_out de las propiedades existentes"""
+    Property = apps.get_model('properties', 'Property')
+    Rental = apps.get_model('rentals', 'Rental')
+
+    today = timezone.now().date()
+    occupied = Rental.objects.filter(property=OuterRef('pk'), status='occupied')
+    Property.objects.update(
+        occupancy_status=Case(
+            When(Exists(occupied), then=Value('occupied')),
+            default=Value('available'),
+        ),
+        current_rental_check_out=Subquery(
+            occupied.filter(check_out__gte=today).order_by('check_out').values('check_out')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0019_alter_propertylaw_legal_number'),
+        ('rentals', '0014_rental_total_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='current_rental_check_out',
+            field=models.DateField(blank=True, editable=False, help_text='Earliest upcoming check_out among occupied rentals', null=True, verbose_name='Current Rental Check Out'),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='occupancy_status',
+            field=models.CharField(choices=[('occupied', 'Occupied'), ('available', 'Available')], default='available', editable=False, help_text='occupied if the property has at least one occupied rental', max_length=20, verbose_name='Occupancy Status'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_deleted', 'use', 'rental_type', 'occupancy_status'], name='property_occupancy_idx'),
+        ),
+        migrations.RunPython(populate_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0020_property_occupancy_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted__isnull', True)), fields=['created_at', 'id'], name='property_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertymedia',
+            index=models.Index(fields=['uploaded_at', 'id'], name='property_media_uploaded_idx'),
+        ),
+    ]
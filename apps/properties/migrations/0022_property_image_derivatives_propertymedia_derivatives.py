@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0021_property_active_idx_property_media_uploaded_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertymedia',
+            name='derivatives',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
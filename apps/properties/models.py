@@ -42,6 +42,10 @@ class Property(models.Model):
         ('personal', 'Personal'),
         ('commercial', 'Commercial')
     ]
+    OCCUPANCY_STATUS_CHOICES = [
+        ('occupied', 'Occupied'),
+        ('available', 'Available'),
+    ]
     TYPE_BUILDINGS_CHOICES = [
         ('house', 'House'),
         ('apartment', 'Apartment'),
@@ -79,12 +83,30 @@ class Property(models.Model):
         verbose_name='Featured Image',
         help_text='Main property image URL'
     )
+    # Manifest de derivados de image_url (lo escribe apps.media.derivatives.record_manifest)
+    image_derivatives = models.JSONField(null=True, blank=True, editable=False)
     is_deleted = models.DateTimeField(
         null=True, 
         blank=True, 
         db_column='is_deleted',
         verbose_name='Deleted At'
     )
+    # Estado desnormalizado de ocupación (lo mantienen las señales de Rental y update_rental_status)
+    occupancy_status = models.CharField(
+        max_length=20,
+        choices=OCCUPANCY_STATUS_CHOICES,
+        default='available',
+        editable=False,
+        verbose_name='Occupancy Status',
+        help_text='occupied if the property has at least one occupied rental'
+    )
+    current_rental_check_out = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Current Rental Check Out',
+        help_text='Earliest upcoming check_out among occupied rentals'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -93,6 +115,19 @@ class Property(models.Model):
         verbose_name = 'Propiedad'
         verbose_name_plural = 'Propiedades'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['is_deleted', 'use', 'rental_type', 'occupancy_status'],
+                name='property_occupancy_idx',
+            ),
+            # Parcial: todas las consultas filtran is_deleted IS NULL; también da el
+            # orden estable de la paginación keyset (ver hr_properties/pagination.py)
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(is_deleted__isnull=True),
+                name='property_active_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.name
@@ -156,6 +191,8 @@ class PropertyMedia(models.Model):
         verbose_name='Tipo de medio'
     )
     url = models.FileField(upload_to=property_media_upload_to, verbose_name='URL')
+    # Manifest de derivados de url (lo escribe apps.media.derivatives.record_manifest)
+    derivatives = models.JSONField(null=True, blank=True, editable=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -163,6 +200,9 @@ class PropertyMedia(models.Model):
         verbose_name = 'Medio de Propiedad'
         verbose_name_plural = 'Medios de Propiedades'
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['uploaded_at', 'id'], name='property_media_uploaded_idx'),
+        ]
     
     def __str__(self):
         return f"{self.media_type} - {self.property.name}"
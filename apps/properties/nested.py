@@ -0,0 +1,102 @@
+"""
+Resolución de rutas anidadas bajo /api/properties/{property_id}/...
+
+Antes cada vista anidada hacía una consulta por nivel de la URL:
+
+    get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
+    get_object_or_404(Obligation, pk=obligation_id, property_id=property_id)
+    PropertyPayment.objects.filter(obligation_id=obligation_id).get(pk=payment_id)
+
+PropertyNestedMixin valida toda la cadena (property → obligation/rental →
+payment) con una sola consulta sobre el último nivel, con JOIN a los padres
+y respetando el soft delete de Property:
+
+    SELECT ... FROM property_payment
+    INNER JOIN obligation ON ... INNER JOIN property ON ...
+    WHERE property_payment.id = 9 AND obligation.id = 4
+      AND property.id = 2 AND property.is_deleted IS NULL
+
+Los objetos resueltos quedan en request.nested_objects ({url_kwarg: instancia})
+para que la vista (y cualquier otro código de la misma request) los reutilice.
+
+Uso:
+
+    class ObligationPaymentsListView(PropertyNestedMixin, generics.ListAPIView):
+        nested_chain = (PROPERTY_LEVEL, ('obligation_id', Obligation, 'property'))
+
+        def get_queryset(self):
+            return PropertyPayment.objects.filter(obligation=self.get_nested('obligation_id'))
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.http import Http404
+
+from .models import Property
+
+# (kwarg de la URL, modelo, FK hacia el nivel anterior)
+PROPERTY_LEVEL = ('property_id', Property, None)
+
+
+def _is_soft_deletable(model):
+    try:
+        model._meta.get_field('is_deleted')
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def resolve_chain(chain, kwargs):
+    """
+    Resuelve la cadena (de la raíz a la hoja) con una consulta sobre la hoja.
+    Devuelve {url_kwarg: instancia} o lanza Http404.
+    """
+    filters = {}
+    prefix = ''
+    for kwarg, model, parent_field in reversed(chain):
+        value = kwargs.get(kwarg)
+        if value is None or not str(value).isdigit():
+            raise Http404(f'Invalid {kwarg}')
+        filters[f'{prefix}pk'] = int(value)
+        if _is_soft_deletable(model):
+            filters[f'{prefix}is_deleted__isnull'] = True
+        if parent_field:
+            prefix = f'{prefix}{parent_field}__'
+
+    leaf_kwarg, leaf_model, _ = chain[-1]
+    queryset = leaf_model._default_manager.filter(**filters)
+    if prefix:
+        queryset = queryset.select_related(prefix[:-2])
+    instance = queryset.first()
+    if instance is None:
+        raise Http404(f'No {leaf_model._meta.object_name} matches the given query.')
+
+    resolved = {}
+    for kwarg, _, parent_field in reversed(chain):
+        resolved[kwarg] = instance
+        if parent_field:
+            instance = getattr(instance, parent_field)
+    return resolved
+
+
+class PropertyNestedMixin:
+    """Mixin para vistas bajo /api/properties/{property_id}/..."""
+    nested_chain = (PROPERTY_LEVEL,)
+
+    def resolve_nested(self):
+        resolved = getattr(self.request, 'nested_objects', None)
+        if resolved is None:
+            resolved = resolve_chain(self.nested_chain, self.kwargs)
+            self.request.nested_objects = resolved
+        return resolved
+
+    def get_nested(self, kwarg):
+        return self.resolve_nested()[kwarg]
+
+    def get_property(self):
+        """La propiedad de la URL (no eliminada)"""
+        return self.get_nested(PROPERTY_LEVEL[0])
+
+    def get_nested_leaf(self):
+        """El último nivel de la cadena (p. ej. el pago en .../payments/{payment_id}/)"""
+        obj = self.get_nested(self.nested_chain[-1][0])
+        self.check_object_permissions(self.request, obj)
+        return obj
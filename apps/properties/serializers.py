@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import Property, PropertyLaw, Enser, EnserInventory, PropertyDetails, PropertyMedia
 from apps.maintenance.models import Repair
+from hr_properties.media_signing import SignedMediaModelSerializer, signed_file_url
+from hr_properties.flex_fields import FlexFieldsSerializerMixin
+from apps.media.serializers import ImageDerivativesField
 
 
 class PropertyDetailsSerializer(serializers.ModelSerializer):
@@ -9,18 +12,20 @@ class PropertyDetailsSerializer(serializers.ModelSerializer):
         exclude = ['id', 'property']  # Excluimos property porque se asigna automáticamente
 
 
-class PropertyMediaSerializer(serializers.ModelSerializer):
+class PropertyMediaSerializer(SignedMediaModelSerializer):
+    srcset = ImageDerivativesField(source='url', manifest='derivatives')
+
     class Meta:
         model = PropertyMedia
-        fields = ['id', 'media_type', 'url', 'uploaded_at']
+        fields = ['id', 'media_type', 'url', 'srcset', 'uploaded_at']
         read_only_fields = ['id', 'uploaded_at']
 
 
-class PropertyMediaCreateSerializer(serializers.ModelSerializer):
+class PropertyMediaCreateSerializer(SignedMediaModelSerializer):
     """Serializer para crear media sin especificar property"""
     class Meta:
         model = PropertyMedia
-        exclude = ['id', 'property', 'uploaded_at']
+        exclude = ['id', 'property', 'uploaded_at', 'derivatives']
 
 
 class PropertyMediaUploadSerializer(serializers.Serializer):
@@ -37,9 +42,10 @@ class PropertyMediaUploadSerializer(serializers.Serializer):
     )
 
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(FlexFieldsSerializerMixin, SignedMediaModelSerializer):
     details = PropertyDetailsSerializer(required=False)
     media = PropertyMediaSerializer(many=True, read_only=True)  # Solo lectura
+    image_srcset = ImageDerivativesField(source='image_url', manifest='image_derivatives')
     
     class Meta:
         model = Property
@@ -55,12 +61,14 @@ class PropertySerializer(serializers.ModelSerializer):
             'state',
             'city',
             'image_url',
+            'image_srcset',
             'created_at',
             'updated_at',
             'details',
             'media'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['details', 'media']
     
     def validate(self, data):
         """Validar que rental_type sea obligatorio solo para propiedades de tipo rental"""
@@ -114,13 +122,8 @@ class PropertyLawSerializer(serializers.ModelSerializer):
         fields = ['id', 'property', 'entity_name', 'url', 'original_amount', 'legal_number', 'is_paid']
     
     def get_url(self, obj):
-        """Devolver la URL completa del archivo si existe"""
-        if obj.url:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.url.url)
-            return obj.url.url
-        return None
+        """Devolver la URL firmada (completa si hay request) del archivo si existe"""
+        return signed_file_url(obj.url, self.context.get('request'))
 
 
 class PropertyLawCreateSerializer(serializers.ModelSerializer):
@@ -136,13 +139,13 @@ class EnserSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class EnserInventorySerializer(serializers.ModelSerializer):
+class EnserInventorySerializer(SignedMediaModelSerializer):
     class Meta:
         model = EnserInventory
         fields = '__all__'
 
 
-class EnserInventoryCreateSerializer(serializers.ModelSerializer):
+class EnserInventoryCreateSerializer(SignedMediaModelSerializer):
     """Serializer para crear inventario de enseres sin especificar property"""
     class Meta:
         model = EnserInventory
@@ -157,7 +160,7 @@ class EnserCreateAndAddSerializer(serializers.Serializer):
     url_media = serializers.FileField(required=False, allow_null=True, help_text="Archivo del inventario (opcional)")
 
 
-class EnserInventoryDetailSerializer(serializers.ModelSerializer):
+class EnserInventoryDetailSerializer(SignedMediaModelSerializer):
     """Serializer anidado que incluye los datos completos del enser"""
     enser = EnserSerializer(read_only=True)
     
@@ -173,7 +176,7 @@ class RepairSerializer(serializers.ModelSerializer):
         fields = ['id', 'cost', 'date', 'observation', 'description']
 
 
-class PropertyDetailSerializer(serializers.ModelSerializer):
+class PropertyDetailSerializer(FlexFieldsSerializerMixin, SignedMediaModelSerializer):
     """
     Serializer completo con detalles, media, inventario de enseres, reparaciones y leyes
     
@@ -191,6 +194,7 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
     inventory = EnserInventoryDetailSerializer(many=True, read_only=True)
     repairs = RepairSerializer(many=True, read_only=True)
     laws = PropertyLawSerializer(many=True, read_only=True)
+    image_srcset = ImageDerivativesField(source='image_url', manifest='image_derivatives')
     
     class Meta:
         model = Property
@@ -206,6 +210,7 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
             'state',
             'city',
             'image_url',
+            'image_srcset',
             'created_at',
             'updated_at',
             'details',
@@ -215,6 +220,7 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
             'laws'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['details', 'media', 'inventory', 'repairs', 'laws']
     
     def to_representation(self, instance):
         """
@@ -245,8 +251,10 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
 
 
 # Serializer completo de PropertyMedia (con todos los campos) para lectura
-class PropertyMediaListSerializer(serializers.ModelSerializer):
+class PropertyMediaListSerializer(SignedMediaModelSerializer):
     """Serializer completo para listar media con información de la propiedad"""
+    srcset = ImageDerivativesField(source='url', manifest='derivatives')
+
     class Meta:
         model = PropertyMedia
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['derivatives']
\ No newline at end of file
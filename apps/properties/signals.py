@@ -0,0 +1,32 @@
+"""
+Señales para la app de properties
+
+Invalidación del catálogo público (ver catalog.py) cuando cambia cualquier
+dato que aparece en el listado o detalle de propiedades disponibles.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.maintenance.models import Repair
+from apps.media.derivatives import derivatives_generated
+from apps.rentals.models import Rental
+
+from .catalog import invalidate_catalog
+from .models import Enser, EnserInventory, Property, PropertyDetails, PropertyMedia
+
+CATALOG_MODELS = (Property, PropertyDetails, PropertyMedia, EnserInventory, Enser, Repair, Rental)
+
+
+def invalidate_catalog_on_change(sender, **kwargs):
+    invalidate_catalog()
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_on_change, sender=model, dispatch_uid=f'catalog_save_{model._meta.label}')
+    post_delete.connect(invalidate_catalog_on_change, sender=model, dispatch_uid=f'catalog_delete_{model._meta.label}')
+
+
+@receiver(derivatives_generated)
+def invalidate_catalog_on_derivatives(sender, **kwargs):
+    # Los srcset aparecen cuando termina la cola de derivados
+    invalidate_catalog()
@@ -1,3 +1,303 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.users.models import Role, User, UserRole
+from hr_properties.flex_fields import requested_fields
+from hr_properties.pagination import KeysetPagination
+from hr_properties.query_plans import QueryPlanAssertionsMixin
+
+from . import catalog, facets
+from .models import Property, PropertyDetails
+from .serializers import PropertySerializer
+
+
+def seed_properties(count=40):
+    """Propiedades de prueba (algunas soft-deleted) sin disparar señales"""
+    now = timezone.now()
+    return Property.objects.bulk_create([
+        Property(
+            name=f'Property {i}',
+            use='rental' if i % 3 else 'personal',
+            rental_type='monthly' if i % 2 else 'airbnb',
+            address=f'Street {i}',
+            zip_code='760001',
+            type_building='house',
+            city='Cali',
+            is_deleted=now - timedelta(days=1) if i % 10 == 0 else None,
+        )
+        for i in range(count)
+    ])
+
+
+class PropertyQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """Las consultas de propiedades activas (is_deleted IS NULL) usan índices"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_properties()
+
+    def test_active_properties_listing(self):
+        self.assertNoSequentialScan(Property.objects.filter(is_deleted__isnull=True), tables=['property'])
+
+    def test_active_properties_by_occupancy(self):
+        queryset = Property.objects.filter(
+            is_deleted__isnull=True,
+            use__in=['rental', 'commercial'],
+            occupancy_status='available',
+        ).values_list('id', flat=True)
+        self.assertNoSequentialScan(queryset, tables=['property'])
+
+
+LOCMEM_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+    for alias in ('default', 'throttle', 'tokens')
+}
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=LOCMEM_CACHES)
+class CatalogCacheTests(TestCase):
+    url = '/api/properties/?rental_status=available'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.properties = seed_properties(6)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_snapshot_etag_and_304(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['X-Catalog-Cache'], 'MISS')
+        self.assertIn('public', first['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        # Solo los buckets de throttling (catalog.ip y catalog.endpoint)
+        self.assertEqual([q['sql'].split()[1] for q in queries], ['"throttle_bucket"', '"throttle_bucket"'])
+        self.assertEqual(second['X-Catalog-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'W/{first["ETag"]}')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_changes_invalidate_the_snapshot(self):
+        first = self.client.get(self.url)
+        prop = self.properties[1]
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.name = 'Renombrada'
+            prop.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertIn(b'Renombrada', response.content)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_every_invalidation_gets_a_new_version(self):
+        versions = {catalog.catalog_version()}
+        for _ in range(3):
+            catalog._bump_version()
+            versions.add(catalog.catalog_version())
+        self.assertEqual(len(versions), 4)
+        # Cache vacío: se fija una versión y se mantiene
+        caches['default'].clear()
+        self.assertEqual(catalog.catalog_version(), catalog.catalog_version())
+
+    def test_authenticated_requests_skip_the_snapshot(self):
+        admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+        self.client.force_authenticate(admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Catalog-Cache', response)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=LOCMEM_CACHES)
+class PropertyFacetTests(TestCase):
+    """Conteos de /api/properties/facets/ y filtros por faceta del listado"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # 1..6 activas (0 soft-deleted): use rental ×4 / personal ×2
+        cls.properties = seed_properties(7)
+        Property.objects.filter(pk__in=[cls.properties[4].pk, cls.properties[5].pk]).update(city='Palmira')
+        PropertyDetails.objects.bulk_create([
+            PropertyDetails(property=cls.properties[1], bedrooms=2),
+            PropertyDetails(property=cls.properties[2], bedrooms=3),
+            PropertyDetails(property=cls.properties[4], bedrooms=3),
+        ])
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def facets(self, **params):
+        response = self.client.get('/api/properties/facets/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counts_per_value(self):
+        data = self.facets()
+        self.assertEqual(data['count'], 6)
+        facets = data['facets']
+        self.assertEqual(facets['use'], [{'value': 'rental', 'count': 4}, {'value': 'personal', 'count': 2}])
+        self.assertEqual(facets['city'], [{'value': 'Cali', 'count': 4}, {'value': 'Palmira', 'count': 2}])
+        self.assertEqual(facets['rental_type'], [{'value': 'airbnb', 'count': 3}, {'value': 'monthly', 'count': 3}])
+        self.assertEqual(facets['bedrooms'], [{'value': 3, 'count': 2}, {'value': 2, 'count': 1}])
+        # Sin valores nulos
+        self.assertEqual(facets['bathrooms'], [])
+
+    def test_filters_match_the_listing(self):
+        params = {'city': 'Palmira,Jamundí', 'bedrooms': '3'}
+        data = self.facets(**params)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['facets']['city'], [{'value': 'Palmira', 'count': 1}])
+
+        listing = self.client.get('/api/properties/', params).data
+        rows = listing['results'] if isinstance(listing, dict) else listing
+        self.assertEqual([row['id'] for row in rows], [self.properties[4].id])
+
+    def test_invalid_integer_values_are_ignored(self):
+        params = {'bedrooms': 'abc,', 'city': 'Cali'}
+        self.assertEqual(self.facets(**params)['count'], 4)
+        listing = self.client.get('/api/properties/', params).data
+        rows = listing['results'] if isinstance(listing, dict) else listing
+        self.assertEqual(len(rows), 4)
+
+    def test_fixed_number_of_queries(self):
+        with self.assertNumQueries(len(facets.FACETS) + 1):
+            facets.compute_facets(Property.objects.filter(is_deleted__isnull=True))
+
+    def test_public_facets_only_count_available(self):
+        self.client.force_authenticate(None)
+        response = self.client.get('/api/properties/facets/', {'rental_status': 'available'})
+        self.assertEqual(response.status_code, 200)
+        # Respuesta pública: snapshot serializado del cache del catálogo
+        data = response.json()
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(data['facets']['use'], [{'value': 'rental', 'count': 4}])
+        self.assertEqual(self.client.get('/api/properties/facets/').status_code, 401)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=LOCMEM_CACHES)
+class PropertyCursorPaginationTests(TestCase):
+    """KeysetPagination con filas creadas en el mismo milisegundo"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # 10 activas (0 y 10 soft-deleted), created_at separado por microsegundos
+        cls.properties = seed_properties(12)
+        base = timezone.now().replace(microsecond=500000)
+        for i, prop in enumerate(cls.properties):
+            Property.objects.filter(pk=prop.pk).update(created_at=base + timedelta(microseconds=i))
+        cls.active_ids = list(
+            Property.objects.filter(is_deleted__isnull=True).order_by('-created_at', '-pk').values_list('pk', flat=True)
+        )
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def walk(self, url, direction='next'):
+        pages = []
+        while url:
+            self.assertLess(len(pages), len(self.active_ids), 'el cursor no avanza')
+            data = self.client.get(url).data
+            pages.append([row['id'] for row in data['results']])
+            url = data[direction]
+        return pages
+
+    def test_pages_through_rows_of_the_same_millisecond(self):
+        pages = self.walk('/api/properties/?page_size=3')
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 1])
+        self.assertEqual(sum(pages, []), self.active_ids)
+
+    def test_previous_cursor_returns_the_same_pages(self):
+        forward = self.walk('/api/properties/?page_size=3')
+        data = self.client.get('/api/properties/?page_size=3').data
+        while data['next']:
+            data = self.client.get(data['next']).data
+        backward = self.walk(data['previous'], direction='previous')
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_ascending_order(self):
+        factory = APIRequestFactory()
+        queryset = Property.objects.filter(is_deleted__isnull=True).order_by('created_at')
+        paginator, seen, url = KeysetPagination(), [], '/api/properties/?page_size=3'
+        while url:
+            self.assertLessEqual(len(seen), len(self.active_ids), 'el cursor no avanza')
+            rows = paginator.paginate_queryset(queryset, Request(factory.get(url)))
+            seen.extend(row.pk for row in rows)
+            url = paginator.next_link
+        self.assertEqual(seen, self.active_ids[::-1])
+
+    def test_cursor_round_trip_and_invalid_cursor(self):
+        paginator = KeysetPagination()
+        fields = paginator.get_ordering(Property.objects.all(), None)
+        prop = Property.objects.get(pk=self.active_ids[4])
+        values = [prop.created_at, prop.pk]
+        token = paginator._encode_cursor(values, reverse=True)
+        self.assertEqual(paginator._decode_cursor(token, fields), (values, True))
+        self.assertEqual(self.client.get('/api/properties/', {'cursor': 'nope'}).status_code, 404)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=LOCMEM_CACHES)
+class PropertyFlexFieldsTests(TestCase):
+    """?fields= / ?expand= recortan la respuesta y los prefetch del listado"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.properties = seed_properties(4)
+        PropertyDetails.objects.create(property=cls.properties[1], bedrooms=2)
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def list(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/properties/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], [query['sql'] for query in queries]
+
+    def test_fields_selects_only_those_fields(self):
+        rows, queries = self.list(fields='id,name,city')
+        self.assertEqual(set(rows[0]), {'id', 'name', 'city'})
+        self.assertFalse([sql for sql in queries if 'property_media' in sql or 'property_details' in sql])
+
+    def test_expand_keeps_simple_fields_and_listed_relations(self):
+        rows, queries = self.list(expand='details')
+        self.assertIn('details', rows[0])
+        self.assertNotIn('media', rows[0])
+        self.assertIn('image_srcset', rows[0])
+        self.assertFalse([sql for sql in queries if 'property_media' in sql])
+        self.assertTrue([sql for sql in queries if 'property_details' in sql])
+
+    def test_no_params_returns_every_field(self):
+        rows, queries = self.list()
+        self.assertEqual(set(rows[0]), set(PropertySerializer.Meta.fields))
+        self.assertTrue([sql for sql in queries if 'property_media' in sql])
+
+    def test_detail_and_writes(self):
+        prop = self.properties[1]
+        response = self.client.get(f'/api/properties/{prop.id}/', {'fields': 'id,details'})
+        self.assertEqual(response.data, {'id': prop.id, 'details': response.data['details']})
+        self.assertEqual(response.data['details']['bedrooms'], 2)
+        # En escrituras ?fields= no recorta el serializer
+        request = APIRequestFactory().post('/api/properties/?fields=id')
+        self.assertIsNone(requested_fields(Request(request), PropertySerializer))
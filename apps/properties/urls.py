@@ -4,7 +4,8 @@ from .views import (
     PropertyViewSet, PropertyDetailsViewSet, PropertyMediaViewSet,
     PropertyLawViewSet, EnserViewSet, EnserInventoryViewSet, 
     PropertyAddRepairView, PropertyUploadMediaView, PropertyAddEnserView,
-  PropertyAddLawView, PropertyLawDetailView, PropertyMediaDetailView
+  PropertyAddLawView, PropertyLawDetailView, PropertyMediaDetailView,
+    PropertyDocumentsExportView,
 )
 
 router = DefaultRouter()
@@ -23,6 +24,7 @@ urlpatterns = [
     path('properties/<int:property_id>/add_law/', PropertyAddLawView.as_view(), name='property-add-law'),
     path('properties/<int:property_id>/laws/<int:law_id>/', PropertyLawDetailView.as_view(), name='property-law-detail'),
     path('properties/<int:property_id>/media/<int:media_id>/', PropertyMediaDetailView.as_view(), name='property-media-detail'),
+    path('properties/<int:property_id>/documents.zip', PropertyDocumentsExportView.as_view(), name='property-documents-export'),
 ]
 
 '''
@@ -122,6 +124,8 @@ POST /api/properties/{id}/upload_media/         - Subir archivos multimedia
      "files": [archivo1, archivo2],
      "media_type": "image"  // o "video", "document"
    }
+GET  /api/properties/{id}/documents.zip         - ZIP (streaming) con leyes, contratos,
+                                                  vouchers e inventario + MANIFEST.sha256
 
 --- REPARACIONES ---
 POST /api/properties/{id}/add_repair/           - Añadir reparación
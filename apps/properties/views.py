@@ -1,12 +1,18 @@
 from django.shortcuts import render, get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.db.models import Sum, Q
+from django.db import transaction
+from django.db.models import Prefetch, Sum, Q
 
 from apps.users.permissions import IsAdminUser, IsAdminOrPublicReadOnly
 from .models import Property, PropertyLaw, Enser, EnserInventory, PropertyDetails, PropertyMedia
+from .nested import PROPERTY_LEVEL, PropertyNestedMixin
+from .catalog import cached_response, cached_value, catalog_key, invalidate_catalog
+from .facets import apply_facet_filters, compute_facets
 from .serializers import (
     PropertySerializer, PropertyDetailSerializer, PropertyLawSerializer, EnserSerializer, 
     EnserInventorySerializer, PropertyDetailsSerializer, PropertyMediaSerializer, 
@@ -17,6 +23,26 @@ from apps.finance.serializers import PropertyPaymentSerializer, ObligationDetail
 from apps.rentals.serializers import RentalPaymentSerializer
 from apps.maintenance.models import Repair
 from apps.maintenance.serializers import RepairSerializer, RepairCreateSerializer
+from hr_properties.media_signing import signed_file_url
+from hr_properties.flex_fields import FlexFieldsViewMixin
+from hr_properties.throttling import EndpointThrottle, IPThrottle
+from apps.media.derivatives import delete_derivatives, generate_derivatives
+from apps.media.tasks import enqueue_on_commit
+from apps.media.uploads import delete_files, save_files
+from apps.media.zipstream import astream_storage_zip, stream_storage_zip
+
+
+def delete_replaced_image(name, storage):
+    """
+    Borra una imagen principal reemplazada (y sus derivados) si ninguna
+    multimedia ni propiedad la usa. Con ContentAddressedStorage es quitar un
+    hardlink: el blob se libera cuando no le quedan nombres.
+    """
+    if PropertyMedia.objects.filter(url=name).exists() or Property.objects.filter(image_url=name).exists():
+        return
+    delete_derivatives(name, storage)
+    delete_files(storage, [name])
+
 
 '''
 ═══════════════════════════════════════════════════════════════════════════════════
@@ -70,6 +96,19 @@ from apps.maintenance.serializers import RepairSerializer, RepairCreateSerialize
       - GET /api/properties/{id}/repairs_cost/ → Total de reparaciones
       - GET /api/properties/{id}/financials/ → Resumen financiero completo
 
+🏷️ FACETAS (conteos para los chips de filtros):
+   GET /api/properties/facets/
+      - Acepta los mismos filtros que el listado
+      - 🔓 PÚBLICO con ?rental_status=available (cacheado por combinación de filtros)
+
+✂️ CAMPOS A DEMANDA (listado y detalle, ver hr_properties/flex_fields.py):
+      - ?fields=id,name,city → solo esos campos
+      - ?expand=media → campos simples + solo esas relaciones (no se prefetchean las demás)
+
+🔎 FILTROS POR FACETA (listado y facetas):
+      - ?type_building=house,apartment  ?city=Cali  ?state=Valle
+      - ?bedrooms=2,3  ?bathrooms=2
+
 📚 OTRAS RUTAS:
    🔒 SOLO ADMIN:
       - GET /api/properties/choices/ → Opciones de campos choice
@@ -101,10 +140,12 @@ from apps.maintenance.serializers import RepairSerializer, RepairCreateSerialize
 
 ═══════════════════════════════════════════════════════════════════════════════════
 '''
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(FlexFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Property.objects.filter(is_deleted__isnull=True)
     serializer_class = PropertySerializer
     permission_classes = [IsAdminUser]
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
+    throttle_scope = 'catalog'
     
     def get_permissions(self):
         """
@@ -112,34 +153,54 @@ class PropertyViewSet(viewsets.ModelViewSet):
         - Usuarios anónimos: pueden listar y ver detalles de propiedades disponibles
         - Admins: acceso completo a todo
         """
-        # Permitir acceso público a propiedades disponibles (list y retrieve)
-        if self.action in ['list', 'retrieve'] and self.request.method == 'GET':
+        # Permitir acceso público a propiedades disponibles (list, retrieve y facets)
+        if self.action in ['list', 'retrieve', 'facets'] and self.request.method == 'GET':
             rental_status = self.request.query_params.get('rental_status')
             
             # Si solicita propiedades disponibles, es público
             if rental_status and 'available' in rental_status:
                 return [AllowAny()]
             
-            # Si es retrieve, verificar si la propiedad es available
+            # Si es retrieve, verificar si la propiedad es available (ids cacheados en el catálogo)
             if self.action == 'retrieve':
-                try:
-                    property_id = self.kwargs.get('pk')
-                    if property_id:
-                        from apps.rentals.models import Rental
-                        property_obj = Property.objects.get(pk=property_id, is_deleted__isnull=True)
-                        # Verificar si la propiedad está disponible (sin rentals activos)
-                        has_occupied_rental = Rental.objects.filter(
-                            property=property_obj,
-                            status='occupied'
-                        ).exists()
-                        if not has_occupied_rental and property_obj.use in ['rental', 'commercial']:
-                            return [AllowAny()]
-                except Property.DoesNotExist:
-                    pass
+                property_id = self.kwargs.get('pk')
+                if property_id and str(property_id).isdigit() and int(property_id) in self.available_property_ids():
+                    return [AllowAny()]
         
         # Resto de acciones requieren admin
         return [IsAdminUser()]
     
+    @staticmethod
+    def available_property_ids():
+        """Ids de propiedades disponibles (sin rentals activos), cacheados por versión del catálogo"""
+        return cached_value('available_ids', lambda: frozenset(
+            Property.objects.filter(
+                is_deleted__isnull=True,
+                use__in=['rental', 'commercial'],
+                occupancy_status='available'
+            ).values_list('id', flat=True)
+        ))
+    
+    def is_public_catalog_request(self):
+        """Listado/detalle público pedido por un usuario anónimo → se sirve desde el catálogo cacheado"""
+        return self.request.method == 'GET' and not self.request.user.is_authenticated
+    
+    def get_throttles(self):
+        """Solo el catálogo anónimo tiene throttling (por IP y global, ver hr_properties/throttling.py)"""
+        if self.is_public_catalog_request():
+            return [IPThrottle(), EndpointThrottle()]
+        return []
+    
+    def list(self, request, *args, **kwargs):
+        if self.is_public_catalog_request():
+            return cached_response(request, ('list',), lambda: super(PropertyViewSet, self).list(request, *args, **kwargs).data)
+        return super().list(request, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        if self.is_public_catalog_request():
+            return cached_response(request, ('retrieve',), lambda: super(PropertyViewSet, self).retrieve(request, *args, **kwargs).data)
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_queryset(self):
         """
         Filtrar propiedades por múltiples criterios:
@@ -158,7 +219,6 @@ class PropertyViewSet(viewsets.ModelViewSet):
         
         ⚠️ IMPORTANTE: 'active' ya NO se usa, usar 'occupied' en su lugar
         """
-        from apps.rentals.models import Rental
         from django.utils import timezone
         from datetime import timedelta
         
@@ -188,28 +248,26 @@ class PropertyViewSet(viewsets.ModelViewSet):
                 elif status != 'ending_soon':  # No agregar ending_soon a mapped_statuses
                     mapped_statuses.append(status)
             
-            # Manejar ending_soon
+            # Manejar ending_soon (occupancy_status/current_rental_check_out: sin JOIN con rentals)
             if has_ending_soon:
                 today = timezone.now().date()
                 ending_soon_date = today + timedelta(days=30)
                 
                 # Propiedades con rentals que terminan pronto (próximos 30 días)
                 queryset = queryset.filter(
-                    rentals__status='occupied',
-                    rentals__check_out__gte=today,
-                    rentals__check_out__lte=ending_soon_date
-                ).distinct()
+                    occupancy_status='occupied',
+                    current_rental_check_out__gte=today,
+                    current_rental_check_out__lte=ending_soon_date
+                )
             elif 'available' in mapped_statuses and 'occupied' in mapped_statuses:
                 # Si busca ambos, solo filtra por propiedades de rental o commercial
                 queryset = queryset.filter(use__in=['rental', 'commercial'])
             elif 'occupied' in mapped_statuses:
                 # Propiedades con rental activo (occupied)
-                queryset = queryset.filter(rentals__status='occupied').distinct()
+                queryset = queryset.filter(occupancy_status='occupied')
             elif 'available' in mapped_statuses:
                 # Propiedades de rental o commercial sin rental activo
-                queryset = queryset.filter(use__in=['rental', 'commercial']).exclude(
-                    rentals__status='occupied'
-                ).distinct()
+                queryset = queryset.filter(use__in=['rental', 'commercial'], occupancy_status='available')
         
         # Filtro por rental_type (puede ser múltiple: "monthly" o "airbnb" o "monthly,airbnb")
         rental_type = self.request.query_params.get('rental_type', None)
@@ -219,6 +277,17 @@ class PropertyViewSet(viewsets.ModelViewSet):
             # Filtrar por el campo rental_type de Property
             queryset = queryset.filter(rental_type__in=types)
         
+        # Filtros por faceta: type_building, city, state, bedrooms, bathrooms
+        queryset = apply_facet_filters(queryset, self.request.query_params)
+        
+        # Evitar una consulta por propiedad al serializar
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('details').prefetch_related(
+                'media', 'inventory__enser', 'repairs', 'laws'
+            )
+        elif self.action == 'list':
+            queryset = queryset.select_related('details').prefetch_related('media')
+        
         return queryset
     
     def get_serializer_class(self):
@@ -262,6 +331,22 @@ class PropertyViewSet(viewsets.ModelViewSet):
             'type_building': [{'value': code, 'label': label} for code, label in Property.TYPE_BUILDINGS_CHOICES]
         })
     
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        GET /api/properties/facets/
+        GET /api/properties/facets/?rental_status=available&city=Cali   (público)
+        
+        Conteo de propiedades por cada valor de faceta bajo los filtros aplicados
+        (ver apps/properties/facets.py). Se cachea por combinación de filtros
+        dentro de la versión del catálogo.
+        """
+        build = lambda: compute_facets(self.get_queryset())
+        if self.is_public_catalog_request():
+            return cached_response(request, ('facets',), build)
+        filters_digest = catalog_key(request, 'facets').rsplit(':', 1)[-1]
+        return Response(cached_value(f'facets:{filters_digest}', build))
+    
     @action(detail=True, methods=['get'], permission_classes=[IsAdminUser])
     def repairs_cost(self, request, pk=None):
         """
@@ -323,10 +408,14 @@ class PropertyViewSet(viewsets.ModelViewSet):
         # GASTOS - Obligaciones pagadas
         obligation_payments = PropertyPayment.objects.filter(
             obligation__property=property_instance
-        )
+        ).select_related('payment_method', 'obligation')
         obligation_payments_total = obligation_payments.aggregate(total=Sum('amount'))['total'] or 0
         
-        obligations = Obligation.objects.filter(property=property_instance)
+        obligations = Obligation.objects.filter(property=property_instance).select_related(
+            'obligation_type', 'property'
+        ).prefetch_related(
+            Prefetch('payments', queryset=PropertyPayment.objects.select_related('payment_method'))
+        )
         
         # GASTOS - Reparaciones
         repairs_cost = Repair.objects.filter(
@@ -406,13 +495,25 @@ class PropertyViewSet(viewsets.ModelViewSet):
                 'error': 'Only media_type=image can be set as main image'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Guardar la misma referencia del archivo de multimedia como imagen principal
-        property_instance.image_url = media.url.name
+        previous_image = property_instance.image_url
+        storage = media.url.storage
+        if hasattr(storage, 'link'):
+            # Storage deduplicado: nombre propio para la imagen principal sin copiar bytes,
+            # así borrar la multimedia no deja la propiedad sin imagen
+            image_field = Property._meta.get_field('image_url')
+            property_instance.image_url = storage.link(
+                media.url.name,
+                image_field.generate_filename(property_instance, media.url.name),
+            )
+        else:
+            # Guardar la misma referencia del archivo de multimedia como imagen principal
+            property_instance.image_url = media.url.name
         property_instance.save(update_fields=['image_url', 'updated_at'])
+        if previous_image and previous_image.name != property_instance.image_url.name:
+            # Con storage deduplicado cada llamada crea un link nuevo: soltar el anterior
+            transaction.on_commit(lambda: delete_replaced_image(previous_image.name, previous_image.storage))
 
-        image_url = property_instance.image_url.url if property_instance.image_url else None
-        if image_url and request:
-            image_url = request.build_absolute_uri(image_url)
+        image_url = signed_file_url(property_instance.image_url, request)
 
         return Response({
             'message': 'Main image updated successfully',
@@ -461,15 +562,10 @@ class EnserInventoryViewSet(viewsets.ModelViewSet):
     serializer_class = EnserInventorySerializer
 
 
-class PropertyAddRepairView(generics.CreateAPIView):
+class PropertyAddRepairView(PropertyNestedMixin, generics.CreateAPIView):
     """Vista para añadir reparaciones a una propiedad específica"""
     serializer_class = RepairCreateSerializer
     
-    def get_property(self):
-        """Obtener la propiedad a partir del ID en la URL"""
-        property_id = self.kwargs.get('property_id')
-        return get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-    
     def create(self, request, *args, **kwargs):
         """Crear una reparación asociada a la propiedad"""
         property_instance = self.get_property()
@@ -486,15 +582,10 @@ class PropertyAddRepairView(generics.CreateAPIView):
             }, status=status.HTTP_201_CREATED)
 
 
-class PropertyAddEnserView(generics.CreateAPIView):
+class PropertyAddEnserView(PropertyNestedMixin, generics.CreateAPIView):
     """Vista para crear un nuevo enser y añadirlo al inventario de una propiedad específica"""
     serializer_class = EnserCreateAndAddSerializer
     
-    def get_property(self):
-        """Obtener la propiedad a partir del ID en la URL"""
-        property_id = self.kwargs.get('property_id')
-        return get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-    
     def create(self, request, *args, **kwargs):
         """Crear un enser y añadirlo al inventario de la propiedad"""
         property_instance = self.get_property()
@@ -524,15 +615,10 @@ class PropertyAddEnserView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PropertyAddLawView(generics.CreateAPIView):
+class PropertyAddLawView(PropertyNestedMixin, generics.CreateAPIView):
     """Vista para crear una ley/regulación asociada a una propiedad específica"""
     serializer_class = PropertyLawCreateSerializer
     
-    def get_property(self):
-        """Obtener la propiedad a partir del ID en la URL"""
-        property_id = self.kwargs.get('property_id')
-        return get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-    
     def create(self, request, *args, **kwargs):
         """Crear un PropertyLaw asociado a la propiedad"""
         property_instance = self.get_property()
@@ -575,21 +661,18 @@ class PropertyAddLawView(generics.CreateAPIView):
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class PropertyLawDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PropertyLawDetailView(PropertyNestedMixin, generics.RetrieveUpdateDestroyAPIView):
     """Vista para ver, editar o eliminar una PropertyLaw específica de una propiedad"""
     serializer_class = PropertyLawSerializer
+    nested_chain = (PROPERTY_LEVEL, ('law_id', PropertyLaw, 'property'))
     
     def get_queryset(self):
         """Filtrar PropertyLaws por la propiedad especificada"""
-        property_id = self.kwargs.get('property_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return PropertyLaw.objects.filter(property_id=property_id)
+        return PropertyLaw.objects.filter(property=self.get_property())
     
     def get_object(self):
-        """Obtener la PropertyLaw específica"""
-        law_id = self.kwargs.get('law_id')
-        return get_object_or_404(self.get_queryset(), pk=law_id)
+        """Obtener la PropertyLaw específica (propiedad no eliminada + ley en una sola consulta)"""
+        return self.get_nested_leaf()
     
     def retrieve(self, request, *args, **kwargs):
         """Ver detalle de una PropertyLaw"""
@@ -636,40 +719,34 @@ class PropertyLawDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Response({'message': 'PropertyLaw deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class PropertyMediaDetailView(generics.DestroyAPIView):
+class PropertyMediaDetailView(PropertyNestedMixin, generics.DestroyAPIView):
     """Vista para eliminar una multimedia específica de una propiedad"""
     serializer_class = PropertyMediaSerializer
     permission_classes = [IsAdminUser]
+    nested_chain = (PROPERTY_LEVEL, ('media_id', PropertyMedia, 'property'))
 
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return PropertyMedia.objects.filter(property_id=property_id)
+        return PropertyMedia.objects.filter(property=self.get_property())
 
     def get_object(self):
-        media_id = self.kwargs.get('media_id')
-        return get_object_or_404(self.get_queryset(), pk=media_id)
+        return self.get_nested_leaf()
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
-        # Borrar primero el archivo físico y luego el registro en DB
+        # Borrar primero el archivo físico (y sus derivados) y luego el registro en DB
         if instance.url:
+            delete_derivatives(instance.url.name, instance.url.storage)
             instance.url.delete(save=False)
 
         instance.delete()
         return Response({'message': 'Media deleted successfully'}, status=status.HTTP_200_OK)
 
 
-class PropertyUploadMediaView(generics.CreateAPIView):
+class PropertyUploadMediaView(PropertyNestedMixin, generics.CreateAPIView):
     """Vista para subir archivos a una propiedad específica"""
     serializer_class = PropertyMediaUploadSerializer
     
-    def get_property(self):
-        """Obtener la propiedad a partir del ID en la URL"""
-        property_id = self.kwargs.get('property_id')
-        return get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-    
     def create(self, request, *args, **kwargs):
         """Subir archivos a la propiedad"""
         property_instance = self.get_property()
@@ -684,16 +761,76 @@ class PropertyUploadMediaView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        created_media = []
-        for file in files:
-            media = PropertyMedia.objects.create(
-                property=property_instance,
-                media_type=media_type,
-                url=file
-            )
-            created_media.append(PropertyMediaSerializer(media).data)
+        # 1) Escribir los archivos en paralelo (mismos nombres que upload_to)
+        media_list = [PropertyMedia(property=property_instance, media_type=media_type) for _ in files]
+        url_field = PropertyMedia._meta.get_field('url')
+        storage = url_field.storage
+        names = save_files(storage, [
+            (url_field.generate_filename(media, file.name), file)
+            for media, file in zip(media_list, files)
+        ])
+        for media, name in zip(media_list, names):
+            media.url = name
+        
+        # 2) Un solo INSERT; si falla se borran los archivos ya escritos
+        try:
+            with transaction.atomic():
+                PropertyMedia.objects.bulk_create(media_list)
+                invalidate_catalog()
+                # bulk_create no emite post_save: encolar los derivados aquí
+                if media_type == 'image':
+                    for name in names:
+                        enqueue_on_commit(generate_derivatives, name, storage)
+        except Exception:
+            delete_files(storage, names)
+            raise
+        
+        created_media = PropertyMediaSerializer(media_list, many=True).data
         
         return Response({
             'message': f'{len(created_media)} file(s) uploaded successfully to {property_instance.name}',
             'media': created_media
-        }, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        }, status=status.HTTP_201_CREATED)
+
+class PropertyDocumentsExportView(PropertyNestedMixin, generics.GenericAPIView):
+    """
+    GET /api/properties/{id}/documents.zip
+
+    Descarga en un solo ZIP (generado en streaming) todos los documentos de la propiedad:
+    leyes, contratos de rentas, vouchers de pagos (rentas y obligaciones) e inventario.
+    Las carpetas del ZIP siguen la estructura de upload_to e incluye MANIFEST.sha256.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get_document_names(self, property_instance):
+        """Nombres de archivo de la propiedad, sin duplicados y en orden estable"""
+        from apps.finance.models import PropertyPayment
+        from apps.rentals.models import MonthlyRental, RentalPayment
+
+        sources = [
+            PropertyLaw.objects.filter(property=property_instance).values_list('url', flat=True),
+            MonthlyRental.objects.filter(rental__property=property_instance).values_list('url_files', flat=True),
+            RentalPayment.objects.filter(rental__property=property_instance).values_list('voucher_url', flat=True),
+            PropertyPayment.objects.filter(obligation__property=property_instance).values_list('voucher_url', flat=True),
+            EnserInventory.objects.filter(property=property_instance).values_list('url_media', flat=True),
+        ]
+        names = []
+        seen = set()
+        for queryset in sources:
+            for name in queryset.order_by('pk').iterator():
+                if name and name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        return names
+
+    def get(self, request, property_id):
+        property_instance = self.get_property()
+        names = self.get_document_names(property_instance)
+
+        storage = PropertyLaw._meta.get_field('url').storage
+        # Bajo ASGI un iterador async: con uno sync Django arma el ZIP entero en memoria
+        stream = astream_storage_zip if isinstance(request._request, ASGIRequest) else stream_storage_zip
+        response = StreamingHttpResponse(stream(names, storage), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="property_{property_instance.id}_documents.zip"'
+        response['Cache-Control'] = 'private, no-store'
+        return response
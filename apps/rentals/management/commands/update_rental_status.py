@@ -1,11 +1,14 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from apps.rentals.models import Rental
+from apps.rentals.occupancy import refresh_occupancy
+from apps.core.metrics import track_job
 
 
 class Command(BaseCommand):
     help = 'Actualiza el estado de los rentals a "available" cuando su check_out ha pasado'
 
+    @track_job('update_rental_status')
     def handle(self, *args, **options):
         today = timezone.now().date()
         
@@ -26,6 +29,12 @@ class Command(BaseCommand):
                 )
             )
         
+        # Recalcular ocupación de todas las propiedades (current_rental_check_out depende de la fecha)
+        refreshed = refresh_occupancy()
+        self.stdout.write(
+            self.style.SUCCESS(f'🏠 Ocupación recalculada para {refreshed} propiedad(es)')
+        )
+        
         if updated_count == 0:
             self.stdout.write(
                 self.style.WARNING('ℹ️  No hay rentals para actualizar')
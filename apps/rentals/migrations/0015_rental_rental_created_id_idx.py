@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0021_property_active_idx_property_media_uploaded_idx'),
+        ('rentals', '0014_rental_total_amount'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['created_at', 'id'], name='rental_created_id_idx'),
+        ),
+    ]
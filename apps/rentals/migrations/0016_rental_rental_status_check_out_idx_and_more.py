@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0015_notification_notification_read_created_idx_and_more'),
+        ('properties', '0021_property_active_idx_property_media_uploaded_idx'),
+        ('rentals', '0015_rental_rental_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['status', 'check_out'], name='rental_status_check_out_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['status', 'rental_type'], name='rental_status_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rentalpayment',
+            index=models.Index(fields=['date'], name='rental_payment_date_idx'),
+        ),
+    ]
@@ -117,6 +117,13 @@ class Rental(models.Model):
         verbose_name = 'Rental'
         verbose_name_plural = 'Rentals'
         ordering = ['-check_in']
+        indexes = [
+            # check_in admite NULL: la paginación keyset ordena por (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='rental_created_id_idx'),
+            # Ocupados que terminan pronto / vencidos (dashboard, update_rental_status)
+            models.Index(fields=['status', 'check_out'], name='rental_status_check_out_idx'),
+            models.Index(fields=['status', 'rental_type'], name='rental_status_type_idx'),
+        ]
     
     def clean(self):
         """Validaciones personalizadas"""
@@ -189,6 +196,9 @@ class RentalPayment(models.Model):
         verbose_name = 'Rental Payment'
         verbose_name_plural = 'Rental Payments'
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date'], name='rental_payment_date_idx'),
+        ]
     
     def __str__(self):
         return f"Pago {self.amount} - {self.rental}"
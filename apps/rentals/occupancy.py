@@ -0,0 +1,34 @@
+"""
+Estado de ocupación desnormalizado en Property
+
+Property.occupancy_status y Property.current_rental_check_out se recalculan
+con un solo UPDATE (subconsultas sobre rental) cada vez que cambia un Rental
+y diariamente desde `update_rental_status`.
+
+- occupancy_status: 'occupied' si hay algún rental occupied, si no 'available'
+- current_rental_check_out: check_out más próximo (>= hoy) de los rentals occupied
+"""
+from django.db.models import Case, Exists, OuterRef, Subquery, Value, When
+from django.utils import timezone
+
+from apps.properties.models import Property
+from .models import Rental
+
+
+def refresh_occupancy(property_ids=None) -> int:
+    """Recalcula la ocupación de las propiedades indicadas (todas si es None)"""
+    today = timezone.now().date()
+    occupied = Rental.objects.filter(property=OuterRef('pk'), status='occupied')
+    queryset = Property.objects.all()
+    if property_ids is not None:
+        queryset = queryset.filter(pk__in=property_ids)
+    # .update() no dispara señales ni toca updated_at
+    return queryset.update(
+        occupancy_status=Case(
+            When(Exists(occupied), then=Value('occupied')),
+            default=Value('available'),
+        ),
+        current_rental_check_out=Subquery(
+            occupied.filter(check_out__gte=today).order_by('check_out').values('check_out')[:1]
+        ),
+    )
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import Tenant, Rental, RentalPayment, MonthlyRental, AirbnbRental
 from apps.properties.models import Property
+from hr_properties.media_signing import SignedMediaModelSerializer
+from hr_properties.flex_fields import FlexFieldsSerializerMixin
 
 
 class TenantSerializer(serializers.ModelSerializer):
@@ -12,7 +14,7 @@ class TenantSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class MonthlyRentalSerializer(serializers.ModelSerializer):
+class MonthlyRentalSerializer(SignedMediaModelSerializer):
     class Meta:
         model = MonthlyRental
         exclude = ['id', 'rental']
@@ -24,14 +26,14 @@ class AirbnbRentalSerializer(serializers.ModelSerializer):
         exclude = ['id', 'rental']
 
 
-class RentalPaymentSerializer(serializers.ModelSerializer):
+class RentalPaymentSerializer(SignedMediaModelSerializer):
     class Meta:
         model = RentalPayment
         fields = '__all__'
         read_only_fields = ['id']
 
 
-class RentalPaymentCreateSerializer(serializers.ModelSerializer):
+class RentalPaymentCreateSerializer(SignedMediaModelSerializer):
     """Serializer para crear pagos sin especificar rental
     
     Validación especial: Si el rental es de tipo Airbnb, 
@@ -80,7 +82,7 @@ class RentalPaymentCreateSerializer(serializers.ModelSerializer):
         return data
 
 
-class RentalSerializer(serializers.ModelSerializer):
+class RentalSerializer(FlexFieldsSerializerMixin, serializers.ModelSerializer):
     tenant_name = serializers.CharField(source='tenant.full_name', read_only=True)
     property_name = serializers.CharField(source='property.name', read_only=True)
     property_address = serializers.CharField(source='property.address', read_only=True)
@@ -91,7 +93,7 @@ class RentalSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class RentalDetailSerializer(serializers.ModelSerializer):
+class RentalDetailSerializer(FlexFieldsSerializerMixin, SignedMediaModelSerializer):
     """Serializer completo con tenant, monthly/airbnb y payments"""
     tenant = TenantSerializer(read_only=True)
     monthly_records = MonthlyRentalSerializer(many=True, read_only=True)
@@ -109,9 +111,10 @@ class RentalDetailSerializer(serializers.ModelSerializer):
             'airbnb_records', 'payments'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['tenant', 'monthly_records', 'airbnb_records', 'payments']
 
 
-class RentalCreateSerializer(serializers.ModelSerializer):
+class RentalCreateSerializer(SignedMediaModelSerializer):
     """Serializer para crear rentals con datos anidados de monthly/airbnb"""
     monthly_data = serializers.JSONField(required=False, write_only=True)
     airbnb_data = serializers.JSONField(required=False, write_only=True)
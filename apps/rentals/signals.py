@@ -1,12 +1,14 @@
 """
 Señales para la app de rentals
 
-Auto-creación de usuarios cuando se crea un Tenant
+- Auto-creación de usuarios cuando se crea un Tenant
+- Estado de ocupación de la propiedad cuando cambia un Rental
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Tenant
+from .models import Rental, Tenant
+from .occupancy import refresh_occupancy
 from apps.users.models import Role, UserRole
 
 User = get_user_model()
@@ -41,3 +43,23 @@ def create_client_user_for_tenant(sender, instance, created, **kwargs):
         print(f"✅ User creado para tenant {instance.full_name}")
         print(f"   Username: {instance.phone1}")
         print(f"   Password: {password}")
+
+
+@receiver(pre_save, sender=Rental)
+def remember_previous_property(sender, instance, raw=False, **kwargs):
+    """Guarda la propiedad anterior del rental para recalcularla si cambia"""
+    instance._previous_property_id = None
+    if instance.pk and not raw:
+        instance._previous_property_id = (
+            Rental.objects.filter(pk=instance.pk).values_list('property_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Rental)
+@receiver(post_delete, sender=Rental)
+def update_property_occupancy(sender, instance, **kwargs):
+    """Mantiene Property.occupancy_status / current_rental_check_out sincronizados"""
+    property_ids = {instance.property_id, getattr(instance, '_previous_property_id', None)}
+    property_ids.discard(None)
+    if property_ids:
+        refresh_occupancy(property_ids)
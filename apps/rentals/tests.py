@@ -1,3 +1,161 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.finance.models import PaymentMethod
+from apps.properties.nested import resolve_chain
+from apps.properties.tests import seed_properties
+from apps.users.models import Role, User, UserRole
+from hr_properties.query_plans import QueryPlanAssertionsMixin
+
+from .models import Rental, RentalPayment
+from .views import RentalPaymentDetailView
+
+
+class RentalQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """Consultas de DashboardView, RentalViewSet y update_rental_status"""
+
+    @classmethod
+    def setUpTestData(cls):
+        properties = seed_properties(10)
+        start = date(2026, 1, 1)
+        rentals = Rental.objects.bulk_create([
+            Rental(
+                property=properties[i % 10],
+                rental_type='monthly' if i % 2 else 'airbnb',
+                check_in=start + timedelta(days=i),
+                check_out=start + timedelta(days=i + 30),
+                amount=1000,
+                status='occupied' if i % 3 else 'available',
+            )
+            for i in range(60)
+        ])
+        payment_method, _ = PaymentMethod.objects.get_or_create(name='cash')
+        RentalPayment.objects.bulk_create([
+            RentalPayment(
+                rental=rental,
+                payment_method=payment_method,
+                payment_location='online',
+                date=rental.check_in,
+                amount=1000,
+            )
+            for rental in rentals
+        ])
+
+    def test_occupied_ending_soon(self):
+        queryset = Rental.objects.filter(
+            status='occupied',
+            check_out__gte=date(2026, 2, 1),
+            check_out__lte=date(2026, 2, 15),
+        )
+        self.assertNoSequentialScan(queryset, tables=['rental'])
+
+    def test_expired_occupied(self):
+        """update_rental_status: ocupados con check_out vencido"""
+        queryset = Rental.objects.filter(status='occupied', check_out__lt=date(2026, 2, 1))
+        self.assertNoSequentialScan(queryset, tables=['rental'])
+
+    def test_occupied_by_rental_type(self):
+        queryset = Rental.objects.filter(status='occupied', rental_type='monthly')
+        self.assertNoSequentialScan(queryset, tables=['rental'])
+
+    def test_rental_payments_of_month(self):
+        queryset = RentalPayment.objects.filter(date__gte=date(2026, 2, 1), date__lte=date(2026, 2, 15))
+        self.assertNoSequentialScan(queryset, tables=['rental_payment'])
+
+
+class OccupancySignalTests(TestCase):
+    """Property.occupancy_status se recalcula al crear, mover y borrar rentals"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first, cls.second = seed_properties(3)[1:3]
+
+    def rental(self, **kwargs):
+        today = timezone.now().date()
+        return Rental.objects.create(
+            property=self.first, rental_type='monthly', amount=1000, status='occupied',
+            check_in=today, check_out=today + timedelta(days=30), **kwargs,
+        )
+
+    def assertOccupancy(self, prop, status, check_out=None):
+        prop.refresh_from_db()
+        self.assertEqual(prop.occupancy_status, status)
+        self.assertEqual(prop.current_rental_check_out, check_out)
+
+    def test_create_and_delete(self):
+        rental = self.rental()
+        self.assertOccupancy(self.first, 'occupied', rental.check_out)
+        rental.delete()
+        self.assertOccupancy(self.first, 'available')
+
+    def test_status_change(self):
+        rental = self.rental()
+        rental.status = 'available'
+        rental.save()
+        self.assertOccupancy(self.first, 'available')
+
+    def test_moving_a_rental_refreshes_both_properties(self):
+        rental = self.rental()
+        rental.property = self.second
+        rental.save()
+        self.assertOccupancy(self.first, 'available')
+        self.assertOccupancy(self.second, 'occupied', rental.check_out)
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class NestedRouteTests(TestCase):
+    """/api/properties/{id}/rentals/{rental_id}/payments/{payment_id}/ valida toda la cadena"""
+
+    @classmethod
+    def setUpTestData(cls):
+        properties = seed_properties(3)
+        cls.deleted, cls.prop, cls.other = properties
+        payment_method, _ = PaymentMethod.objects.get_or_create(name='cash')
+        rentals = Rental.objects.bulk_create([
+            Rental(property=prop, rental_type='monthly', amount=1000, status='available')
+            for prop in (cls.prop, cls.other, cls.deleted)
+        ])
+        cls.rental, cls.other_rental, cls.deleted_rental = rentals
+        cls.payment, cls.other_payment, cls.deleted_payment = RentalPayment.objects.bulk_create([
+            RentalPayment(rental=rental, payment_method=payment_method, payment_location='online',
+                          date=date(2026, 1, 1), amount=1000)
+            for rental in rentals
+        ])
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, prop, rental, payment):
+        return self.client.get(f'/api/properties/{prop.id}/rentals/{rental.id}/payments/{payment.id}/')
+
+    def test_valid_chain(self):
+        response = self.get(self.prop, self.rental, self.payment)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.payment.id)
+
+    def test_mismatched_levels_are_404(self):
+        self.assertEqual(self.get(self.prop, self.rental, self.other_payment).status_code, 404)
+        self.assertEqual(self.get(self.prop, self.other_rental, self.other_payment).status_code, 404)
+        self.assertEqual(self.get(self.other, self.rental, self.payment).status_code, 404)
+
+    def test_soft_deleted_property_is_404(self):
+        self.assertEqual(self.get(self.deleted, self.deleted_rental, self.deleted_payment).status_code, 404)
+        response = self.client.get(f'/api/properties/{self.deleted.id}/rentals/{self.deleted_rental.id}/payments/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_chain_resolves_in_one_query(self):
+        chain = RentalPaymentDetailView.nested_chain
+        kwargs = {'property_id': self.prop.id, 'rental_id': self.rental.id, 'payment_id': self.payment.id}
+        with self.assertNumQueries(1):
+            resolved = resolve_chain(chain, kwargs)
+            self.assertEqual(resolved['property_id'], self.prop)
+            self.assertEqual(resolved['rental_id'], self.rental)
+        with self.assertRaises(Http404):
+            resolve_chain(chain, {**kwargs, 'rental_id': 'x'})
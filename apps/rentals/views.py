@@ -10,8 +10,11 @@ from django.utils import timezone
 from decimal import Decimal
 
 from apps.users.permissions import IsAdminUser, IsAdminOrReadOnlyClient
+from hr_properties.fast_serializers import FastListMixin
+from hr_properties.flex_fields import FlexFieldsViewMixin
 from .models import Tenant, Rental, RentalPayment, MonthlyRental, AirbnbRental
 from apps.properties.models import Property
+from apps.properties.nested import PROPERTY_LEVEL, PropertyNestedMixin
 from .serializers import (
     TenantSerializer, RentalSerializer, RentalDetailSerializer, 
     RentalCreateSerializer, RentalPaymentSerializer, RentalPaymentCreateSerializer,
@@ -25,7 +28,7 @@ class TenantViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]  # Solo admins pueden gestionar tenants
 
 
-class RentalViewSet(viewsets.ModelViewSet):
+class RentalViewSet(FlexFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet para consultar rentals con filtros avanzados
     
@@ -47,9 +50,11 @@ class RentalViewSet(viewsets.ModelViewSet):
     - GET /api/rentals/?status=occupied&rental_type=monthly
     - GET /api/rentals/?ending_in_days=15
     - GET /api/rentals/ending_soon/
+    - GET /api/rentals/{id}/?fields=id,status,payments - Solo esos campos (ver hr_properties/flex_fields.py)
     """
     queryset = Rental.objects.all()
     permission_classes = [IsAdminOrReadOnlyClient]
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
 
     @staticmethod
     def _calculate_payment_status(rental, total_paid, expected_total):
@@ -117,12 +122,12 @@ class RentalViewSet(viewsets.ModelViewSet):
             installments_paid_equivalent = total_paid / monthly_amount
         return {
             'today': today.isoformat(),
-            'monthly_amount': float(monthly_amount),
+            'monthly_amount': monthly_amount,
             'contract_months': contract_months,
             'installments_due': installments_due,
-            'installments_paid_equivalent': float(installments_paid_equivalent),
-            'expected_to_date': float(expected_to_date),
-            'overdue_amount': float(overdue_amount),
+            'installments_paid_equivalent': installments_paid_equivalent,
+            'expected_to_date': expected_to_date,
+            'overdue_amount': overdue_amount,
             'is_up_to_date': is_up_to_date,
             'status_label': status_label,
         }
@@ -174,6 +179,11 @@ class RentalViewSet(viewsets.ModelViewSet):
             except ValueError:
                 pass  # Ignorar si no es un número válido
         
+        # Relaciones del serializer (las no pedidas con ?fields=/?expand= se podan)
+        queryset = queryset.select_related('tenant', 'property')
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('monthly_records', 'airbnb_records', 'payments')
+        
         return queryset
     
     @action(detail=False, methods=['get'])
@@ -308,9 +318,9 @@ class RentalViewSet(viewsets.ModelViewSet):
         
         return Response({
             'count': payments.count(),
-            'total_paid': float(total_paid),
-            'expected_total': float(expected_total),
-            'pending': float(pending),
+            'total_paid': total_paid,
+            'expected_total': expected_total,
+            'pending': pending,
             'is_fully_paid': is_fully_paid,
             'payment_status': payment_status,
             'rental': rental_serializer.data,
@@ -358,15 +368,10 @@ class RentalViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class PropertyAddRentalView(generics.CreateAPIView):
+class PropertyAddRentalView(PropertyNestedMixin, generics.CreateAPIView):
     """Vista para crear un rental asociado a una propiedad específica"""
     serializer_class = RentalCreateSerializer
     
-    def get_property(self):
-        """Obtener la propiedad a partir del ID en la URL"""
-        property_id = self.kwargs.get('property_id')
-        return get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-    
     def create(self, request, *args, **kwargs):
         """Crear un rental asociado a la propiedad"""
         property_instance = self.get_property()
@@ -406,30 +411,28 @@ class PropertyAddRentalView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PropertyRentalsListView(generics.ListAPIView):
-    """Vista para listar todos los rentals de una propiedad"""
+class PropertyRentalsListView(PropertyNestedMixin, FlexFieldsViewMixin, generics.ListAPIView):
+    """Vista para listar todos los rentals de una propiedad (acepta ?fields= / ?expand=)"""
     serializer_class = RentalDetailSerializer
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return Rental.objects.filter(property_id=property_id)
+        # Valida que la propiedad exista y no esté eliminada
+        return Rental.objects.filter(property=self.get_property()).select_related('tenant', 'property').prefetch_related(
+            'monthly_records', 'airbnb_records', 'payments'
+        )
 
 
-class PropertyRentalDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PropertyRentalDetailView(PropertyNestedMixin, generics.RetrieveUpdateDestroyAPIView):
     """Vista para ver, editar o eliminar un rental específico de una propiedad"""
     serializer_class = RentalDetailSerializer
+    nested_chain = (PROPERTY_LEVEL, ('rental_id', Rental, 'property'))
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return Rental.objects.filter(property_id=property_id)
+        return Rental.objects.filter(property=self.get_property())
     
     def get_object(self):
-        rental_id = self.kwargs.get('rental_id')
-        return get_object_or_404(self.get_queryset(), pk=rental_id)
+        # Propiedad (no eliminada) + rental en una sola consulta
+        return self.get_nested_leaf()
     
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -460,13 +463,13 @@ class PropertyRentalDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Response({'message': 'Rental deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class RentalRemoveDocumentView(APIView):
+class RentalRemoveDocumentView(PropertyNestedMixin, APIView):
     """Eliminar solo el documento de contrato de un rental mensual"""
     permission_classes = [IsAdminUser]
+    nested_chain = (PROPERTY_LEVEL, ('rental_id', Rental, 'property'))
 
     def post(self, request, property_id, rental_id):
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        rental = get_object_or_404(Rental, pk=rental_id, property_id=property_id)
+        rental = self.get_nested_leaf()
 
         if rental.rental_type != 'monthly':
             return Response({
@@ -494,7 +497,7 @@ class RentalRemoveDocumentView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class RentalAddPaymentView(generics.CreateAPIView):
+class RentalAddPaymentView(PropertyNestedMixin, generics.CreateAPIView):
     """
     Vista para añadir un pago a un rental específico
     
@@ -502,13 +505,11 @@ class RentalAddPaymentView(generics.CreateAPIView):
     """
     serializer_class = RentalPaymentCreateSerializer
     permission_classes = [IsAdminUser]  # Solo admins pueden crear pagos
+    nested_chain = (PROPERTY_LEVEL, ('rental_id', Rental, 'property'))
     
     def get_rental(self):
-        property_id = self.kwargs.get('property_id')
-        rental_id = self.kwargs.get('rental_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return get_object_or_404(Rental, pk=rental_id, property_id=property_id)
+        # Propiedad (no eliminada) + rental en una sola consulta
+        return self.get_nested_leaf()
     
     def create(self, request, *args, **kwargs):
         rental_instance = self.get_rental()
@@ -561,7 +562,7 @@ class RentalAddPaymentView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RentalPaymentsListView(generics.ListAPIView):
+class RentalPaymentsListView(PropertyNestedMixin, FastListMixin, generics.ListAPIView):
     """
     Vista para listar todos los pagos de un rental
     
@@ -570,16 +571,15 @@ class RentalPaymentsListView(generics.ListAPIView):
     """
     serializer_class = RentalPaymentSerializer
     permission_classes = [IsAdminOrReadOnlyClient]  # Lectura para clientes y admins
+    nested_chain = (PROPERTY_LEVEL, ('rental_id', Rental, 'property'))
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        rental_id = self.kwargs.get('rental_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return RentalPayment.objects.filter(rental_id=rental_id, rental__property_id=property_id)
+        # Valida propiedad (no eliminada) + rental con una consulta
+        return RentalPayment.objects.filter(rental=self.get_nested('rental_id'))
 
 
-class RentalPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RentalPaymentDetailView(PropertyNestedMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista para ver, editar o eliminar un pago específico de un rental
     
@@ -587,17 +587,14 @@ class RentalPaymentDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = RentalPaymentSerializer
     permission_classes = [IsAdminUser]  # Solo admins pueden editar/eliminar pagos
+    nested_chain = (PROPERTY_LEVEL, ('rental_id', Rental, 'property'), ('payment_id', RentalPayment, 'rental'))
     
     def get_queryset(self):
-        property_id = self.kwargs.get('property_id')
-        rental_id = self.kwargs.get('rental_id')
-        # Validar que la propiedad exista y no esté eliminada
-        get_object_or_404(Property, pk=property_id, is_deleted__isnull=True)
-        return RentalPayment.objects.filter(rental_id=rental_id, rental__property_id=property_id)
+        return RentalPayment.objects.filter(rental=self.get_nested('rental_id'))
     
     def get_object(self):
-        payment_id = self.kwargs.get('payment_id')
-        return get_object_or_404(self.get_queryset(), pk=payment_id)
+        # Propiedad (no eliminada) + rental + pago en una sola consulta
+        return self.get_nested_leaf()
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -625,6 +622,7 @@ class RentalsDashboardStatsView(APIView):
         }
     }
     """
+    read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
     
     def get(self, request):
         # Fecha límite para "ending soon" (próximos 30 días)
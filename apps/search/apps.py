@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'apps.search'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        import apps.search.signals  # Registrar señales
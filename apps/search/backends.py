@@ -0,0 +1,91 @@
+"""
+Consultas de búsqueda por motor de base de datos
+
+- PostgreSQL: prefijos sobre el tsvector (GIN) + similitud de trigramas
+  (pg_trgm, GIN) para errores de tipeo y coincidencias parciales
+- SQLite: FTS5 con prefijos, ordenado por bm25
+- Otros motores: icontains (sin índice)
+
+Todas devuelven SearchDocument con el atributo `rank` (mayor = más relevante).
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import SearchDocument
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+MAX_TOKENS = 8
+
+
+def query_tokens(query: str) -> list:
+    """Palabras de la búsqueda (sin operadores ni comillas)"""
+    return TOKEN_PATTERN.findall(query.lower())[:MAX_TOKENS]
+
+
+def _postgres_search(query, tokens, entity_types, limit):
+    tsquery = ' & '.join(f'{token}:*' for token in tokens)
+    params = [query, tsquery, query]
+    where_types = ''
+    if entity_types:
+        where_types = 'AND entity_type = ANY(%s)'
+        params.append(entity_types)
+    params.append(limit)
+    sql = f"""
+        SELECT id, entity_type, object_id, title, subtitle, body, updated_at,
+               ts_rank_cd(search_vector, q) * 2
+               + word_similarity(%s, title || ' ' || subtitle || ' ' || body) AS rank
+        FROM search_document, to_tsquery('simple', %s) q
+        WHERE (search_vector @@ q OR %s <%% (title || ' ' || subtitle || ' ' || body))
+        {where_types}
+        ORDER BY rank DESC
+        LIMIT %s
+    """
+    return list(SearchDocument.objects.raw(sql, params))
+
+
+def _sqlite_search(tokens, entity_types, limit):
+    match = ' '.join(f'"{token}"*' for token in tokens)
+    where_types = ''
+    params = [match]
+    if entity_types:
+        where_types = f"AND d.entity_type IN ({', '.join(['%s'] * len(entity_types))})"
+        params.extend(entity_types)
+    params.append(limit)
+    sql = f"""
+        SELECT d.id, d.entity_type, d.object_id, d.title, d.subtitle, d.body, d.updated_at,
+               -bm25(search_document_fts, 10.0, 5.0, 1.0) AS rank
+        FROM search_document_fts
+        JOIN search_document d ON d.id = search_document_fts.rowid
+        WHERE search_document_fts MATCH %s
+        {where_types}
+        ORDER BY rank DESC
+        LIMIT %s
+    """
+    return list(SearchDocument.objects.raw(sql, params))
+
+
+def _fallback_search(tokens, entity_types, limit):
+    queryset = SearchDocument.objects.all()
+    for token in tokens:
+        queryset = queryset.filter(Q(title__icontains=token) | Q(subtitle__icontains=token) | Q(body__icontains=token))
+    if entity_types:
+        queryset = queryset.filter(entity_type__in=entity_types)
+    results = list(queryset.order_by('title')[:limit])
+    for document in results:
+        document.rank = 1.0 if all(token in document.title.lower() for token in tokens) else 0.5
+    results.sort(key=lambda document: -document.rank)
+    return results
+
+
+def search_documents(query: str, entity_types=None, limit: int = 50) -> list:
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    entity_types = list(entity_types or [])
+    if connection.vendor == 'postgresql':
+        return _postgres_search(' '.join(tokens), tokens, entity_types, limit)
+    if connection.vendor == 'sqlite':
+        return _sqlite_search(tokens, entity_types, limit)
+    return _fallback_search(tokens, entity_types, limit)
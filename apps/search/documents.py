@@ -0,0 +1,117 @@
+"""
+Construcción de documentos de búsqueda por tipo de entidad
+
+Cada tipo define su queryset (con select_related para no hacer consultas
+extra) y cómo convertir una instancia en (title, subtitle, body).
+"""
+from apps.finance.models import Obligation
+from apps.properties.models import Property
+from apps.rentals.models import Tenant
+from apps.vehicles.models import Vehicle
+
+from .models import SearchDocument
+
+
+def _join(*values):
+    return ' '.join(str(value) for value in values if value)
+
+
+def property_document(prop):
+    return (
+        prop.name,
+        _join(prop.address, prop.city, prop.state),
+        _join(prop.address, prop.city, prop.state, prop.zip_code, prop.use, prop.rental_type, prop.type_building),
+    )
+
+
+def tenant_document(tenant):
+    return (
+        tenant.full_name,
+        _join(tenant.phone1, tenant.email),
+        _join(tenant.phone1, tenant.phone2, tenant.email, tenant.observations),
+    )
+
+
+def obligation_document(obligation):
+    return (
+        obligation.entity_name,
+        _join(obligation.property.name, obligation.due_date),
+        _join(obligation.property.name, obligation.obligation_type.name, obligation.temporality, obligation.amount),
+    )
+
+
+def vehicle_document(vehicle):
+    return (
+        _join(vehicle.brand, vehicle.model, vehicle.license_plate),
+        _join(vehicle.driver, vehicle.vin_number),
+        _join(vehicle.license_plate, vehicle.vin_number, vehicle.driver, vehicle.type),
+    )
+
+
+# entity_type → (modelo, función que arma el queryset indexable, builder)
+ENTITY_TYPES = {
+    'property': (Property, lambda: Property.objects.filter(is_deleted__isnull=True), property_document),
+    'tenant': (Tenant, lambda: Tenant.objects.all(), tenant_document),
+    'obligation': (
+        Obligation,
+        lambda: Obligation.objects.filter(property__is_deleted__isnull=True).select_related('property', 'obligation_type'),
+        obligation_document,
+    ),
+    'vehicle': (Vehicle, lambda: Vehicle.objects.all(), vehicle_document),
+}
+
+MODEL_ENTITY_TYPES = {model: entity_type for entity_type, (model, _, _) in ENTITY_TYPES.items()}
+
+
+def build_document(entity_type, instance):
+    _, _, builder = ENTITY_TYPES[entity_type]
+    title, subtitle, body = builder(instance)
+    return SearchDocument(
+        entity_type=entity_type,
+        object_id=instance.pk,
+        title=title[:255],
+        subtitle=subtitle[:255],
+        body=body,
+    )
+
+
+def index_object(entity_type, object_id):
+    """Crea/actualiza (o borra si ya no es indexable) el documento de una entidad"""
+    _, queryset, _ = ENTITY_TYPES[entity_type]
+    instance = queryset().filter(pk=object_id).first()
+    if instance is None:
+        remove_object(entity_type, object_id)
+        return None
+    document = build_document(entity_type, instance)
+    SearchDocument.objects.update_or_create(
+        entity_type=entity_type,
+        object_id=object_id,
+        defaults={'title': document.title, 'subtitle': document.subtitle, 'body': document.body},
+    )
+    return document
+
+
+def index_objects(entity_type, **filters):
+    """
+    Reindexa en lote las entidades que cumplen `filters` (p. ej. las
+    obligaciones de una propiedad): una lectura, un upsert y un DELETE de
+    los documentos que ya no son indexables
+    """
+    model, queryset, _ = ENTITY_TYPES[entity_type]
+    documents = [build_document(entity_type, instance) for instance in queryset().filter(**filters)]
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['entity_type', 'object_id'],
+            update_fields=['title', 'subtitle', 'body', 'updated_at'],
+        )
+    SearchDocument.objects.filter(
+        entity_type=entity_type,
+        object_id__in=model._default_manager.filter(**filters).values('pk'),
+    ).exclude(object_id__in=[document.object_id for document in documents]).delete()
+    return len(documents)
+
+
+def remove_object(entity_type, object_id):
+    SearchDocument.objects.filter(entity_type=entity_type, object_id=object_id).delete()
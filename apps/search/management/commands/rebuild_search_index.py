@@ -0,0 +1,57 @@
+"""
+Reconstruye por completo la tabla search_document.
+
+USO:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --type tenant
+
+Normalmente no hace falta: las señales mantienen el índice al día. Sirve
+después de cargas masivas (bulk_create / update no disparan señales).
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.search.documents import ENTITY_TYPES, build_document
+from apps.search.models import SearchDocument
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda (search_document)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            choices=list(ENTITY_TYPES),
+            action='append',
+            help='Solo reconstruir estos tipos (se puede repetir)'
+        )
+
+    def handle(self, *args, **options):
+        entity_types = options['type'] or list(ENTITY_TYPES)
+
+        with transaction.atomic():
+            for entity_type in entity_types:
+                _, queryset, _ = ENTITY_TYPES[entity_type]
+                SearchDocument.objects.filter(entity_type=entity_type).delete()
+
+                batch, total = [], 0
+                for instance in queryset().iterator(chunk_size=BATCH_SIZE):
+                    batch.append(build_document(entity_type, instance))
+                    if len(batch) >= BATCH_SIZE:
+                        SearchDocument.objects.bulk_create(batch)
+                        total += len(batch)
+                        batch = []
+                if batch:
+                    SearchDocument.objects.bulk_create(batch)
+                    total += len(batch)
+
+                self.stdout.write(self.style.SUCCESS(f'✓ {entity_type}: {total} documento(s)'))
+
+            if connection.vendor == 'sqlite':
+                # Re-sincronizar la tabla FTS5 con search_document
+                with connection.cursor() as cursor:
+                    cursor.execute("INSERT INTO search_document_fts(search_document_fts) VALUES ('rebuild')")
+
+        self.stdout.write(self.style.SUCCESS('\n✅ Índice de búsqueda reconstruido'))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('entity_type', models.CharField(choices=[('property', 'Property'), ('tenant', 'Tenant'), ('obligation', 'Obligation'), ('vehicle', 'Vehicle')], max_length=20, verbose_name='Entity Type')),
+                ('object_id', models.IntegerField(verbose_name='Object ID')),
+                ('title', models.CharField(max_length=255, verbose_name='Title')),
+                ('subtitle', models.CharField(blank=True, max_length=255, verbose_name='Subtitle')),
+                ('body', models.TextField(blank=True, verbose_name='Searchable Text')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'db_table': 'search_document',
+                'unique_together': {('entity_type', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,145 @@
+# Índices de texto completo específicos de cada motor
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE search_document ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(subtitle, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX search_document_vector_idx ON search_document USING GIN (search_vector)",
+    """
+    CREATE INDEX search_document_trgm_idx ON search_document
+    USING GIN ((title || ' ' || subtitle || ' ' || body) gin_trgm_ops)
+    """,
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS search_document_trgm_idx",
+    "DROP INDEX IF EXISTS search_document_vector_idx",
+    "ALTER TABLE search_document DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE search_document_fts USING fts5(
+        title, subtitle, body,
+        content='search_document', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER search_document_ai AFTER INSERT ON search_document BEGIN
+        INSERT INTO search_document_fts(rowid, title, subtitle, body)
+        VALUES (new.id, new.title, new.subtitle, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_ad AFTER DELETE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, title, subtitle, body)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_document_au AFTER UPDATE ON search_document BEGIN
+        INSERT INTO search_document_fts(search_document_fts, rowid, title, subtitle, body)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.body);
+        INSERT INTO search_document_fts(rowid, title, subtitle, body)
+        VALUES (new.id, new.title, new.subtitle, new.body);
+    END
+    """,
+    "INSERT INTO search_document_fts(search_document_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS search_document_au",
+    "DROP TRIGGER IF EXISTS search_document_ad",
+    "DROP TRIGGER IF EXISTS search_document_ai",
+    "DROP TABLE IF EXISTS search_document_fts",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_indexes(apps, schema_editor):
+    """PostgreSQL: tsvector + GIN + pg_trgm | SQLite: FTS5 | otros motores: sin índice (icontains)"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+def populate_search_documents(apps, schema_editor):
+    """Indexar las entidades existentes"""
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    Property = apps.get_model('properties', 'Property')
+    Tenant = apps.get_model('rentals', 'Tenant')
+    Obligation = apps.get_model('finance', 'Obligation')
+    Vehicle = apps.get_model('vehicles', 'Vehicle')
+
+    def join(*values):
+        return ' '.join(str(value) for value in values if value)
+
+    documents = []
+    for prop in Property.objects.filter(is_deleted__isnull=True).iterator():
+        documents.append(SearchDocument(
+            entity_type='property', object_id=prop.id, title=prop.name[:255],
+            subtitle=join(prop.address, prop.city, prop.state)[:255],
+            body=join(prop.address, prop.city, prop.state, prop.zip_code, prop.use, prop.rental_type, prop.type_building),
+        ))
+    for tenant in Tenant.objects.iterator():
+        # Mismo título que Tenant.full_name (el modelo histórico no tiene la propiedad)
+        documents.append(SearchDocument(
+            entity_type='tenant', object_id=tenant.id, title=f'{tenant.name} {tenant.lastname}'[:255],
+            subtitle=join(tenant.phone1, tenant.email)[:255],
+            body=join(tenant.phone1, tenant.phone2, tenant.email, tenant.observations),
+        ))
+    obligations = Obligation.objects.filter(property__is_deleted__isnull=True).select_related('property', 'obligation_type')
+    for obligation in obligations.iterator():
+        documents.append(SearchDocument(
+            entity_type='obligation', object_id=obligation.id, title=obligation.entity_name[:255],
+            subtitle=join(obligation.property.name, obligation.due_date)[:255],
+            body=join(obligation.property.name, obligation.obligation_type.name, obligation.temporality, obligation.amount),
+        ))
+    for vehicle in Vehicle.objects.iterator():
+        documents.append(SearchDocument(
+            entity_type='vehicle', object_id=vehicle.id,
+            title=join(vehicle.brand, vehicle.model, vehicle.license_plate)[:255],
+            subtitle=join(vehicle.driver, vehicle.vin_number)[:255],
+            body=join(vehicle.license_plate, vehicle.vin_number, vehicle.driver, vehicle.type),
+        ))
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('properties', '0020_property_occupancy_status'),
+        ('rentals', '0014_rental_total_amount'),
+        ('finance', '0014_alter_paymentmethod_name'),
+        ('vehicles', '0004_alter_obligationvehicle_temporality_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+    ]
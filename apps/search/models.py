@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Documento de búsqueda desnormalizado (una fila por entidad indexada)
+
+    Se mantiene con señales (ver signals.py) y se consulta con el índice
+    propio de cada motor (ver backends.py):
+    - PostgreSQL: columna generada tsvector + GIN, y GIN pg_trgm para coincidencias parciales
+    - SQLite: tabla virtual FTS5 (search_document_fts) sincronizada con triggers
+    """
+    ENTITY_TYPE_CHOICES = [
+        ('property', 'Property'),
+        ('tenant', 'Tenant'),
+        ('obligation', 'Obligation'),
+        ('vehicle', 'Vehicle'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPE_CHOICES, verbose_name='Entity Type')
+    object_id = models.IntegerField(verbose_name='Object ID')
+    title = models.CharField(max_length=255, verbose_name='Title')
+    subtitle = models.CharField(max_length=255, blank=True, verbose_name='Subtitle')
+    body = models.TextField(blank=True, verbose_name='Searchable Text')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_document'
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+        unique_together = ('entity_type', 'object_id')
+
+    def __str__(self):
+        return f"{self.entity_type} #{self.object_id} - {self.title}"
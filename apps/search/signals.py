@@ -0,0 +1,47 @@
+"""
+Señales para la app de search
+
+Mantiene search_document al día: cada save/delete de Property, Tenant,
+Obligation o Vehicle reindexa (o borra) el documento de esa entidad. Las
+obligaciones de una propiedad se reindexan (en lote) solo si cambió el nombre
+de la propiedad o su soft delete, que son lo que sus documentos usan.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.properties.models import Property
+
+from .documents import MODEL_ENTITY_TYPES, index_object, index_objects, remove_object
+
+# Campos de Property que forman parte de los documentos de sus obligaciones
+OBLIGATION_PROPERTY_FIELDS = ('name', 'is_deleted')
+
+
+def remember_property_changes(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Marca si el save cambia algún campo que usan las obligaciones de la propiedad"""
+    instance._reindex_obligations = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(OBLIGATION_PROPERTY_FIELDS):
+        return
+    previous = Property.objects.filter(pk=instance.pk).values(*OBLIGATION_PROPERTY_FIELDS).first()
+    instance._reindex_obligations = previous is not None and (
+        previous['name'] != instance.name
+        or (previous['is_deleted'] is None) != (instance.is_deleted is None)
+    )
+
+
+def update_search_document(sender, instance, **kwargs):
+    entity_type = MODEL_ENTITY_TYPES[sender]
+    index_object(entity_type, instance.pk)
+    if getattr(instance, '_reindex_obligations', False):
+        index_objects('obligation', property_id=instance.pk)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    remove_object(MODEL_ENTITY_TYPES[sender], instance.pk)
+
+
+pre_save.connect(remember_property_changes, sender=Property, dispatch_uid='search_property_changes')
+for model in MODEL_ENTITY_TYPES:
+    post_save.connect(update_search_document, sender=model, dispatch_uid=f'search_save_{model._meta.label}')
+    post_delete.connect(delete_search_document, sender=model, dispatch_uid=f'search_delete_{model._meta.label}')
@@ -0,0 +1,136 @@
+from contextlib import redirect_stdout
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.finance.tests import seed_obligations
+from apps.properties.tests import seed_properties
+from apps.rentals.models import Tenant
+from apps.users.models import Role, User, UserRole
+
+from .documents import ENTITY_TYPES, build_document
+from .models import SearchDocument
+
+search_indexes = import_module('apps.search.migrations.0002_search_indexes')
+
+
+def create_tenant(name, lastname, phone1, **kwargs):
+    # La señal de Tenant imprime las credenciales del usuario que crea
+    with redirect_stdout(StringIO()):
+        return Tenant.objects.create(name=name, lastname=lastname, phone1=phone1, **kwargs)
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class SearchTests(TestCase):
+    """Búsqueda con FTS5 (SQLite) sobre los documentos que mantienen las señales"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # seed_properties usa bulk_create (sin señales): se indexa con el comando
+        cls.properties = seed_properties(3)
+        call_command('rebuild_search_index', stdout=StringIO())
+        cls.tenant = create_tenant('Mariana', 'Quintero', '3001112233', email='mariana@example.com')
+        create_tenant('Pedro', '', '3004445566')
+        cls.admin = User.objects.create(username='admin', email='admin@example.com')
+        UserRole.objects.create(user=cls.admin, role=Role.objects.get_or_create(name=Role.ADMIN)[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, **params):
+        return self.client.get('/api/search/', params)
+
+    def test_prefix_match_grouped_by_type(self):
+        response = self.search(q='quint')
+        self.assertEqual(response.status_code, 200)
+        tenants = response.data['results']['tenant']
+        self.assertEqual([hit['id'] for hit in tenants], [self.tenant.id])
+        self.assertEqual(tenants[0]['title'], 'Mariana Quintero')
+        self.assertEqual(response.data['results']['property'], [])
+
+    def test_types_filter_and_validation(self):
+        self.assertEqual(list(self.search(q='mariana', types='vehicle').data['results']), ['vehicle'])
+        self.assertEqual(self.search(q='mariana', types='nope').status_code, 400)
+        self.assertEqual(self.search(q='').status_code, 400)
+
+    def test_signals_keep_the_index_current(self):
+        self.tenant.lastname = 'Zapata'
+        self.tenant.save()
+        self.assertEqual(self.search(q='quintero').data['count'], 0)
+        self.assertEqual(self.search(q='zapata').data['count'], 1)
+        self.tenant.delete()
+        self.assertEqual(self.search(q='zapata').data['count'], 0)
+
+    def test_soft_deleted_properties_are_not_indexed(self):
+        self.assertFalse(SearchDocument.objects.filter(entity_type='property', object_id=self.properties[0].id).exists())
+        prop = self.properties[1]
+        self.assertEqual([hit['id'] for hit in self.search(q=prop.name).data['results']['property']][:1], [prop.id])
+        prop.is_deleted = prop.created_at
+        prop.save()
+        self.assertFalse(SearchDocument.objects.filter(entity_type='property', object_id=prop.id).exists())
+
+    def test_admin_only(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.search(q='mariana').status_code, 401)
+
+    def test_migration_backfill_matches_runtime_documents(self):
+        def documents():
+            return sorted(SearchDocument.objects.values_list('entity_type', 'object_id', 'title', 'subtitle', 'body'))
+
+        runtime = documents()
+        self.assertEqual(runtime, sorted(
+            (entity_type, instance.pk, doc.title, doc.subtitle, doc.body)
+            for entity_type, (_, queryset, _) in ENTITY_TYPES.items()
+            for instance in queryset()
+            for doc in [build_document(entity_type, instance)]
+        ))
+        SearchDocument.objects.all().delete()
+        search_indexes.populate_search_documents(apps, None)
+        self.assertEqual(documents(), runtime)
+
+
+class PropertyObligationIndexTests(TestCase):
+    """Los documentos de las obligaciones siguen al nombre y soft delete de su propiedad"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.prop = seed_properties(2)[1]
+        seed_obligations([cls.prop], count=5)
+        call_command('rebuild_search_index', stdout=StringIO())
+
+    def obligation_documents(self):
+        return SearchDocument.objects.filter(entity_type='obligation')
+
+    def save_queries(self, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            self.prop.save(**kwargs)
+        return [query['sql'] for query in queries]
+
+    def test_unrelated_saves_do_not_touch_obligations(self):
+        self.prop.city = 'Palmira'
+        self.assertFalse([sql for sql in self.save_queries() if 'obligation' in sql])
+        self.prop.image_url = 'property_1/image.jpg'
+        queries = self.save_queries(update_fields=['image_url', 'updated_at'])
+        # Ni la lectura previa de name/is_deleted
+        self.assertFalse([sql for sql in queries if 'obligation' in sql or sql.startswith('SELECT "property"."name"')])
+
+    def test_rename_reindexes_obligations_in_one_batch(self):
+        self.prop.name = 'Casa Nueva'
+        queries = [sql for sql in self.save_queries() if 'obligation' in sql]
+        self.assertEqual(len(queries), 3)  # lectura, upsert, limpieza
+        self.assertEqual(self.obligation_documents().count(), 5)
+        for document in self.obligation_documents():
+            self.assertTrue(document.subtitle.startswith('Casa Nueva'))
+
+    def test_soft_delete_and_restore(self):
+        self.prop.soft_delete()
+        self.assertFalse(self.obligation_documents().exists())
+        self.prop.restore()
+        self.assertEqual(self.obligation_documents().count(), 5)
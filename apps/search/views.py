@@ -0,0 +1,71 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.users.permissions import IsAdminUser
+
+from .backends import search_documents
+from .models import SearchDocument
+
+ENTITY_TYPES = [choice for choice, _ in SearchDocument.ENTITY_TYPE_CHOICES]
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class SearchView(APIView):
+    """
+    Búsqueda unificada (solo admins)
+
+    GET /api/search/?q=<texto>
+    GET /api/search/?q=<texto>&types=tenant,vehicle&limit=20
+
+    Busca en propiedades (nombre, dirección), inquilinos (nombre, teléfono, email),
+    obligaciones (entidad, propiedad) y vehículos (placa, VIN, marca, conductor).
+    Resultados ordenados por relevancia y agrupados por tipo:
+
+    {
+        "query": "toyota",
+        "count": 2,
+        "results": {
+            "vehicle": [{"id": 3, "title": "...", "subtitle": "...", "rank": 0.61}],
+            "property": [],
+            ...
+        }
+    }
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        types = [t.strip() for t in request.query_params.get('types', '').split(',') if t.strip()]
+        invalid = [t for t in types if t not in ENTITY_TYPES]
+        if invalid:
+            return Response(
+                {'error': f'Invalid types: {", ".join(invalid)}. Valid: {", ".join(ENTITY_TYPES)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        documents = search_documents(query, types, limit)
+
+        grouped = {entity_type: [] for entity_type in (types or ENTITY_TYPES)}
+        for document in documents:
+            grouped[document.entity_type].append({
+                'id': document.object_id,
+                'title': document.title,
+                'subtitle': document.subtitle,
+                'rank': round(float(document.rank), 6),
+            })
+
+        return Response({
+            'query': query,
+            'count': len(documents),
+            'results': grouped,
+        })
@@ -0,0 +1,66 @@
+"""
+Borra los refresh tokens expirados de la blacklist de JWT
+(token_blacklist_outstandingtoken y token_blacklist_blacklistedtoken)
+
+Con la rotación de refresh tokens cada refresh agrega una fila a cada tabla.
+Un token expirado ya no pasa la validación de `exp`, así que sus filas
+sobran. Se borran en lotes de --batch-size, cada lote en su propia
+transacción, para no bloquear las tablas que usa el refresh.
+
+USO:
+    python manage.py compact_jwt_blacklist
+    python manage.py compact_jwt_blacklist --batch-size 500 --max-batches 20
+
+PROGRAMACIÓN AUTOMÁTICA (Linux Cron):
+    30 3 * * * cd /ruta/al/proyecto && /ruta/al/venv/bin/python manage.py compact_jwt_blacklist
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from apps.core.metrics import track_job
+
+
+class Command(BaseCommand):
+    help = 'Borra en lotes los refresh tokens expirados (outstanding y blacklisted)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Tokens por lote (default: 1000)')
+        parser.add_argument('--max-batches', type=int, default=0,
+                            help='Máximo de lotes por ejecución; 0 = hasta terminar (default: 0)')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Segundos de espera entre lotes (default: 0)')
+
+    @track_job('compact_jwt_blacklist')
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        max_batches = options['max_batches']
+        now = aware_utcnow()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk')
+
+        batches = outstanding_deleted = blacklisted_deleted = 0
+        while not max_batches or batches < max_batches:
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                blacklisted_deleted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                outstanding_deleted += OutstandingToken.objects.filter(pk__in=ids).delete()[0]
+            batches += 1
+            self.stdout.write(f'🧹 Lote {batches}: {len(ids)} token(s) expirados')
+            if options['pause'] and len(ids) == batch_size:
+                time.sleep(options['pause'])
+
+        if outstanding_deleted == 0:
+            self.stdout.write(self.style.WARNING('ℹ️  No hay tokens expirados para borrar'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ {outstanding_deleted} token(s) emitidos y {blacklisted_deleted} en blacklist '
+            f'borrados en {batches} lote(s)'
+        ))
+        if expired.exists():
+            self.stdout.write(self.style.WARNING('⚠️  Quedan tokens expirados: se borran en la próxima ejecución'))
@@ -158,7 +158,7 @@ class IsAdminOrPublicReadOnly(permissions.BasePermission):
    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
    def available(self, request):
        # Cualquiera puede ver propiedades disponibles
-       properties = Property.objects.filter(rentals__status='available')
+       properties = Property.objects.filter(occupancy_status='available')
        ...
 
 ═══════════════════════════════════════════════════════════════════════
@@ -1,3 +1,85 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.users.models import User
+from apps.users.tokens import CachedRefreshToken
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'tokens': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tokens'},
+})
+class JWTBlacklistTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='cliente', email='cliente@example.com')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def refresh(self, token):
+        return self.client.post('/api/users/refresh/', {'refresh': token}, format='json')
+
+    def test_rotated_token_cannot_be_reused(self):
+        token = str(CachedRefreshToken.for_user(self.user))
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(OutstandingToken.objects.filter(jti=CachedRefreshToken(response.data['refresh']).jti).exists())
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh(response.data['refresh']).status_code, 200)
+
+    def test_logout_blacklists_in_cache_immediately(self):
+        token = str(CachedRefreshToken.for_user(self.user))
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/users/logout/', {'refresh': token}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Rechazado desde el cache, sin consultar la base
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            CachedRefreshToken(token)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_repeated_logout_succeeds(self):
+        token = str(CachedRefreshToken.for_user(self.user))
+        rotated = str(CachedRefreshToken.for_user(self.user))
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+        self.client.force_authenticate(self.user)
+
+        def logout(refresh):
+            return self.client.post('/api/users/logout/', {'refresh': refresh}, format='json')
+
+        self.assertEqual([logout(token).status_code for _ in range(2)], [200, 200])
+        # Ya revocado en la base (rotado) pero no en el cache
+        self.assertEqual(logout(rotated).status_code, 200)
+        self.assertEqual(BlacklistedToken.objects.filter(token__jti=CachedRefreshToken(rotated, verify=False).jti).count(), 1)
+        self.assertEqual(logout('not-a-token').status_code, 400)
+
+    def test_blacklist_in_database_is_enforced_without_cache(self):
+        token = CachedRefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token.jti))
+        self.assertEqual(self.refresh(str(token)).status_code, 401)
+
+    def test_compact_jwt_blacklist_deletes_only_expired_tokens(self):
+        now = timezone.now()
+        for i in range(5):
+            outstanding = OutstandingToken.objects.create(
+                user=self.user, jti=f'expired-{i}', token='x', expires_at=now - timedelta(days=1),
+            )
+            BlacklistedToken.objects.create(token=outstanding)
+        live = CachedRefreshToken.for_user(self.user)
+
+        out = StringIO()
+        call_command('compact_jwt_blacklist', batch_size=2, max_batches=2, stdout=out)
+        self.assertEqual(OutstandingToken.objects.filter(expires_at__lte=now).count(), 1)
+        self.assertIn('Quedan tokens expirados', out.getvalue())
+
+        call_command('compact_jwt_blacklist', batch_size=2, stdout=StringIO())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [live.jti])
+        self.assertFalse(BlacklistedToken.objects.exists())
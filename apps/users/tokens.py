@@ -0,0 +1,119 @@
+"""
+Refresh tokens con la blacklist de JWT sin consulta aparte en cada refresh
+
+Con ROTATE_REFRESH_TOKENS + BLACKLIST_AFTER_ROTATION simplejwt hace en cada
+refresh: consulta a la blacklist (join outstandingtoken/blacklistedtoken),
+get_or_create de los dos registros del token usado, get_or_create del nuevo
+y tres lecturas del usuario (13 queries). CachedRefreshToken:
+
+- Verifica la blacklist contra el cache `tokens` (jti de tokens revocados
+  por logout o reutilizados), sin ir a la base
+- Decide en la base al rotar: el INSERT en blacklistedtoken (token_id es
+  único) falla si el token ya estaba revocado, así que la consulta previa
+  sobra y dos refresh simultáneos con el mismo token no pueden pasar ambos
+- Registra el token nuevo con un INSERT directo (el jti es nuevo)
+
+El cache solo guarda tokens revocados: si se pierde una entrada, la base
+igual rechaza el token al rotar. Sin rotación con blacklist la
+verificación consulta la base como simplejwt.
+
+Las filas de tokens expirados se borran con python manage.py compact_jwt_blacklist.
+"""
+import logging
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+TOKENS_CACHE = 'tokens'
+
+
+def _key(jti):
+    return f'jwt:revoked:{jti}'
+
+
+def remember_blacklisted(jti, exp):
+    """Marca el jti como revocado en el cache hasta que el token expire"""
+    try:
+        caches[TOKENS_CACHE].set(_key(jti), 1, max(int(exp - time.time()), 1))
+    except Exception:
+        logger.warning('No se pudo guardar el token revocado %s en cache', jti, exc_info=True)
+
+
+def cached_blacklisted(jti):
+    """True si el cache tiene el jti como revocado (False si no está o el cache falla)"""
+    try:
+        return caches[TOKENS_CACHE].get(_key(jti)) is not None
+    except Exception:
+        logger.warning('Cache de tokens no disponible', exc_info=True)
+        return False
+
+
+class RevokedTokenError(TokenError):
+    """El token es válido pero ya estaba revocado (rotado o cerrado)"""
+
+
+def rotation_blacklists():
+    return api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+
+
+class CachedRefreshToken(RefreshToken):
+    """RefreshToken con la blacklist verificada en cache y decidida al rotar"""
+
+    @property
+    def jti(self):
+        return self.payload[api_settings.JTI_CLAIM]
+
+    def check_blacklist(self):
+        if cached_blacklisted(self.jti):
+            raise RevokedTokenError('El token está en la blacklist')
+        if not rotation_blacklists() and BlacklistedToken.objects.filter(token__jti=self.jti).exists():
+            raise RevokedTokenError('El token está en la blacklist')
+
+    def _outstanding(self):
+        """Registro del token en outstandingtoken (lo crea si se emitió sin registrar)"""
+        try:
+            return OutstandingToken.objects.get(jti=self.jti)
+        except OutstandingToken.DoesNotExist:
+            user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+            user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            token, _ = OutstandingToken.objects.get_or_create(jti=self.jti, defaults={
+                'user': user,
+                'created_at': self.current_time,
+                'token': str(self),
+                'expires_at': datetime_from_epoch(self.payload['exp']),
+            })
+            return token
+
+    def blacklist(self):
+        """Revoca el token; RevokedTokenError si ya estaba revocado"""
+        try:
+            with transaction.atomic():
+                blacklisted = BlacklistedToken.objects.create(token=self._outstanding())
+        except IntegrityError:
+            remember_blacklisted(self.jti, self.payload['exp'])
+            raise RevokedTokenError('El token está en la blacklist')
+        return blacklisted, True
+
+    def outstand(self):
+        return OutstandingToken.objects.create(
+            user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+            jti=self.jti,
+            token=str(self),
+            created_at=self.current_time,
+            expires_at=datetime_from_epoch(self.payload['exp']),
+        )
+
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """POST /api/users/refresh/ (SIMPLE_JWT['TOKEN_REFRESH_SERIALIZER'])"""
+    token_class = CachedRefreshToken
@@ -8,10 +8,13 @@ Sistema de autenticación con dos métodos:
 from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate, get_user_model
 from django.conf import settings
 from apps.users.models import Role
+from apps.users.tokens import CachedRefreshToken, RevokedTokenError, remember_blacklisted
+from hr_properties.async_views import AsyncAPIView
+from hr_properties.throttling import EndpointThrottle, IPThrottle, UsernameThrottle
 import os
 
 User = get_user_model()
@@ -32,8 +35,12 @@ class LoginView(APIView):
         "username": "3123456789",  // phone1
         "password": "31234567891990"  // phone1 + birth_year
     }
+    
+    Throttling por IP, por username y global: 429 con Retry-After (ver hr_properties/throttling.py)
     """
     permission_classes = []
+    throttle_scope = 'login'
+    throttle_classes = [IPThrottle, UsernameThrottle, EndpointThrottle]
     
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -57,7 +64,7 @@ class LoginView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
         
         # Generar tokens JWT
-        refresh = RefreshToken.for_user(user)
+        refresh = CachedRefreshToken.for_user(user)
         
         return Response({
             'access': str(refresh.access_token),
@@ -76,7 +83,19 @@ class GoogleLoginSerializer(serializers.Serializer):
     id_token = serializers.CharField()
 
 
-class GoogleLoginView(APIView):
+def verify_google_token(token):
+    """Verifica el id_token con Google (llamada de red bloqueante). ValueError si es inválido"""
+    from google.oauth2 import id_token
+    from google.auth.transport import requests as google_requests
+    
+    return id_token.verify_oauth2_token(
+        token, 
+        google_requests.Request(), 
+        settings.GOOGLE_OAUTH_CLIENT_ID
+    )
+
+
+class GoogleLoginView(AsyncAPIView):
     """
     Login con Google (para admins)
     
@@ -86,13 +105,16 @@ class GoogleLoginView(APIView):
     }
     
     Solo permite emails configurados en ADMIN_EMAILS del .env
+    
+    Vista async: la verificación contra Google (descarga de certificados)
+    corre en el pool de hilos y no bloquea al worker mientras espera la red.
+    Throttling por IP y global (cada intento es una llamada a Google).
     """
     permission_classes = []
+    throttle_scope = 'google_login'
+    throttle_classes = [IPThrottle, EndpointThrottle]
     
-    def post(self, request):
-        from google.oauth2 import id_token
-        from google.auth.transport import requests as google_requests
-        
+    async def post(self, request):
         serializer = GoogleLoginSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -101,72 +123,72 @@ class GoogleLoginView(APIView):
         
         try:
             # Verificar el token con Google
-            idinfo = id_token.verify_oauth2_token(
-                token, 
-                google_requests.Request(), 
-                settings.GOOGLE_OAUTH_CLIENT_ID
-            )
-            
-            # Extraer información
-            email = idinfo['email']
-            google_id = idinfo['sub']
-            name = idinfo.get('name', '')
-            picture = idinfo.get('picture', '')
-            
-            # Verificar que el email esté en la lista de admins permitidos
-            allowed_admin_emails = os.getenv('ADMIN_EMAILS', '').split(',')
-            allowed_admin_emails = [e.strip() for e in allowed_admin_emails if e.strip()]
-            
-            if email not in allowed_admin_emails:
-                return Response({
-                    'error': 'Email not authorized as administrator'
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Buscar o crear el usuario
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    'username': email,
-                    'name': name,
-                    'google_id': google_id,
-                    'profile_picture': picture
-                }
-            )
-            
-            # Actualizar datos si ya existía
-            if not created:
-                user.name = name
-                user.google_id = google_id
-                user.profile_picture = picture
-                user.save()
-            
-            # Asignar rol admin si no lo tiene
-            admin_role, _ = Role.objects.get_or_create(name=Role.ADMIN)
-            if not user.has_role(Role.ADMIN):
-                from apps.users.models import UserRole
-                UserRole.objects.create(user=user, role=admin_role)
-            
-            # Generar tokens JWT
-            refresh = RefreshToken.for_user(user)
-            
-            return Response({
-                'access': str(refresh.access_token),
-                'refresh': str(refresh),
-                'user': {
-                    'id': user.id,
-                    'email': user.email,
-                    'name': user.name,
-                    'picture': user.profile_picture,
-                    'roles': user.get_roles()
-                }
-            })
-            
+            idinfo = await sync_to_async(verify_google_token, thread_sensitive=False)(token)
         except ValueError as e:
             print(f"Error verificando token de Google: {e}")
             print("client id", os.getenv('GOOGLE_OAUTH_CLIENT_ID'))
             return Response({
                 'error': 'Token de Google inválido'
             }, status=status.HTTP_401_UNAUTHORIZED)
+        
+        # Extraer información
+        email = idinfo['email']
+        google_id = idinfo['sub']
+        name = idinfo.get('name', '')
+        picture = idinfo.get('picture', '')
+        
+        # Verificar que el email esté en la lista de admins permitidos
+        allowed_admin_emails = os.getenv('ADMIN_EMAILS', '').split(',')
+        allowed_admin_emails = [e.strip() for e in allowed_admin_emails if e.strip()]
+        
+        if email not in allowed_admin_emails:
+            return Response({
+                'error': 'Email not authorized as administrator'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        data = await sync_to_async(self.login_admin)(email, google_id, name, picture)
+        return Response(data)
+    
+    def login_admin(self, email, google_id, name, picture):
+        """Crea/actualiza el admin y genera sus tokens (ORM: se llama con sync_to_async)"""
+        # Buscar o crear el usuario
+        user, created = User.objects.get_or_create(
+            email=email,
+            defaults={
+                'username': email,
+                'name': name,
+                'google_id': google_id,
+                'profile_picture': picture
+            }
+        )
+        
+        # Actualizar datos si ya existía
+        if not created:
+            user.name = name
+            user.google_id = google_id
+            user.profile_picture = picture
+            user.save()
+        
+        # Asignar rol admin si no lo tiene
+        admin_role, _ = Role.objects.get_or_create(name=Role.ADMIN)
+        if not user.has_role(Role.ADMIN):
+            from apps.users.models import UserRole
+            UserRole.objects.create(user=user, role=admin_role)
+        
+        # Generar tokens JWT
+        refresh = CachedRefreshToken.for_user(user)
+        
+        return {
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+            'user': {
+                'id': user.id,
+                'email': user.email,
+                'name': user.name,
+                'picture': user.profile_picture,
+                'roles': user.get_roles()
+            }
+        }
 
 
 class LogoutView(APIView):
@@ -177,12 +199,19 @@ class LogoutView(APIView):
     {
         "refresh": "eyJhbGciOi..."
     }
+    
+    El token queda marcado en el cache de la blacklist de inmediato (apps/users/tokens.py).
+    Repetir el logout con un token ya revocado también responde 200.
     """
     def post(self, request):
         try:
             refresh_token = request.data.get('refresh')
-            token = RefreshToken(refresh_token)
+            token = CachedRefreshToken(refresh_token)
             token.blacklist()
-            return Response({'message': 'Logout exitoso'})
+            remember_blacklisted(token.jti, token['exp'])
+        except RevokedTokenError:
+            # Logout repetido (otra pestaña, reintento): la sesión ya está cerrada
+            pass
         except Exception:
             return Response({'error': 'Token inválido'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'message': 'Logout exitoso'})
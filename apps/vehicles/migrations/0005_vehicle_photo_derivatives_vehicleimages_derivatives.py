@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicles', '0004_alter_obligationvehicle_temporality_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='photo_derivatives',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vehicleimages',
+            name='derivatives',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -77,6 +77,8 @@ class Vehicle(models.Model):
     purchase_date = models.DateField()
     purchase_price = models.DecimalField(max_digits=12, decimal_places=2)
     photo = models.ImageField(upload_to=vehicle_photo_upload_to, blank=True, null=True)
+    # Manifest de derivados de photo (lo escribe apps.media.derivatives.record_manifest)
+    photo_derivatives = models.JSONField(null=True, blank=True, editable=False)
     brand = models.CharField(max_length=100)
     model = models.CharField(max_length=100)
     responsible = models.ManyToManyField('Responsible', related_name='vehicles', blank=True, null=True)
@@ -153,3 +155,5 @@ class VehicleImages(models.Model):
     id = models.AutoField(primary_key=True)
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to=vehicle_photo_upload_to)    
+    # Manifest de derivados de image (lo escribe apps.media.derivatives.record_manifest)
+    derivatives = models.JSONField(null=True, blank=True, editable=False)
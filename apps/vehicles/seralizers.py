@@ -1,5 +1,9 @@
 from rest_framework import serializers
 
+from hr_properties.media_signing import SignedMediaModelSerializer
+from hr_properties.flex_fields import FlexFieldsSerializerMixin
+from apps.media.serializers import ImageDerivativesField
+
 from .models import (
     Vehicle,
     Responsible,
@@ -11,26 +15,28 @@ from .models import (
     VehiclePayment,
 )
 
-class VehicleDocumentSerializer(serializers.ModelSerializer):
+class VehicleDocumentSerializer(SignedMediaModelSerializer):
     class Meta:
         model = VehicleDocument
         fields = ['id', 'vehicle', 'name', 'file']
         read_only_fields = ['id']
 
 
-class VehicleDocumentCreateSerializer(serializers.ModelSerializer):
+class VehicleDocumentCreateSerializer(SignedMediaModelSerializer):
     class Meta:
         model = VehicleDocument
         fields = ['name', 'file']
         
-class VehicleImageSerializer(serializers.ModelSerializer):
+class VehicleImageSerializer(SignedMediaModelSerializer):
+    srcset = ImageDerivativesField(source='image', manifest='derivatives')
+
     class Meta:
         model = VehicleImages
-        fields = ['id', 'vehicle', 'image']
+        fields = ['id', 'vehicle', 'image', 'srcset']
         read_only_fields = ['id']
 
 
-class VehicleImageCreateSerializer(serializers.ModelSerializer):
+class VehicleImageCreateSerializer(SignedMediaModelSerializer):
     class Meta:
         model = VehicleImages
         fields = ['image']
@@ -69,7 +75,7 @@ class ObligationVehicleTypeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class VehiclePaymentSerializer(serializers.ModelSerializer):
+class VehiclePaymentSerializer(SignedMediaModelSerializer):
     payment_method_name = serializers.CharField(source='payment_method.name', read_only=True)
 
     class Meta:
@@ -78,13 +84,13 @@ class VehiclePaymentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class VehiclePaymentCreateSerializer(serializers.ModelSerializer):
+class VehiclePaymentCreateSerializer(SignedMediaModelSerializer):
     class Meta:
         model = VehiclePayment
         fields = ['payment_method', 'date', 'amount', 'voucher']
 
 
-class ObligationVehicleSerializer(serializers.ModelSerializer):
+class ObligationVehicleSerializer(FlexFieldsSerializerMixin, SignedMediaModelSerializer):
     obligation_type_name = serializers.CharField(source='obligation_type.name', read_only=True)
     payments = VehiclePaymentSerializer(many=True, read_only=True)
     total_paid = serializers.SerializerMethodField()
@@ -109,6 +115,8 @@ class ObligationVehicleSerializer(serializers.ModelSerializer):
             'is_fully_paid',
         ]
         read_only_fields = ['id']
+        expandable_fields = ['payments']
+        field_prefetches = {'total_paid': ['payments'], 'pending': ['payments'], 'is_fully_paid': ['payments']}
 
     def get_total_paid(self, obj):
         return str(sum(payment.amount for payment in obj.payments.all()))
@@ -123,13 +131,13 @@ class ObligationVehicleSerializer(serializers.ModelSerializer):
         return total_paid >= obj.amount
 
 
-class ObligationVehicleCreateSerializer(serializers.ModelSerializer):
+class ObligationVehicleCreateSerializer(SignedMediaModelSerializer):
     class Meta:
         model = ObligationVehicle
         fields = ['entity_name', 'obligation_type', 'due_date', 'amount', 'temporality', 'file']
 
 
-class VehicleSerializer(serializers.ModelSerializer):
+class VehicleSerializer(FlexFieldsSerializerMixin, SignedMediaModelSerializer):
     documents = VehicleDocumentSerializer(many=True, read_only=True)
     images = VehicleImageSerializer(many=True, read_only=True)
     responsibles = ResponsibleSerializer(source='responsible', many=True, read_only=True)
@@ -138,6 +146,7 @@ class VehicleSerializer(serializers.ModelSerializer):
     )
     repairs = VehicleRepairSerializer(many=True, read_only=True)
     obligations = ObligationVehicleSerializer(source='obligations_vehicle', many=True, read_only=True)
+    photo_srcset = ImageDerivativesField(source='photo', manifest='photo_derivatives')
 
     class Meta:
         model = Vehicle
@@ -150,6 +159,7 @@ class VehicleSerializer(serializers.ModelSerializer):
             'purchase_date',
             'purchase_price',
             'photo',
+            'photo_srcset',
             'brand',
             'model',
             'documents',
@@ -160,6 +170,7 @@ class VehicleSerializer(serializers.ModelSerializer):
             'obligations',
         ]
         read_only_fields = ['id']
+        expandable_fields = ['documents', 'images', 'responsibles', 'repairs', 'obligations']
         extra_kwargs = {
             'license_plate': {
                 'validators': [],
@@ -1,10 +1,14 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 
 from apps.users.permissions import IsAdminUser
+from hr_properties.fast_serializers import FastListMixin
+from hr_properties.flex_fields import FlexFieldsViewMixin
+from hr_properties.renderers import ORJSONParser
 from .models import (
 	Vehicle,
 	VehicleDocument,
@@ -33,18 +37,19 @@ from .seralizers import (
 )
 
 
-class VehicleViewSet(viewsets.ModelViewSet):
+class VehicleViewSet(FlexFieldsViewMixin, viewsets.ModelViewSet):
 	queryset = Vehicle.objects.all().prefetch_related(
 		'documents',
 		'images',
 		'responsible',
 		'repairs',
 		'obligations_vehicle',
-		'obligations_vehicle__payments',
+		# payment_method_name de cada pago sin una consulta por pago
+		Prefetch('obligations_vehicle__payments', queryset=VehiclePayment.objects.select_related('payment_method')),
 	)
 	serializer_class = VehicleSerializer
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
 	@action(detail=True, methods=['get'])
 	def documents(self, request, pk=None):
@@ -138,7 +143,7 @@ class VehicleViewSet(viewsets.ModelViewSet):
 		serializer = ObligationVehicleSerializer(vehicle.obligations_vehicle.all(), many=True, context={'request': request})
 		return Response(serializer.data)
 
-	@action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser, JSONParser])
+	@action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser, ORJSONParser])
 	def add_obligation(self, request, pk=None):
 		vehicle = self.get_object()
 		serializer = ObligationVehicleCreateSerializer(data=request.data)
@@ -160,7 +165,7 @@ class VehicleViewSet(viewsets.ModelViewSet):
 		serializer = VehiclePaymentSerializer(obligation.payments.all(), many=True, context={'request': request})
 		return Response(serializer.data)
 
-	@action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser, JSONParser])
+	@action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser, ORJSONParser])
 	def add_obligation_payment(self, request, pk=None):
 		vehicle = self.get_object()
 		obligation_id = request.data.get('obligation_id')
@@ -223,14 +228,14 @@ class VehicleDocumentViewSet(viewsets.ModelViewSet):
 	queryset = VehicleDocument.objects.select_related('vehicle').all()
 	serializer_class = VehicleDocumentSerializer
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
 
 class VehicleImageViewSet(viewsets.ModelViewSet):
 	queryset = VehicleImages.objects.select_related('vehicle').all()
 	serializer_class = VehicleImageSerializer
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
 
 class ResponsibleViewSet(viewsets.ModelViewSet):
@@ -243,7 +248,7 @@ class VehicleRepairViewSet(viewsets.ModelViewSet):
 	queryset = VehicleRepair.objects.select_related('vehicle').all()
 	serializer_class = VehicleRepairSerializer
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
 
 class ObligationVehicleTypeViewSet(viewsets.ModelViewSet):
@@ -252,23 +257,26 @@ class ObligationVehicleTypeViewSet(viewsets.ModelViewSet):
 	permission_classes = [IsAdminUser]
 
 
-class ObligationVehicleViewSet(viewsets.ModelViewSet):
-	queryset = ObligationVehicle.objects.select_related('vehicle', 'obligation_type').prefetch_related('payments').all()
+class ObligationVehicleViewSet(FlexFieldsViewMixin, viewsets.ModelViewSet):
+	queryset = ObligationVehicle.objects.select_related('vehicle', 'obligation_type').prefetch_related(
+		Prefetch('payments', queryset=VehiclePayment.objects.select_related('payment_method'))
+	).all()
 	serializer_class = ObligationVehicleSerializer
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
 
-class VehiclePaymentViewSet(viewsets.ModelViewSet):
+class VehiclePaymentViewSet(FastListMixin, viewsets.ModelViewSet):
 	queryset = VehiclePayment.objects.select_related('obligation', 'payment_method').all()
 	serializer_class = VehiclePaymentSerializer
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
+	read_replica = True  # GET a la réplica si está configurada (ver apps/core/replicas.py)
 
 
 class VehicleObligationPaymentsViewSet(viewsets.ViewSet):
 	permission_classes = [IsAdminUser]
-	parser_classes = [MultiPartParser, FormParser, JSONParser]
+	parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
 	def list(self, request, vehicle_pk=None, obligation_pk=None):
 		obligation = get_object_or_404(ObligationVehicle, pk=obligation_pk, vehicle_id=vehicle_pk)
@@ -3,4 +3,5 @@
 # Se ejecuta diariamente por cron a las 8:00 AM
 
 cd /app
+python manage.py update_rental_status >> /var/log/alerts.log 2>&1
 python manage.py send_due_alerts --alert-days 5 1 >> /var/log/alerts.log 2>&1
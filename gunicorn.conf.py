@@ -1,5 +1,61 @@
-workers = 2
-worker_class = "gthread"
-threads = 2
-timeout=120
+import os
+import time
 
+# SERVER_MODE=wsgi (por defecto): workers gthread, un hilo por request
+# SERVER_MODE=asgi: workers uvicorn; las vistas async (login Google, envío de
+# email, media, dashboard) no ocupan un hilo mientras esperan I/O
+server_mode = os.getenv("SERVER_MODE", "wsgi").lower()
+
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+timeout = 120
+
+if server_mode == "asgi":
+    wsgi_app = "hr_properties.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "hr_properties.wsgi:application"
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", "2"))
+
+
+def post_fork(server, worker):
+    worker.boot_started = time.monotonic()
+
+
+def post_worker_init(worker):
+    # Aplicación cargada (settings, apps, URLconf)
+    app_loaded = time.monotonic()
+
+    # Abrir las conexiones a la BD antes de la primera request (ver apps/core/db.py)
+    from apps.core.db import prewarm_connections
+
+    try:
+        opened = prewarm_connections(worker)
+        worker.log.info("DB: %s conexión(es) abiertas al iniciar el worker", opened)
+    except Exception as exc:
+        worker.log.warning("DB: no se pudieron abrir conexiones al iniciar: %s", exc)
+
+    worker.log.info(
+        "Worker listo en %.2fs (aplicación %.2fs, conexiones %.2fs)",
+        time.monotonic() - worker.boot_started,
+        app_loaded - worker.boot_started,
+        time.monotonic() - app_loaded,
+    )
+
+
+def on_starting(server):
+    # Métricas de varios procesos (ver apps/core/metrics.py): empezar sin los
+    # archivos de una ejecución anterior
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        import shutil
+
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,98 @@
+"""
+Vistas async para endpoints que esperan I/O (Google, SMTP, archivos grandes)
+
+Con SERVER_MODE=asgi (uvicorn, ver gunicorn.conf.py) una vista async no ocupa
+un hilo mientras espera la red: un worker atiende muchas requests lentas a la
+vez. Con SERVER_MODE=wsgi siguen funcionando igual (Django las ejecuta con
+async_to_sync).
+
+    class GoogleLoginView(AsyncAPIView):
+        permission_classes = []
+
+        async def post(self, request):
+            idinfo = await sync_to_async(verify, thread_sensitive=False)(token)
+            ...
+
+- Autenticación, permisos y throttling de DRF se ejecutan igual que en
+  APIView (en el hilo sync de la request, porque JWTAuthentication consulta
+  la BD)
+- Dentro del handler el ORM se usa con sync_to_async(...) o con los métodos
+  async (aget, acount, ...)
+- Llamadas bloqueantes que no tocan la BD (HTTP, SMTP): sync_to_async(...,
+  thread_sensitive=False), así corren en el pool y no en el hilo compartido
+
+gather_queries() ejecuta varias consultas independientes a la vez, cada una
+en su propio hilo y con su propia conexión del pool (DashboardView).
+"""
+import asyncio
+import os
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from rest_framework.views import APIView
+
+# Consultas simultáneas por request en gather_queries (= conexiones extra)
+ASYNC_DB_CONCURRENCY = int(os.getenv('ASYNC_DB_CONCURRENCY', '4'))
+
+
+class AsyncAPIView(APIView):
+    """APIView cuyos handlers (get, post, ...) son `async def`"""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def _run_on_own_connection(query):
+    try:
+        return query()
+    finally:
+        # Hilo del executor: su conexión no la cierra request_finished y bajo
+        # WSGI cada request crea hilos nuevos; se devuelve siempre al pool
+        connections.close_all()
+
+
+async def gather_queries(queries, using='default', max_concurrency=None):
+    """
+    Ejecuta {nombre: callable sync} concurrentemente y devuelve {nombre: resultado}.
+
+    El ORM async de Django (acount, aaggregate) pasa todo por un único hilo,
+    así que asyncio.gather sobre ellos no solapa las consultas; aquí cada una
+    corre en un hilo aparte con una conexión tomada del pool (DB_POOL) que
+    se devuelve al terminar. Sin pool (abrir una conexión por consulta cuesta
+    más que lo que se gana) o en SQLite se ejecutan una tras otra en el hilo
+    de la request.
+    """
+    names = list(queries)
+    connection = connections[using]
+    if connection.vendor == 'sqlite' or not connection.settings_dict['OPTIONS'].get('pool'):
+        run = sync_to_async(lambda: [queries[name]() for name in names])
+        return dict(zip(names, await run()))
+
+    semaphore = asyncio.Semaphore(max_concurrency or ASYNC_DB_CONCURRENCY)
+    run_query = sync_to_async(_run_on_own_connection, thread_sensitive=False)
+
+    async def run(name):
+        async with semaphore:
+            return await run_query(queries[name])
+
+    results = await asyncio.gather(*(run(name) for name in names))
+    return dict(zip(names, results))
@@ -0,0 +1,315 @@
+"""
+Serialización rápida de listados de solo lectura (.values() en vez de instancias)
+
+En los listados grandes casi todo el tiempo se va en crear una instancia del
+modelo por fila y en recorrer los campos del serializer (get_attribute,
+to_representation, PKOnlyObject...). Con FastListMixin un GET de listado:
+
+1. Filtra y pagina el queryset como siempre, pero con .values() de
+   exactamente las columnas que declara el serializer (+ Meta.fast_annotations)
+2. Convierte cada fila con funciones precompiladas a partir de los campos del
+   serializer: cada columna usa el to_representation del campo de DRF, así
+   el JSON es byte a byte el mismo que con el serializer
+3. Los serializers anidados con many=True (p. ej. payments) se resuelven con
+   una consulta .values() más por página, agrupada por la FK
+
+Se compila:
+- Campos de modelo (también con source='fk.campo' si las FK no admiten NULL
+  o el campo tiene allow_null=True) y get_<campo>_display
+- PrimaryKeyRelatedField (el id de la columna FK)
+- SignedFileField / SignedImageField (URL firmada a partir del nombre)
+- Serializers anidados de una FK o de una relación inversa (many=True)
+- SerializerMethodField si el serializer define fast_<campo>(row), que recibe
+  la fila cruda de .values() (columnas y Meta.fast_annotations):
+
+    class Meta:
+        fast_annotations = {'paid_total': Subquery(...Sum('amount'))}
+
+    def fast_total_paid(self, row):
+        return row['paid_total'] if row['paid_total'] is not None else 0
+
+Cualquier otro campo (source='*', propiedades, campos personalizados...) hace
+que la vista use el serializer completo. También se usa el serializer
+completo con ?fields= / ?expand= y con FAST_LIST_SERIALIZATION = False.
+
+Las anotaciones van como Subquery y no como agregado sobre el join: un
+GROUP BY cambia el plan y con él el orden de las filas empatadas, y los
+filtros sobre relaciones múltiples duplicarían la suma.
+"""
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Prefetch
+from django.utils.encoding import force_str
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from hr_properties.flex_fields import requested_fields
+from hr_properties.media_signing import SignedFileField, SignedImageField, signed_media_url
+
+# to_representation de DRF que funcionan igual con el valor crudo de .values()
+_SAFE_REPRESENTATIONS = {
+    cls.to_representation for cls in (
+        drf_fields.CharField, drf_fields.IntegerField, drf_fields.FloatField,
+        drf_fields.DecimalField, drf_fields.BooleanField, drf_fields.DateField,
+        drf_fields.DateTimeField, drf_fields.TimeField, drf_fields.DurationField,
+        drf_fields.ChoiceField, drf_fields.UUIDField, drf_fields.JSONField,
+        drf_fields.ReadOnlyField,
+    )
+}
+_TEXT_MODEL_FIELDS = (models.CharField, models.TextField)
+_NESTED_KEY = '_fast_{}'
+
+
+class NotCompilable(Exception):
+    """El serializer tiene un campo sin equivalente en .values()"""
+
+
+def _resolve_path(model, source_attrs, allow_null):
+    """
+    ('payment_method', 'name') → (PaymentMethod, campo name, 'payment_method__').
+    Solo FK hacia adelante; una FK que admite NULL exige allow_null en el campo
+    (si no, DRF omite la clave cuando la relación es None).
+    """
+    prefix = ''
+    for attr in source_attrs[:-1]:
+        try:
+            field = model._meta.get_field(attr)
+        except Exception:
+            raise NotCompilable(f'{model.__name__}.{attr} no es un campo')
+        if not field.concrete or not (field.many_to_one or field.one_to_one):
+            raise NotCompilable(f'{model.__name__}.{attr} no es una FK')
+        if field.null and not allow_null:
+            raise NotCompilable(f'{model.__name__}.{attr} admite NULL y el campo no tiene allow_null')
+        model = field.related_model
+        prefix += f'{attr}__'
+    return model, prefix
+
+
+def _column_getter(key, convert):
+    if convert is None:
+        return itemgetter(key)
+
+    def get(row):
+        value = row[key]
+        return None if value is None else convert(value)
+    return get
+
+
+def _converter(field, model_field):
+    """Función valor crudo → representación, o None si es la identidad"""
+    representation = type(field).to_representation
+    if representation is drf_fields.CharField.to_representation and isinstance(model_field, _TEXT_MODEL_FIELDS):
+        return None
+    if representation is drf_fields.IntegerField.to_representation and isinstance(
+        model_field, (models.IntegerField, models.AutoField)
+    ):
+        return None
+    if representation is drf_fields.ReadOnlyField.to_representation:
+        return None
+    return field.to_representation
+
+
+def _file_converter(field):
+    """Igual que SignedFileField.to_representation pero a partir del nombre guardado"""
+    request = field.context.get('request')
+    if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+        return lambda name: name or None
+    return lambda name: signed_media_url(name, request) if name else None
+
+
+class FastPlan:
+    """
+    Serializer (ya instanciado, con su context) compilado a columnas de
+    .values() y una función fila → dict.
+    """
+
+    def __init__(self, serializer, model=None, prefix=''):
+        self.serializer = serializer
+        self.model = model or serializer.Meta.model
+        self.prefix = prefix
+        self.columns = [f'{prefix}{self.model._meta.pk.name}']
+        self.annotations = {}
+        self.nested = []  # (clave en la fila, relación inversa, FastPlan del hijo)
+        self.prefetch_querysets = {}
+        getters = []
+        for field in serializer._readable_fields:
+            getters.append((field.field_name, self._compile(field)))
+        if not prefix:
+            self.annotations = dict(getattr(serializer.Meta, 'fast_annotations', {}))
+        self.getters = getters
+
+    def _add_column(self, key):
+        if key not in self.columns:
+            self.columns.append(key)
+        return key
+
+    def _compile(self, field):
+        name = field.field_name
+        if isinstance(field, serializers.SerializerMethodField):
+            method = getattr(self.serializer, f'fast_{name}', None)
+            if method is None or self.prefix:
+                raise NotCompilable(f'{name}: SerializerMethodField sin fast_{name}()')
+            return method
+        if field.source == '*':
+            raise NotCompilable(f'{name}: source="*"')
+        if isinstance(field, serializers.ListSerializer):
+            return self._compile_many(field)
+        if isinstance(field, serializers.Serializer):
+            return self._compile_one(field)
+
+        model, prefix = _resolve_path(self.model, field.source_attrs, field.allow_null)
+        prefix = self.prefix + prefix
+        attr = field.source_attrs[-1]
+
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            if field.pk_field is not None or type(field).to_representation is not relations.PrimaryKeyRelatedField.to_representation:
+                raise NotCompilable(f'{name}: PrimaryKeyRelatedField personalizado')
+            model_field = self._model_field(model, attr, name)
+            if not model_field.many_to_one and not model_field.one_to_one:
+                raise NotCompilable(f'{name}: {attr} no es una FK')
+            return itemgetter(self._add_column(prefix + attr))
+        if isinstance(field, relations.RelatedField) or isinstance(field, relations.ManyRelatedField):
+            raise NotCompilable(f'{name}: {type(field).__name__}')
+        if type(field).get_attribute is not drf_fields.Field.get_attribute:
+            raise NotCompilable(f'{name}: get_attribute personalizado')
+
+        if attr.startswith('get_') and attr.endswith('_display'):
+            model_field = self._model_field(model, attr[4:-8], name)
+            if not model_field.choices:
+                raise NotCompilable(f'{name}: {attr} sin choices')
+            choices = dict(model_field.flatchoices)
+            represent = _converter(field, None) or (lambda value: value)
+            convert = lambda value: represent(force_str(choices.get(value, value), strings_only=True))  # noqa: E731
+            return _column_getter(self._add_column(prefix + model_field.name), convert)
+
+        model_field = self._model_field(model, attr, name)
+        if model_field.is_relation or not model_field.concrete:
+            raise NotCompilable(f'{name}: {attr} no es una columna')
+        if isinstance(model_field, models.FileField):
+            if not isinstance(field, (SignedFileField, SignedImageField)):
+                raise NotCompilable(f'{name}: FileField sin firma')
+            return _column_getter(self._add_column(prefix + attr), _file_converter(field))
+        if type(field).to_representation not in _SAFE_REPRESENTATIONS:
+            raise NotCompilable(f'{name}: {type(field).__name__}')
+        return _column_getter(self._add_column(prefix + attr), _converter(field, model_field))
+
+    def _model_field(self, model, attr, name):
+        try:
+            return model._meta.get_field(attr)
+        except Exception:
+            raise NotCompilable(f'{name}: {model.__name__}.{attr} no es un campo del modelo')
+
+    def _compile_one(self, field):
+        """Serializer anidado de una FK: columnas con prefijo en la misma consulta"""
+        if len(field.source_attrs) != 1:
+            raise NotCompilable(f'{field.field_name}: source con varios niveles')
+        model_field = self._model_field(self.model, field.source_attrs[0], field.field_name)
+        if not model_field.concrete or not (model_field.many_to_one or model_field.one_to_one):
+            raise NotCompilable(f'{field.field_name}: no es una FK')
+        child = FastPlan(field, model_field.related_model, f'{self.prefix}{model_field.name}__')
+        if child.nested or child.annotations:
+            raise NotCompilable(f'{field.field_name}: anidado con listas o anotaciones')
+        for column in child.columns:
+            self._add_column(column)
+        pk_key, getters = child.columns[0], child.getters
+
+        def get(row):
+            if row[pk_key] is None:
+                return None
+            return {name: getter(row) for name, getter in getters}
+        return get
+
+    def _compile_many(self, field):
+        """Serializer anidado many=True de una relación inversa: otra consulta por página"""
+        if self.prefix or len(field.source_attrs) != 1:
+            raise NotCompilable(f'{field.field_name}: lista anidada dentro de otro anidado')
+        relation = self._model_field(self.model, field.source_attrs[0], field.field_name)
+        if not relation.one_to_many or relation.concrete:
+            raise NotCompilable(f'{field.field_name}: no es una relación inversa')
+        child = FastPlan(field.child, relation.related_model)
+        child._add_column(relation.field.attname)
+        key = _NESTED_KEY.format(field.field_name)
+        self.nested.append((key, relation, child))
+        return itemgetter(key)
+
+    # ── Ejecución ───────────────────────────────────────────────────────────
+
+    def values(self, queryset, extra_columns=()):
+        """Queryset de dicts con las columnas del plan (sin select/prefetch_related)"""
+        self.prefetch_querysets = {
+            lookup.prefetch_to: lookup.queryset
+            for lookup in queryset._prefetch_related_lookups
+            if isinstance(lookup, Prefetch) and lookup.queryset is not None
+        }
+        queryset = queryset.prefetch_related(None)
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        columns = list(self.columns) + list(self.annotations)
+        columns += [column for column in extra_columns if column not in columns]
+        return queryset.values(*columns)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        pk_key = self.columns[0]
+        for key, relation, child in self.nested:
+            # Mismo queryset base que el Prefetch de la vista (orden y filtros)
+            base = self.prefetch_querysets.get(relation.name)
+            if base is None:
+                base = relation.related_model._default_manager.all()
+            parent_ids = [row[pk_key] for row in rows]
+            children = child.values(base.filter(**{f'{relation.field.name}__in': parent_ids}))
+            children = list(children)
+            grouped = {}
+            fk_key = relation.field.attname
+            for child_row, data in zip(children, child.to_representation(children)):
+                grouped.setdefault(child_row[fk_key], []).append(data)
+            for row in rows:
+                row[key] = grouped.get(row[pk_key], [])
+        getters = self.getters
+        return [{name: getter(row) for name, getter in getters} for row in rows]
+
+
+def compile_serializer(serializer):
+    """FastPlan del serializer, o None si algún campo no se puede compilar"""
+    try:
+        return FastPlan(serializer)
+    except NotCompilable:
+        return None
+
+
+class FastListMixin:
+    """
+    Mixin para vistas de listado: GET sin ?fields= / ?expand= usa FastPlan
+    cuando el serializer se puede compilar; si no, el list() de siempre.
+    """
+
+    def get_fast_plan(self):
+        request = self.request
+        if request.method not in SAFE_METHODS or not getattr(settings, 'FAST_LIST_SERIALIZATION', True):
+            return None
+        serializer_class = self.get_serializer_class()
+        if requested_fields(request, serializer_class) is not None:
+            return None
+        return compile_serializer(serializer_class(context=self.get_serializer_context()))
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_fast_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # La paginación keyset arma el cursor con las columnas del orden
+        extra_columns = []
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            extra_columns = [field.attname for field, _ in self.paginator.get_ordering(queryset, self)]
+        rows = plan.values(queryset, extra_columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.to_representation(page))
+        return Response(plan.to_representation(rows))
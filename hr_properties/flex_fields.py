@@ -0,0 +1,143 @@
+"""
+Campos a demanda (?fields= / ?expand=) para serializers pesados
+
+    GET /api/properties/5/?fields=id,name,city
+    GET /api/properties/5/?expand=media
+    GET /api/rentals/?fields=id,check_in,check_out,tenant
+
+- Sin parámetros: la respuesta es la de siempre (todos los campos)
+- ?fields=a,b: solo esos campos
+- ?expand=x,y: todos los campos simples + solo esas relaciones anidadas
+  (las listadas en Meta.expandable_fields)
+- Ambos: la unión
+
+Solo aplica en lecturas (GET/HEAD/OPTIONS) y al serializer raíz de la
+respuesta; los serializers anidados no se tocan.
+
+FlexFieldsViewMixin además quita del queryset los prefetch_related /
+select_related de las relaciones que no se van a serializar, así no solo se
+achica el JSON sino que tampoco se ejecutan esas consultas.
+
+Para campos calculados que recorren una relación (p. ej. total_paid suma
+obj.payments.all()) se declara Meta.field_prefetches = {'total_paid': ['payments']}
+y el prefetch se conserva mientras alguno de esos campos se pida.
+"""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _split_param(request, name):
+    raw = request.query_params.get(name)
+    if raw is None:
+        return None
+    return {value.strip() for value in raw.split(',') if value.strip()}
+
+
+def requested_fields(request, serializer_class):
+    """
+    Nombres de campo a serializar según ?fields= / ?expand=, o None si la
+    request no los usa (→ todos los campos).
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = _split_param(request, FIELDS_PARAM)
+    expand = _split_param(request, EXPAND_PARAM)
+    if fields is None and expand is None:
+        return None
+
+    expandable = set(getattr(serializer_class.Meta, 'expandable_fields', ()))
+    selected = set(fields or ())
+    if fields is None:
+        # Solo ?expand=: todos los campos no expandibles
+        selected = {name for name in serializer_class().fields if name not in expandable}
+    return selected | (expand or set())
+
+
+def _lookup_owners(serializer_class):
+    """raíz del lookup (p. ej. 'obligations_vehicle') → campos que lo necesitan"""
+    meta = serializer_class.Meta
+    owners = {}
+    declared = getattr(serializer_class, '_declared_fields', {})
+    for name in getattr(meta, 'expandable_fields', ()):
+        field = declared.get(name)
+        source = (field.source if field is not None and field.source else name).split('.')[0]
+        owners.setdefault(source, set()).add(name)
+    for name, lookups in getattr(meta, 'field_prefetches', {}).items():
+        for lookup in lookups:
+            owners.setdefault(lookup.split('__')[0], set()).add(name)
+    return owners
+
+
+def _flatten_select_related(tree, prefix=''):
+    lookups = []
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        nested = _flatten_select_related(children, f'{path}__') if children else []
+        lookups.extend(nested or [path])
+    return lookups
+
+
+def prune_related_lookups(queryset, serializer_class, request):
+    """Quita del queryset los prefetch/select_related de campos no pedidos"""
+    selected = requested_fields(request, serializer_class)
+    if selected is None or not getattr(serializer_class.Meta, 'expandable_fields', None):
+        return queryset
+    owners = _lookup_owners(serializer_class)
+
+    def keep(lookup):
+        owned_by = owners.get(lookup.split('__')[0])
+        return owned_by is None or bool(owned_by & selected)
+
+    prefetches = list(queryset._prefetch_related_lookups)
+    kept_prefetches = [
+        lookup for lookup in prefetches
+        if keep(getattr(lookup, 'prefetch_through', lookup))
+    ]
+    if len(kept_prefetches) != len(prefetches):
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept_prefetches)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        lookups = _flatten_select_related(select_related)
+        kept = [lookup for lookup in lookups if keep(lookup)]
+        if len(kept) != len(lookups):
+            queryset = queryset.select_related(None)
+            if kept:
+                queryset = queryset.select_related(*kept)
+    return queryset
+
+
+class FlexFieldsSerializerMixin:
+    """
+    Mixin para ModelSerializer: respeta ?fields= y ?expand= en el serializer raíz.
+
+        class Meta:
+            expandable_fields = ['media', 'inventory']
+            field_prefetches = {'total_paid': ['payments']}
+    """
+
+    def _is_response_root(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_response_root():
+            return fields
+        selected = requested_fields(self.context.get('request'), type(self))
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class FlexFieldsViewMixin:
+    """Mixin para vistas genéricas: poda los prefetch según ?fields= / ?expand="""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return prune_related_lookups(queryset, self.get_serializer_class(), self.request)
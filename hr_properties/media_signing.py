@@ -0,0 +1,116 @@
+"""
+URLs firmadas (HMAC) para archivos de /media/
+
+Los serializers emiten URLs del tipo:
+
+    /media/property_3/laws/contrato.pdf?exp=1767225600&sig=3f1a...
+
+- exp: timestamp UNIX de expiración
+- sig: HMAC-SHA256 de "<path>:<exp>" con una clave derivada de SECRET_KEY
+
+`protected_media` solo tiene que recalcular el HMAC (CPU pura): no decodifica
+el JWT ni consulta roles en la base de datos.
+
+La expiración se redondea a bloques de MEDIA_URL_TTL segundos, así la misma
+imagen produce la misma URL durante un bloque y el navegador/CDN puede
+cachearla. Una URL emitida siempre es válida entre TTL y 2×TTL segundos.
+"""
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.db import models
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+MEDIA_SIGNATURE_SALT = 'hr_properties.media_signing'
+
+
+def _ttl() -> int:
+    return max(int(getattr(settings, 'MEDIA_URL_TTL', 3600)), 1)
+
+
+def _signing_key() -> str:
+    return getattr(settings, 'MEDIA_SIGNING_KEY', None) or settings.SECRET_KEY
+
+
+def _signature(media_path: str, expires: int) -> str:
+    value = f'{media_path}:{expires}'
+    return salted_hmac(MEDIA_SIGNATURE_SALT, value, secret=_signing_key(), algorithm='sha256').hexdigest()
+
+
+def signed_expiry(now=None) -> int:
+    """Expiración redondeada al final del siguiente bloque de TTL."""
+    ttl = _ttl()
+    now = int(now if now is not None else time.time())
+    return (now // ttl + 2) * ttl
+
+
+def sign_media_path(media_path: str, expires=None) -> dict:
+    """Devuelve los parámetros de firma (exp, sig) para un path relativo a MEDIA_ROOT"""
+    expires = int(expires if expires is not None else signed_expiry())
+    return {'exp': expires, 'sig': _signature(media_path, expires)}
+
+
+def verify_media_signature(media_path: str, expires, signature) -> bool:
+    """Verifica firma y expiración sin tocar la base de datos"""
+    if not expires or not signature:
+        return False
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    return constant_time_compare(_signature(media_path, expires), signature)
+
+
+def signed_media_url(name: str, request=None) -> str:
+    """URL firmada (absoluta si hay request) para un nombre de archivo del storage"""
+    media_path = name.lstrip('/')
+    url = f"{settings.MEDIA_URL}{quote(media_path)}?{urlencode(sign_media_path(media_path))}"
+    if request is not None:
+        return request.build_absolute_uri(url)
+    return url
+
+
+def signed_file_url(field_file, request=None):
+    """Igual que signed_media_url pero a partir de un FieldFile (None si está vacío)"""
+    if not field_file:
+        return None
+    return signed_media_url(field_file.name, request)
+
+
+class SignedFileField(serializers.FileField):
+    """FileField que en lectura devuelve una URL firmada en lugar de file.url"""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        if not getattr(self, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return value.name
+        return signed_file_url(value, self.context.get('request'))
+
+
+class SignedImageField(serializers.ImageField):
+    """ImageField que en lectura devuelve una URL firmada en lugar de file.url"""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        if not getattr(self, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return value.name
+        return signed_file_url(value, self.context.get('request'))
+
+
+class SignedMediaModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer base: los FileField/ImageField del modelo se mapean a sus
+    versiones firmadas, también con fields = '__all__'.
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.FileField: SignedFileField,
+        models.ImageField: SignedImageField,
+    }
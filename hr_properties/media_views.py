@@ -1,32 +1,21 @@
 import os
 import posixpath
 import re
+import time
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.http import FileResponse, Http404
-from rest_framework import status
-from rest_framework.authentication import SessionAuthentication
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from hr_properties.media_signing import verify_media_signature
 
 PUBLIC_PROPERTY_FOLDERS = {"images", "media", "ensers"}
 PROPERTY_FOLDER_PATTERN = re.compile(r"^property_\d+$")
 
 
-def _is_admin_user(user) -> bool:
-    if not user or not user.is_authenticated:
-        return False
-
-    # Allow Django superusers and users with app role "admin".
-    if getattr(user, "is_superuser", False):
-        return True
-
-    user_roles = user.userrole_set.values_list("role__name", flat=True)
-    return "admin" in user_roles
-
-
 def _normalize_media_path(path: str) -> str:
     """Normalize and validate media path to avoid traversal attacks."""
     normalized = posixpath.normpath(path).lstrip("/")
@@ -35,6 +24,10 @@ def _normalize_media_path(path: str) -> str:
     if normalized == ".." or normalized.startswith("../"):
         raise Http404("Invalid media path")
 
+    # Hidden folders (.blobs, .quarantine) are internal and never served.
+    if any(part.startswith(".") for part in normalized.split("/")):
+        raise Http404("Invalid media path")
+
     return normalized
 
 
@@ -59,28 +52,67 @@ def _build_safe_file_path(media_path: str) -> str:
     return full_path
 
 
-@api_view(["GET"])
-@authentication_classes([JWTAuthentication, SessionAuthentication])
-@permission_classes([AllowAny])
-def protected_media(request, path: str):
-    normalized_path = _normalize_media_path(path)
+async def _read_chunks(filelike, chunk_size: int):
+    """Lee el archivo por bloques en el pool de hilos (streaming ASGI)"""
+    read = sync_to_async(filelike.read, thread_sensitive=False)
+    while chunk := await read(chunk_size):
+        yield chunk
 
-    if not _is_public_media_path(normalized_path):
-        if not request.user.is_authenticated:
-            return Response(
-                {"detail": "Authentication credentials were not provided for this media file."},
-                status=status.HTTP_401_UNAUTHORIZED,
-            )
 
-        if not _is_admin_user(request.user):
-            return Response(
-                {"detail": "You do not have permission to access this private media file."},
-                status=status.HTTP_403_FORBIDDEN,
+def stream_async(response):
+    """
+    FileResponse → iterador async (ASGI): el archivo se lee en el pool de hilos
+    en vez de que Django lo consuma con un iterador sync.
+
+    Los headers (Content-Length, Content-Type) ya quedaron calculados; el
+    archivo se sigue cerrando con response.close().
+    """
+    if response.file_to_stream is not None:
+        response.streaming_content = _read_chunks(response.file_to_stream, response.block_size)
+    return response
+
+
+@require_GET
+async def protected_media(request, path: str):
+    """
+    Sirve archivos de MEDIA_ROOT sin autenticación DRF ni consultas a la BD.
+
+    - property_X/images|media|ensers: públicos, no requieren firma
+    - Resto de carpetas: requieren ?exp=...&sig=... válidos (ver media_signing)
+
+    Bajo ASGI el archivo se envía con un iterador async (una descarga grande
+    no ocupa un hilo); bajo WSGI se mantiene FileResponse/wsgi.file_wrapper.
+    """
+    normalized_path = _normalize_media_path(path)
+    signed = verify_media_signature(
+        normalized_path,
+        request.GET.get("exp"),
+        request.GET.get("sig"),
+    )
+
+    if not signed and not _is_public_media_path(normalized_path):
+        if "sig" in request.GET:
+            return JsonResponse(
+                {"detail": "The media URL signature is invalid or has expired."},
+                status=403,
             )
+        return JsonResponse(
+            {"detail": "A signed URL is required to access this private media file."},
+            status=403,
+        )
 
     file_path = _build_safe_file_path(normalized_path)
 
     if not os.path.exists(file_path) or not os.path.isfile(file_path):
         raise Http404("Media file not found")
 
-    return FileResponse(open(file_path, "rb"))
+    response = FileResponse(open(file_path, "rb"))
+    if isinstance(request, ASGIRequest):
+        stream_async(response)
+    if signed:
+        # No cachear más allá de la expiración de la firma
+        max_age = max(int(request.GET["exp"]) - int(time.time()), 0)
+        patch_cache_control(response, private=True, max_age=max_age)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_URL_TTL)
+    return response
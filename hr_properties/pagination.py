@@ -0,0 +1,224 @@
+"""
+Paginación por defecto del proyecto (keyset / cursor)
+
+Todos los listados sin `pagination_class` propia usan KeysetPagination:
+
+    GET /api/tenants/                         → primera página
+    GET /api/tenants/?cursor=<token>          → página siguiente/anterior
+    GET /api/tenants/?page_size=100           → tamaño de página (max 200)
+    GET /api/tenants/?page=3                  → modo por número de página (UI)
+    GET /api/tenants/?include_total=true      → agrega "count" (COUNT(*))
+
+Respuesta:
+
+    {
+        "next": "http://.../api/tenants/?cursor=...",
+        "previous": null,
+        "results": [...]
+    }
+
+- El cursor guarda los valores del orden de la última fila vista y la
+  siguiente página se pide con WHERE (campo, id) < (valor, id): usa el índice
+  y cuesta lo mismo en la página 1 que en la 1000 (sin OFFSET)
+- El orden es el del queryset/Meta.ordering (o ?ordering= de OrderingFilter)
+  más `pk` como desempate; los campos que admiten NULL se descartan porque
+  no se pueden comparar con < / >. Una vista puede fijarlo con `keyset_ordering`
+- Los valores del cursor se guardan completos (fechas con microsegundos):
+  con milisegundos, filas creadas en el mismo milisegundo se saltarían
+- "count" solo se calcula si se pide (?include_total=true)
+- Los serializers de finance siguen usando sus paginaciones por número de página
+"""
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def _cursor_value(value):
+    """Valor JSON del cursor sin perder precisión (se lee con field.to_python)"""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _parse_ordering(item):
+    """'-created_at' → ('created_at', True)"""
+    item = str(item)
+    return item.lstrip('-'), item.startswith('-')
+
+
+class KeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    total_query_param = 'include_total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = None
+        if request.query_params.get(self.total_query_param, '').lower() in TRUE_VALUES:
+            self.count = queryset.count()
+
+        if self.page_query_param in request.query_params:
+            return self._paginate_by_page(queryset, request)
+        return self._paginate_by_cursor(queryset, request, view)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    # ── Modo página (opcional, para la UI) ──────────────────────────────────
+
+    def _paginate_by_page(self, queryset, request):
+        try:
+            page = max(int(request.query_params[self.page_query_param]), 1)
+        except ValueError:
+            raise NotFound('Invalid page')
+        offset = (page - 1) * self.page_size
+        rows = list(queryset[offset:offset + self.page_size + 1])
+        has_next = len(rows) > self.page_size
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        self.next_link = replace_query_param(url, self.page_query_param, page + 1) if has_next else None
+        self.previous_link = replace_query_param(url, self.page_query_param, page - 1) if page > 1 else None
+        return rows[:self.page_size]
+
+    # ── Modo cursor (por defecto) ───────────────────────────────────────────
+
+    def get_ordering(self, queryset, view):
+        """Campos (nombre, descendente) del orden keyset, siempre terminando en pk"""
+        model = queryset.model
+        ordering = getattr(view, 'keyset_ordering', None) or queryset.query.order_by or model._meta.ordering
+        fields = []
+        for item in ordering:
+            name, descending = _parse_ordering(item)
+            if name == 'pk' or '__' in name:
+                continue
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if not field.concrete or field.null or field.primary_key:
+                continue
+            fields.append((field, descending))
+        if not fields:
+            try:
+                created_at = model._meta.get_field('created_at')
+                if not created_at.null:
+                    fields.append((created_at, True))
+            except FieldDoesNotExist:
+                pass
+        pk_descending = fields[0][1] if fields else True
+        fields.append((model._meta.pk, pk_descending))
+        return fields
+
+    def _encode_cursor(self, values, reverse):
+        values = [_cursor_value(value) for value in values]
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode_cursor(self, token, fields):
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload['v']
+            if len(values) != len(fields):
+                raise ValueError
+            values = [field.to_python(value) for (field, _), value in zip(fields, values)]
+            return values, bool(payload.get('r'))
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _keyset_filter(self, fields, values, reverse):
+        """(a, b, id) después de (x, y, z) según la dirección de cada campo"""
+        condition = Q()
+        for i, (field, descending) in enumerate(fields):
+            lookup = 'lt' if descending != reverse else 'gt'
+            branch = Q(**{f'{field.attname}__{lookup}': values[i]})
+            for j, (previous, _) in enumerate(fields[:i]):
+                branch &= Q(**{previous.attname: values[j]})
+            condition |= branch
+        return condition
+
+    def _row_values(self, row, fields):
+        # Filas de .values() (FastListMixin) o instancias del modelo
+        if isinstance(row, dict):
+            return [row[field.attname] for field, _ in fields]
+        return [getattr(row, field.attname) for field, _ in fields]
+
+    def _paginate_by_cursor(self, queryset, request, view):
+        fields = self.get_ordering(queryset, view)
+        token = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if token:
+            values, reverse = self._decode_cursor(token, fields)
+            queryset = queryset.filter(self._keyset_filter(fields, values, reverse))
+
+        order_by = [
+            f"{'-' if descending != reverse else ''}{field.attname}"
+            for field, descending in fields
+        ]
+        rows = list(queryset.order_by(*order_by)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Hacia adelante: hay anterior si vinimos con cursor; hacia atrás: siempre hay siguiente
+        has_next = has_more if not reverse else True
+        has_previous = bool(token) if not reverse else has_more
+        url = remove_query_param(self.base_url, self.page_query_param)
+        self.next_link = None
+        self.previous_link = None
+        if rows and has_next:
+            cursor = self._encode_cursor(self._row_values(rows[-1], fields), reverse=False)
+            self.next_link = replace_query_param(url, self.cursor_query_param, cursor)
+        if rows and has_previous:
+            cursor = self._encode_cursor(self._row_values(rows[0], fields), reverse=True)
+            self.previous_link = replace_query_param(url, self.cursor_query_param, cursor)
+        return rows
+
+    # ── Respuesta ───────────────────────────────────────────────────────────
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.next_link
+        payload['previous'] = self.previous_link
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,59 @@
+"""
+Verificación de planes de consulta (EXPLAIN) para los tests de índices
+
+    from hr_properties.query_plans import QueryPlanAssertionsMixin
+
+    class ObligationQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+        def test_due_date_range(self):
+            self.assertNoSequentialScan(
+                Obligation.objects.filter(due_date__range=(a, b)),
+                tables=['obligation'],
+            )
+
+- PostgreSQL: EXPLAIN con enable_seqscan = off. En tablas de test el
+  planificador siempre prefiere "Seq Scan" (son chicas); desactivándolo, si
+  igual aparece es porque ningún índice sirve para esa consulta
+- SQLite: EXPLAIN QUERY PLAN; "SCAN <tabla>" sin "USING INDEX" es un
+  recorrido completo de la tabla
+"""
+import re
+
+from django.db import connection
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)')
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def explain(queryset) -> str:
+    """Plan de ejecución de un queryset como texto"""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            try:
+                return queryset.explain()
+            finally:
+                cursor.execute('RESET enable_seqscan')
+    return queryset.explain()
+
+
+def sequential_scans(plan: str) -> set:
+    """Tablas recorridas completas según el plan"""
+    if connection.vendor == 'postgresql':
+        return set(POSTGRES_SCAN.findall(plan))
+    return {
+        match.group(1)
+        for line in plan.splitlines()
+        if 'USING' not in line and (match := SQLITE_SCAN.search(line))
+    }
+
+
+class QueryPlanAssertionsMixin:
+    """Asserts para TestCase sobre el plan de un queryset"""
+
+    def assertNoSequentialScan(self, queryset, tables):
+        plan = explain(queryset)
+        scanned = sequential_scans(plan) & set(tables)
+        self.assertFalse(
+            scanned,
+            f'Sequential scan on {", ".join(sorted(scanned))}:\n{queryset.query}\n\n{plan}',
+        )
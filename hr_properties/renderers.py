@@ -0,0 +1,56 @@
+"""
+Renderer y parser JSON con orjson (por defecto en REST_FRAMEWORK)
+
+orjson serializa en C dicts, listas, str, int, float, date y UUID; lo que no
+conoce (Decimal, datetime, time, lazy strings, querysets) pasa por el mismo
+encoder de DRF, así la salida es idéntica a la de JSONRenderer:
+
+- Decimal → número (float), como el encoder de DRF
+- datetime → ISO 8601 con 'Z' para UTC (formato de DRF)
+- U+2028 / U+2029 escapados (JSON embebido en <script>)
+
+Con ?format=api o un Accept con indent=N se usa el JSONRenderer original
+(la indentación de orjson es fija de 2 espacios).
+"""
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+_drf_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=_drf_default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Enteros de más de 64 bits o tipos desconocidos: json de la stdlib (mismo resultado o error que antes)
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding).encode()
+            return orjson.loads(body)
+        except (ValueError, UnicodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -10,10 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import copy
 import http
 from pathlib import Path
 from datetime import timedelta
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -57,15 +59,23 @@ INSTALLED_APPS = [
     'apps.finance',
     'apps.emails',
     'apps.vehicles',
+    'apps.media',
+    'apps.search',
+    'apps.core',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.StaticFilesMiddleware',
+    'apps.core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -101,12 +111,60 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Conexiones persistentes: se reutilizan entre requests en vez de
+        # abrir una conexión TLS nueva a Neon cada vez (ver apps/core/db.py)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        # Verifica la conexión antes de reutilizarla (Neon cierra las
+        # conexiones al suspender el compute por inactividad)
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
     },
-    'OPTIONS': {
-            'options': '-c client_encoding=UTF8'
-        }
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['OPTIONS']['options'] = '-c client_encoding=UTF8'
+
+# Pool de conexiones de psycopg 3 (opcional: requiere psycopg[pool]).
+# Tamaño por worker de gunicorn: un hilo WSGI (o una request ASGI) usa una
+# conexión, más las consultas paralelas de gather_queries.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+if DB_POOL:
+    _db_pool_threads = int(os.getenv('GUNICORN_THREADS', '2')) + int(os.getenv('ASYNC_DB_CONCURRENCY', '4'))
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # El pool y las conexiones persistentes son excluyentes
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', str(_db_pool_threads))),
+        # Cerrar conexiones ociosas antes de que Neon suspenda el compute (5 min)
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '240')),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+    }
+elif os.getenv('SERVER_MODE', 'wsgi').lower() == 'asgi':
+    # Bajo ASGI cada request corre en un hilo distinto: una conexión
+    # persistente por hilo no se reutilizaría (usar DB_POOL=True)
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Réplica de lectura opcional (ver apps/core/replicas.py): mismos ajustes que
+# default salvo host/base. En tests es un espejo de default (TEST.MIRROR).
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'HOST': os.getenv('DB_REPLICA_HOST', DATABASES['default']['HOST']),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'OPTIONS': copy.deepcopy(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if DATABASES['replica']['ENGINE'] == 'django.db.backends.postgresql':
+        # Réplica caída: fallar rápido y volver al primario
+        DATABASES['replica']['OPTIONS']['connect_timeout'] = int(os.getenv('DB_REPLICA_CONNECT_TIMEOUT', '2'))
+DATABASE_ROUTERS = ['apps.core.replicas.ReplicaRouter']
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '10'))
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '15'))
+REPLICA_CHECK_INTERVAL = float(os.getenv('REPLICA_CHECK_INTERVAL', '5'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -147,6 +205,81 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # Media files (archivos subidos por usuarios)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Storage de media: 'apps.media.storage.ContentAddressedStorage' deduplica por SHA-256
+STORAGES = {
+    'default': {
+        'BACKEND': os.getenv('MEDIA_STORAGE_BACKEND', 'django.core.files.storage.FileSystemStorage'),
+    },
+    # collectstatic (en el build de la imagen) genera nombres con hash y
+    # versiones .gz/.br; StaticFilesMiddleware (WhiteNoise) las sirve con cache de un año
+    'staticfiles': {
+        'BACKEND': os.getenv('STATICFILES_BACKEND', 'whitenoise.storage.CompressedManifestStaticFilesStorage'),
+    },
+}
+# Sin manifest (tests, desarrollo sin collectstatic) usar el nombre sin hash en vez de fallar
+WHITENOISE_MANIFEST_STRICT = False
+# URLs firmadas de media (ver hr_properties/media_signing.py)
+# Validez de una URL emitida: entre MEDIA_URL_TTL y 2×MEDIA_URL_TTL segundos
+MEDIA_URL_TTL = int(os.getenv('MEDIA_URL_TTL', '3600'))
+# Clave HMAC propia opcional (por defecto se deriva de SECRET_KEY)
+MEDIA_SIGNING_KEY = os.getenv('MEDIA_SIGNING_KEY') or None
+# Derivados de imágenes (ver apps/media/derivatives.py)
+IMAGE_DERIVATIVE_WIDTHS = tuple(int(w) for w in os.getenv('IMAGE_DERIVATIVE_WIDTHS', '320,800,1600').split(','))
+IMAGE_DERIVATIVE_QUALITY = int(os.getenv('IMAGE_DERIVATIVE_QUALITY', '80'))
+# Threads para escribir archivos de un upload múltiple en paralelo
+MEDIA_UPLOAD_WORKERS = int(os.getenv('MEDIA_UPLOAD_WORKERS', '4'))
+# Threads de la cola de post-procesamiento (0 = ejecutar en línea)
+MEDIA_BACKGROUND_WORKERS = int(os.getenv('MEDIA_BACKGROUND_WORKERS', '1'))
+
+# Cache compartido entre workers de gunicorn (por defecto en disco; p. ej. Redis vía CACHE_BACKEND/CACHE_LOCATION)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'hr_properties_cache')),
+    },
+    # Buckets de throttling con THROTTLE_STORE=cache (ver hr_properties/throttling.py),
+    # p. ej. THROTTLE_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache.
+    # LocMemCache (por defecto) es por proceso: el límite se multiplica por GUNICORN_WORKERS
+    'throttle': {
+        'BACKEND': os.getenv('THROTTLE_CACHE_BACKEND') or 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION') or 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('THROTTLE_CACHE_MAX_ENTRIES', '10000'))},
+    },
+    # jti de refresh tokens revocados (logout), ver apps/users/tokens.py.
+    # Si se desaloja una entrada la base igual rechaza el token al rotar
+    'tokens': {
+        'BACKEND': os.getenv('TOKENS_CACHE_BACKEND') or os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('TOKENS_CACHE_LOCATION') or os.path.join(tempfile.gettempdir(), 'hr_properties_tokens'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('TOKENS_CACHE_MAX_ENTRIES', '5000'))},
+    },
+}
+# Almacenamiento de los buckets de throttling: 'database' (tabla throttle_bucket,
+# compartida y atómica) o 'cache' (el cache `throttle`; Redis para compartirlo)
+THROTTLE_STORE = os.getenv('THROTTLE_STORE') or 'database'
+THROTTLE_PURGE_EVERY = int(os.getenv('THROTTLE_PURGE_EVERY', '1000'))
+# Catálogo público de propiedades disponibles (ver apps/properties/catalog.py)
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', '3600'))
+CATALOG_MAX_AGE = int(os.getenv('CATALOG_MAX_AGE', '60'))
+
+# Instrumentación por request: Server-Timing, requests lentas y N+1 (ver apps/core/profiling.py)
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0.1'))
+PROFILING_SERVER_TIMING = os.getenv('PROFILING_SERVER_TIMING', 'True') == 'True'
+PROFILING_SLOW_REQUEST_MS = int(os.getenv('PROFILING_SLOW_REQUEST_MS', '1000'))
+PROFILING_MAX_QUERIES = int(os.getenv('PROFILING_MAX_QUERIES', '50'))
+PROFILING_N_PLUS_ONE_THRESHOLD = int(os.getenv('PROFILING_N_PLUS_ONE_THRESHOLD', '5'))
+# Lanza NPlusOneDetected en vez de solo registrarlo (tests / CI)
+PROFILING_STRICT = os.getenv('PROFILING_STRICT', 'False') == 'True'
+
+# Compresión gzip / brotli de las respuestas (ver apps/core/compression.py)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+# Bajo ASGI, cuerpos más grandes se comprimen fuera del event loop
+COMPRESSION_OFFLOAD_SIZE = int(os.getenv('COMPRESSION_OFFLOAD_SIZE', str(256 * 1024)))
+
+# Métricas Prometheus en /metrics (ver apps/core/metrics.py): exige
+# "Authorization: Bearer <METRICS_TOKEN>"; sin token solo responde con DEBUG=True
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
 
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', 'http://localhost:5173, http://127.0.0.1:5173').split(', ')
@@ -176,7 +309,42 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Keyset por defecto; ?page=N para paginación por número (ver hr_properties/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'hr_properties.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '50')),
+    # JSON con orjson (misma salida que JSONRenderer, ver hr_properties/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'hr_properties.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'hr_properties.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token buckets '<throttle_scope>.<ip|username|endpoint>' (ver hr_properties/throttling.py);
+    # cada uno se ajusta con THROTTLE_<SCOPE>_<TIPO> (vacío = sin límite)
+    'DEFAULT_THROTTLE_RATES': {
+        scope: os.getenv(f"THROTTLE_{scope.replace('.', '_').upper()}", rate) or None
+        for scope, rate in {
+            # Catálogo público: servido desde cache, el límite es por scraper
+            'catalog.ip': '120/min',
+            'catalog.endpoint': '3000/min',
+            # Cada intento es un PBKDF2 (~0.1-0.3 s de CPU en un hilo): el global
+            # deja hilos libres para el resto de la API
+            'login.ip': '20/min',
+            'login.username': '5/min',
+            'login.endpoint': '300/min',
+            # Cada intento es una llamada a Google
+            'google_login.ip': '20/min',
+            'google_login.endpoint': '120/min',
+        }.items()
+    },
 }
+# Header con la IP real del cliente (Cloudflare Tunnel); vacío = REMOTE_ADDR
+CLIENT_IP_HEADER = os.getenv('CLIENT_IP_HEADER', 'HTTP_CF_CONNECTING_IP')
+# Listados de solo lectura con .values() + serializers compilados (ver hr_properties/fast_serializers.py)
+FAST_LIST_SERIALIZATION = os.getenv('FAST_LIST_SERIALIZATION', 'True') == 'True'
 
 # Simple JWT
 SIMPLE_JWT = {
@@ -197,6 +365,9 @@ SIMPLE_JWT = {
     
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+
+    # Blacklist consultada en cache (ver apps/users/tokens.py)
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.tokens.CachedTokenRefreshSerializer',
 }
 
 
@@ -0,0 +1,203 @@
+"""
+Throttling token bucket para los endpoints públicos (catálogo, login)
+
+Cada vista define `throttle_scope` y sus throttle_classes; el límite de cada
+combinación scope.tipo está en REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']:
+
+    class LoginView(APIView):
+        throttle_scope = 'login'
+        throttle_classes = [IPThrottle, UsernameThrottle, EndpointThrottle]
+
+    'login.ip': '20/min'        → por IP del cliente
+    'login.username': '5/min'   → por usuario intentado (credential stuffing)
+    'login.endpoint': '300/min' → todo el endpoint (protege los hilos de gunicorn)
+
+'N/periodo' es un bucket de N fichas que se recarga a N por periodo: admite
+ráfagas de hasta N requests y después una cada periodo/N. Sin tasa (o vacía)
+ese throttle no aplica.
+
+Se implementa como GCRA: por clave se guarda un único float (el instante en
+que el bucket vuelve a estar lleno). Dónde, según settings.THROTTLE_STORE:
+
+- 'database' (por defecto): tabla throttle_bucket, compartida por todos los
+  workers. Tomar una ficha es un único UPDATE condicional (atómico: dos
+  requests no pueden tomar la misma ficha); una rechazada suma una lectura y
+  un bucket nuevo un INSERT. Las filas de buckets ya llenos se borran cada
+  THROTTLE_PURGE_EVERY fichas admitidas por proceso
+- 'cache': el cache `throttle` (THROTTLE_CACHE_BACKEND, p. ej. Redis), una
+  lectura y una escritura por request sin ir a la base. La lectura y la
+  escritura se hacen bajo un lock del proceso; entre workers no son atómicas
+  y requests simultáneas en workers distintos pueden pasar una ficha de más.
+  Con LocMemCache los buckets son por proceso (el límite se multiplica por
+  GUNICORN_WORKERS)
+
+Si el almacenamiento falla, la request pasa (fail-open).
+
+Las requests rechazadas responden 429 con Retry-After y cuentan en la
+métrica throttle_rejections_total{scope, kind}.
+"""
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from apps.core import metrics
+from apps.core.models import ThrottleBucket
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_CACHE = 'throttle'
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+_parsed_rates = {}
+# Locks por franja de claves: get + set de una misma clave no se intercalan
+_LOCK_STRIPES = 64
+_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+_purge_lock = threading.Lock()
+_admitted = {'count': 0}
+
+
+def client_ip(request):
+    """
+    IP del cliente. Detrás de Cloudflare Tunnel REMOTE_ADDR es cloudflared:
+    se usa el header de CLIENT_IP_HEADER (CF-Connecting-IP), que solo es
+    confiable porque el backend no publica puertos.
+    """
+    header = settings.CLIENT_IP_HEADER
+    if header:
+        value = request.META.get(header)
+        if value:
+            return value.strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _cache_step(key, now, interval, period):
+    """Toma una ficha del bucket en el cache `throttle`; devuelve (admitida, full_at)"""
+    cache = caches[THROTTLE_CACHE]
+    with _locks[hash(key) % _LOCK_STRIPES]:
+        full_at = max(cache.get(key) or now, now) + interval
+        if full_at - now > period:
+            return False, full_at
+        cache.set(key, full_at, timeout=int(full_at - now) + 1)
+    return True, full_at
+
+
+def _database_step(key, now, interval, period):
+    """Toma una ficha del bucket en throttle_bucket; devuelve (admitida, full_at)"""
+    buckets = ThrottleBucket.objects.using(DEFAULT_DB_ALIAS)
+    # Admitida si max(full_at, now) + interval - now <= period
+    take = buckets.filter(key=key, full_at__lte=now + period - interval)
+    new_full_at = Greatest(F('full_at'), Value(now)) + interval
+    current = buckets.filter(key=key).values_list('full_at', flat=True)
+
+    if take.update(full_at=new_full_at):
+        _purge_full_buckets(now)
+        return True, None
+    full_at = current.first()
+    if full_at is None:
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                buckets.create(key=key, full_at=now + interval)
+            return True, None
+        except IntegrityError:
+            # Otra request creó el bucket a la vez
+            if take.update(full_at=new_full_at):
+                return True, None
+            full_at = current.first()
+    return False, max(full_at or now, now) + interval
+
+
+def _purge_full_buckets(now):
+    with _purge_lock:
+        _admitted['count'] += 1
+        if _admitted['count'] % settings.THROTTLE_PURGE_EVERY:
+            return
+    ThrottleBucket.objects.using(DEFAULT_DB_ALIAS).filter(full_at__lt=now).delete()
+
+
+def parse_rate(rate):
+    """'20/min' → (20, 60.0); None si no hay tasa"""
+    if not rate:
+        return None
+    parsed = _parsed_rates.get(rate)
+    if parsed is None:
+        count, period = rate.split('/')
+        parsed = _parsed_rates[rate] = (int(count), float(_PERIODS[period.strip()[0]]))
+    return parsed
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Bucket por (view.throttle_scope, kind, get_ident_key())"""
+    kind = None
+
+    def get_ident_key(self, request, view):
+        """Identidad dentro del scope; None = este throttle no aplica a la request"""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}.{self.kind}'))
+        if rate is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        capacity, period = rate
+        interval = period / capacity
+        key = f'tb:{scope}:{self.kind}:{ident}'
+        now = time.time()
+        step = _cache_step if settings.THROTTLE_STORE == 'cache' else _database_step
+        try:
+            allowed, full_at = step(key, now, interval, period)
+        except Exception:
+            logger.warning('Throttle %s.%s sin almacenamiento, request admitida', scope, self.kind, exc_info=True)
+            return True
+        if not allowed:
+            self.wait_seconds = full_at - now - period
+            metrics.record_throttled(scope, self.kind)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+    def get_ident_key(self, request, view):
+        return client_ip(request) or None
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    """Por el usuario del body (aunque venga desde muchas IPs)"""
+    kind = 'username'
+    username_field = 'username'
+
+    def get_ident_key(self, request, view):
+        try:
+            username = request.data.get(self.username_field)
+        except AttributeError:
+            return None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        # Hash: la clave del cache no debe contener datos del usuario ni caracteres arbitrarios
+        return hashlib.sha256(username.strip().lower().encode()).hexdigest()[:32]
+
+
+class EndpointThrottle(TokenBucketThrottle):
+    """Un único bucket para todos los clientes del endpoint"""
+    kind = 'endpoint'
+
+    def get_ident_key(self, request, view):
+        return 'all'
@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from hr_properties.media_views import protected_media
+from apps.core.views import healthz, metrics_view, readyz
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -27,5 +28,10 @@ urlpatterns = [
     path('api/', include('apps.finance.urls')),
     path('api/', include('apps.emails.urls')),
     path('api/', include('apps.vehicles.urls')),
+    path('api/', include('apps.search.urls')),
+    path('api/', include('apps.core.urls')),
     path('media/<path:path>', protected_media, name='protected-media'),
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
+    path('metrics', metrics_view, name='metrics'),
 ]
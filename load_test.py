@@ -0,0 +1,105 @@
+"""
+Prueba de carga simple: N requests con C clientes concurrentes contra un endpoint
+
+Ejecutar con:
+    python load_test.py http://localhost:8000/api/dashboard/ --token <ACCESS> -c 20 -n 200
+
+Compara la concurrencia que logró el servidor con su capacidad en modo WSGI
+(workers × threads de gunicorn.conf.py, por defecto 2 × 2 = 4):
+
+    concurrencia del servidor ≈ throughput × tiempo de servicio
+
+El tiempo de servicio es la latencia sin contención (mediana de --warmup
+requests secuenciales). La latencia vista por los clientes no sirve para esto
+porque incluye la espera en la cola del socket.
+
+Con SERVER_MODE=wsgi y un endpoint lento (login con Google, envío de email,
+descarga grande) se queda en ~4; con SERVER_MODE=asgi sube hasta -c.
+Solo usa la librería estándar.
+"""
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def timed_request(url, method, headers, body):
+    request = urllib.request.Request(url, data=body, method=method, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    except (urllib.error.URLError, TimeoutError) as exc:
+        status = type(exc).__name__
+    return start, time.perf_counter(), status
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga concurrente contra un endpoint')
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=20)
+    parser.add_argument('-n', '--requests', type=int, default=200)
+    parser.add_argument('-X', '--method', default='GET')
+    parser.add_argument('--data', help='Body JSON (POST)')
+    parser.add_argument('--token', help='Access token JWT (Authorization: Bearer)')
+    parser.add_argument('--host', help='Header Host (si ALLOWED_HOSTS no incluye la URL)')
+    parser.add_argument('--warmup', type=int, default=5,
+                        help='Requests secuenciales para medir el tiempo de servicio')
+    parser.add_argument('--server-slots', type=int, default=4,
+                        help='Requests simultáneas del servidor WSGI (workers × threads)')
+    args = parser.parse_args()
+
+    headers = {'Accept': 'application/json'}
+    if args.token:
+        headers['Authorization'] = f'Bearer {args.token}'
+    if args.host:
+        headers['Host'] = args.host
+    body = None
+    if args.data:
+        body = args.data.encode()
+        headers['Content-Type'] = 'application/json'
+
+    warmup = [timed_request(args.url, args.method, headers, body) for _ in range(max(args.warmup, 1))]
+    service_time = statistics.median(end - start for start, end, _ in warmup)
+    print(f"🔥 Tiempo de servicio sin contención: {service_time * 1000:.0f}ms")
+
+    print(f"🚀 {args.requests} requests {args.method} {args.url} con {args.concurrency} clientes")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda _: timed_request(args.url, args.method, headers, body),
+            range(args.requests),
+        ))
+    elapsed = time.perf_counter() - started
+
+    latencies = [end - start for start, end, _ in results]
+    statuses = Counter(status for _, _, status in results)
+    throughput = args.requests / elapsed
+    concurrency = throughput * service_time
+
+    print(f"\n📊 Estados: {dict(statuses)}")
+    print(f"⏱️  Tiempo total: {elapsed:.2f}s ({throughput:.1f} req/s)")
+    print(
+        f"⏱️  Latencia: p50 {statistics.median(latencies) * 1000:.0f}ms · "
+        f"p95 {percentile(latencies, 95) * 1000:.0f}ms · max {max(latencies) * 1000:.0f}ms"
+    )
+    print(f"🔀 Concurrencia del servidor: {concurrency:.1f} · capacidad WSGI: {args.server_slots}")
+    if concurrency > args.server_slots:
+        print("✅ El servidor atendió más requests simultáneas que hilos WSGI disponibles")
+    else:
+        print("ℹ️  La concurrencia no superó la capacidad WSGI (¿SERVER_MODE=wsgi o endpoint rápido?)")
+
+
+if __name__ == '__main__':
+    main()